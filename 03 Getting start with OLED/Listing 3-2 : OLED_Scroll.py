@@ -1,10 +1,9 @@
-from machine import Pin, I2C
-from ssd1306 import SSD1306_I2C
+from mikrorover.board import oled  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน (ต้องมี lib/mikrorover บนบอร์ด)
 import time
 
 # ส่วนการตั้งค่าเบื้องต้น
-i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000)
-display = SSD1306_I2C(128, 64, i2c, addr=0x3C)
+# จอ OLED ที่ส่งเฉพาะส่วนที่เปลี่ยน (I2C0 ขา SDA=4, SCL=5 ความเร็ว 400kHz แอดเดรส 0x3C)
+display = oled()
 
 # ส่วนการคำนวณตำแหน่ง (Mathematics)
 SCREEN_WIDTH = 128   # ความกว้างจอ
@@ -24,24 +23,28 @@ display.show()
 time.sleep(1)
 
 # --- ส่วนการทำภาพเคลื่อนไหว (Main Loop) ---
+# ใช้ hardware scroll ของจอ: ส่งคำสั่งเลื่อนครั้งเดียว แล้วตัวจอเลื่อนภาพเองโดยไม่มีข้อมูลวิ่งบนบัส I2C
+# ระหว่างนั้น CPU ว่างทำงานอื่นได้ (ในตัวอย่างนี้แค่รอเวลา)
+SCROLL_FRAMES = 2                 # ความเร็ว: เลื่อน 1 คอลัมน์ทุก ๆ 2 เฟรมของจอ (ประมาณ 44 คอลัมน์/วินาที)
+first_page = y_pos // 8           # page แรกที่ข้อความอยู่ (1 page = 8 แถว)
+last_page = (y_pos + 7) // 8      # page สุดท้ายที่ข้อความอยู่
+
 while True:
     # เลื่อนจากกึ่งกลาง ไปทางซ้าย (Center -> Left)
-    for x in range(center_x, left_edge_x - 1, -1):
-        display.fill(0)
-        display.text(text, x, y_pos, 1)
-        display.show()
-        time.sleep(0.01) 
+    display.hscroll(-1, first_page, last_page, SCROLL_FRAMES)
+    time.sleep_ms(display.scroll_ms(center_x - left_edge_x, SCROLL_FRAMES))
 
     # เลื่อนจากซ้ายสุด ไปทางขวาสุด (Left -> Right)
-    for x in range(left_edge_x, right_edge_x + 1, 1):
-        display.fill(0)
-        display.text(text, x, y_pos, 1)
-        display.show()
-        time.sleep(0.01)
+    display.hscroll(1, first_page, last_page, SCROLL_FRAMES)
+    time.sleep_ms(display.scroll_ms(right_edge_x - left_edge_x, SCROLL_FRAMES))
 
     # เลื่อนจากขวาสุด กลับมาที่กึ่งกลาง (Right -> Center)
-    for x in range(right_edge_x, center_x - 1, -1):
-        display.fill(0)
-        display.text(text, x, y_pos, 1)
-        display.show()
-        time.sleep(0.01)
+    display.hscroll(-1, first_page, last_page, SCROLL_FRAMES)
+    time.sleep_ms(display.scroll_ms(right_edge_x - center_x, SCROLL_FRAMES))
+
+    # หยุดเลื่อนแล้ววาดข้อความกลางจอใหม่ 1 ครั้งต่อรอบ
+    # (อัตรารีเฟรชของจอแต่ละตัวคลาดเคลื่อนได้ จึงแก้ตำแหน่งที่เพี้ยนสะสมตรงนี้)
+    display.scroll_stop()
+    display.fill(0)
+    display.text(text, center_x, y_pos, 1)
+    display.show()
@@ -1,27 +1,28 @@
-from machine import Pin, I2C, ADC   # นำเข้าคำสั่งควบคุมขา, การเชื่อมต่อ I2C และตัวแปลงสัญญาณอนาล็อก (ADC) 
-from ssd1306 import SSD1306_I2C    
+from mikrorover.board import SONAR, oled, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.sonar import Sonar  # ตัวอ่านเซนเซอร์ระยะแบบกรองสัญญาณรบกวน
+from mikrorover.sprites import label, NumericField  # ป้ายและตัวเลขที่เรนเดอร์ไว้ล่วงหน้า (วาดใหม่เฉพาะหลักที่เปลี่ยน)
 import time                        
 
-# ใช้แชนเนล I2C 0, ขา SDA คือ Pin 4, ขา SCL คือ Pin 5, ความเร็ว 400kHz 
-i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000)
-# กำหนดขนาดหน้าจอ 128x64 พิกเซล และที่อยู่ I2C คือ 0x3C 
-display = SSD1306_I2C(128, 64, i2c, addr=0x3C)
+# จอ OLED 128x64 ที่ส่งเฉพาะส่วนที่เปลี่ยน: I2C แชนเนล 0, ขา SDA คือ Pin 4, ขา SCL คือ Pin 5, ความเร็ว 400kHz, แอดเดรส 0x3C
+display = oled()
 
 # --- ตั้งค่าเซนเซอร์ระยะทาง ZX-SONAR1M ---
 # เชื่อมต่อกับขา Pin 27 (ซึ่งเป็นช่อง ADC แชนเนล 1 ของ RP2040) 
-adc_sensor = ADC(Pin(27))
+# Sonar อ่าน ADC เองเป็นชุดด้วย Timer 200 ครั้ง/วินาที แล้วกรองด้วยค่ามัธยฐาน (median)
+sonar = Sonar(SONAR)
+
+# ป้ายคงที่วาดครั้งเดียว ในลูปวาดใหม่เฉพาะหลักของตัวเลขที่เปลี่ยน (ไม่ล้างจอ ไม่วาดข้อความซ้ำทุกเฟรม)
+display.fill(0)                                   # ล้างหน้าจอเดิม
+label("Dist (cm):").draw(display, 0, 10)          # พิมพ์ข้อความหัวข้อที่พิกัด x=0, y=10
+label("+/- ").draw(display, 0, 40)                # ความแกว่งของค่าที่วัดได้ (ซม.)
+dist_field = NumericField(display, 0, 25, 5, left=True)    # ตัวเลขระยะทางที่พิกัด x=0, y=25
+noise_field = NumericField(display, 32, 40, 5, left=True)
+ready("Sonar")
 
 while True:
-    # อ่านค่าแรงดันไฟฟ้าดิบจากเซนเซอร์ (0-65535)
-    raw_value = adc_sensor.read_u16() 
-    
-    # แปลงค่าจาก 16-บิต ให้เป็น 10-บิต (0-1023) โดยการหารด้วย 64 
-    value_10bit = raw_value / 64 
-    
-    # คำนวณเป็นระยะทางหน่วยเซนติเมตร (โดยประมาณคือค่า ADC หารด้วย 10) 
-    distance = value_10bit / 10 
-    display.fill(0)                               # ล้างหน้าจอเดิม 
-    display.text("Dist (cm):", 0, 10, 1)          # พิมพ์ข้อความหัวข้อที่พิกัด x=0, y=10 
-    display.text( str(int(distance)) , 0, 25, 1) # พิมพ์ตัวเลขระยะทาง (แปลงเป็นเลขเต็ม) ที่พิกัด x=0, y=25
-    display.show()                                # สั่งให้จออัปเดตภาพเพื่อแสดงผล 
+    # ระยะทางหน่วยเซนติเมตรที่กรองแล้ว (ค่า ADC 16 บิต // 640 = ค่า 10 บิต / 10) 
+    distance = sonar.cm 
+    dist_field.set(distance)
+    noise_field.set(sonar.noise_cm)
+    display.show()                                # สั่งให้จออัปเดตภาพเพื่อแสดงผล (ส่งเฉพาะคอลัมน์ที่เปลี่ยน)
     time.sleep_ms(100) # หน่วงเวลา 0.1 วินาที 
@@ -1,36 +1,22 @@
-from machine import Pin, PWM, I2C, ADC 
-from ssd1306 import SSD1306_I2C       
+from mikrorover.board import SW1, SONAR, oled, button, wait_press, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.dashboard import Dashboard  # งานอัปเดตจอที่แยกจากลูปควบคุม
+from mikrorover.drive import DriveTrain  # ชุดขับล้อกลาง (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.sonar import Sonar  # ตัวอ่านเซนเซอร์ระยะแบบกรองสัญญาณรบกวน
+from mikrorover.dualcore import ControlLoop, Shared, run  # ลูปควบคุมบนคอร์ 1 / จอบนคอร์ 0
+from array import array
 import time                         
 
-i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000)
-display = SSD1306_I2C(128, 64, i2c, addr=0x3C)
+display = oled()   # จอ OLED ที่ส่งเฉพาะส่วนที่เปลี่ยน (I2C0 ขา SDA=4, SCL=5 แอดเดรส 0x3C)
 
 # --- ตั้งค่ามอเตอร์ (Motor Setup) ---
-M1_B = PWM(Pin(13)); M1_A = PWM(Pin(14)) # มอเตอร์ 1 (ซ้าย)
-M2_B = PWM(Pin(16)); M2_A = PWM(Pin(17)) # มอเตอร์ 2 (ขวา)
-M1_A.freq(1000); M1_B.freq(1000)         # ตั้งความถี่ 1000Hz
-M2_A.freq(1000); M2_B.freq(1000)
+# ล้อซ้ายขา 14 (เดินหน้า) / 13 (ถอยหลัง), ล้อขวาขา 17 / 16 ความถี่ 1000Hz
+# ความเร็ว 0-100% แปลงด้วยตารางในโมดูล และสั่งค่าเดิมซ้ำจะไม่เขียน PWM ใหม่
+motors = DriveTrain()
+fd, ao = motors.fd, motors.ao
 
 # --- ตั้งค่าปุ่มกดและเซนเซอร์ ---
-start_button = Pin(8, Pin.IN, Pin.PULL_UP) # ปุ่ม SW1 (ขา 8)
-adc_sensor = ADC(Pin(27))                 # เซนเซอร์ ZX-SONAR1M (ขา 27)
-
-# ฟังก์ชันคำนวณเปอร์เซ็นต์ความเร็ว (0-100) เป็นค่า Duty Cycle (0-65535)
-def _map_constrain(speed):
-    if speed < 0: speed = 0
-    if speed > 100: speed = 100
-    return int(speed / 100 * 65535)
-
-# ฟังก์ชันเดินหน้า (Forward)
-def fd(speed):
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-# ฟังก์ชันหยุดมอเตอร์ทั้งหมด (All Off)
-def ao():
-    M1_A.duty_u16(0); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(0)
+start_button = button(SW1)                 # ปุ่ม SW1 (ขา 8)
+sonar = Sonar(SONAR)                      # เซนเซอร์ ZX-SONAR1M (ขา 27) อ่านและกรองเองด้วย Timer
 
 # --- เริ่มการทำงาน (Startup) ---
 display.fill(0)
@@ -39,30 +25,53 @@ display.text("to Start...", 0, 25, 1)
 display.show()
 
 # วนลูปรอจนกว่าจะกดปุ่ม SW1
-while start_button.value() == 1:
-    time.sleep_ms(10)
+ready("Object detection")
+wait_press(start_button)
+
+# --- แบ่งงานสองคอร์ (Dual-core) ---
+# คอร์ 1: ลูปควบคุมอ่านระยะและหยุดรถทุก PERIOD_US ด้วยจังหวะคงที่
+# คอร์ 0: วาดจอทุก UI_MS (การส่งภาพทาง I2C ใช้เวลาหลายมิลลิวินาที จึงไม่อยู่ในเส้นทางตรวจสิ่งกีดขวาง)
+# DUAL = False ทำทั้งสองงานบนคอร์เดียวเพื่อเทียบ jitter ของลูปควบคุม (ดูผลที่พิมพ์ตอนจบ)
+DUAL = True
+PERIOD_US = 5000      # คาบของลูปควบคุม (200 ครั้ง/วินาที)
+UI_MS = 100           # คาบของการวาดจอ
+STOP_CM = 10          # ระยะที่ถือว่าเจอสิ่งกีดขวาง (ซม.)
+SPEED = 50
+
+state = Shared(2)             # ข้อมูลข้ามคอร์: [ระยะทาง (ซม.), 1 = เจอสิ่งกีดขวาง]
+out = array("l", [0, 0])      # ค่าที่คอร์ 1 เขียน (จองไว้ก่อน ไม่สร้างใหม่ทุกรอบ)
+view = array("l", [0, 0])     # สำเนาที่คอร์ 0 อ่าน
+
+
+def control():
+    # ระยะทาง (cm) ล่าสุดที่กรองแล้ว อ่านได้ทันทีไม่ต้องรอ ADC
+    distance = sonar.cm
+    out[0] = distance
+    if distance < STOP_CM:  # ถ้าพบสิ่งกีดขวางใกล้กว่า STOP_CM
+        ao()                # สั่งให้หุ่นยนต์หยุดทันที
+        out[1] = 1
+        state.publish(out)
+        return True         # จบลูปควบคุม
+    state.publish(out)
+
+
+dash = Dashboard(display)
+status_row = dash.row(10)
+dist_row = dash.row(25)
+
+
+def ui():
+    state.snapshot(view)
+    if view[1]:
+        dash.post(status_row, "Obstacle!")
+        dash.post(dist_row, "STOPPED", "%s")
+    else:
+        dash.post(status_row, "Moving Forward")
+        dash.post(dist_row, view[0], "Dist: %d cm")
+    dash.flush()    # วาดและส่งเฉพาะแถวที่เปลี่ยน
 
-speed = 50
-fd(speed) # สั่งให้หุ่นยนต์เริ่มเดินหน้าด้วยความเร็ว 50%
 
-while True:
-    # อ่านค่าเซนเซอร์และคำนวณระยะทาง (cm)
-    raw_value_16bit = adc_sensor.read_u16()
-    distance = raw_value_16bit // 640  # คำนวณเป็นหน่วยเซนติเมตรโดยประมาณ 
-    
-    # แสดงสถานะและระยะทางบนหน้าจอ OLED
-    display.fill(0)
-    display.text("Moving Forward", 0, 10, 1)
-    display.text("Dist: " + str(distance) + " cm", 0, 25, 1)
-    display.show()
-    
-    # เงื่อนไขการตรวจสอบสิ่งกีดขวาง
-    if distance < 10:  # ถ้าพบสิ่งกีดขวางใกล้กว่า 10 ซม.
-        ao()           # สั่งให้หุ่นยนต์หยุดทันที 
-        display.fill(0)
-        display.text("Obstacle!", 0, 10, 1)
-        display.text("STOPPED", 0, 25, 1)
-        display.show()
-        break          # ออกจากลูปการทำงาน
-        
-    time.sleep_ms(20) 
+fd(SPEED) # สั่งให้หุ่นยนต์เริ่มเดินหน้าด้วยความเร็ว 50%
+loop = ControlLoop(control, PERIOD_US)
+run(loop, ui, UI_MS, DUAL)
+loop.report()   # jitter ของลูปควบคุม
@@ -1,48 +1,37 @@
-from machine import Pin, PWM, I2C, ADC 
-from ssd1306 import SSD1306_I2C       
+from mikrorover.board import SW1, SW2, SONAR, oled, button, wait_press, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.dashboard import Dashboard  # งานอัปเดตจอที่แยกจากลูปควบคุม
+from mikrorover.drive import DriveTrain  # ชุดขับล้อกลาง (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.sonar import Sonar  # ตัวอ่านเซนเซอร์ระยะแบบกรองสัญญาณรบกวน
+from mikrorover.avoid import Avoider  # ตัวหลบสิ่งกีดขวางแบบไม่บล็อก (state machine)
+from mikrorover.prof import Profiler  # ตัวจับเวลาโค้ด (ฮิสโทแกรม ticks_us)
+from mikrorover.gcmon import GCMonitor  # นับการจองหน่วยความจำต่อรอบและเวลาของ gc.collect()
 import time                          
 
-i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000) # กำหนดขา SDA=4, SCL=5 ความเร็ว 400kHz 
-display = SSD1306_I2C(128, 64, i2c, addr=0x3C)    # สร้างออบเจกต์จอภาพที่แอดเดรส 0x3C 
+display = oled()    # จอ OLED ที่ส่งเฉพาะส่วนที่เปลี่ยน (ขา SDA=4, SCL=5 ความเร็ว 400kHz แอดเดรส 0x3C)
 
-M1_B = PWM(Pin(13)); M1_A = PWM(Pin(14)) # มอเตอร์ 1 (ล้อซ้าย) 
-M2_B = PWM(Pin(16)); M2_A = PWM(Pin(17)) # มอเตอร์ 2 (ล้อขวา) 
-M1_A.freq(1000); M1_B.freq(1000)         # ตั้งความถี่ PWM 1000Hz 
-M2_A.freq(1000); M2_B.freq(1000)
+# --- ตั้งค่ามอเตอร์ (Motor Setup) ---
+# ล้อซ้ายขา 14 (เดินหน้า) / 13 (ถอยหลัง), ล้อขวาขา 17 / 16 ความถี่ 1000Hz
+# ความเร็ว 0-100% แปลงด้วยตารางในโมดูล และสั่งค่าเดิมซ้ำจะไม่เขียน PWM ใหม่
+motors = DriveTrain()
 
-start_button = Pin(8, Pin.IN, Pin.PULL_UP) # ปุ่ม SW1 (ขา 8) 
-adc_sensor = ADC(Pin(27))                 # เซนเซอร์วัดระยะทาง (ขา 27) 
+start_button = button(SW1)                 # ปุ่ม SW1 (ขา 8) 
+sonar = Sonar(SONAR)                      # เซนเซอร์วัดระยะทาง (ขา 27) อ่านและกรองเองด้วย Timer
+save_button = button(SW2)                  # ปุ่ม SW2 (ขา 9) บันทึกผลจับเวลาลงไฟล์
 
-# ฟังก์ชันคำนวณความเร็ว (0-100%) เป็นค่า PWM (0-65535)
-def _map_constrain(speed):
-    if speed < 0: speed = 0
-    if speed > 100: speed = 100
-    return int(speed / 100 * 65535)
+# --- จับเวลาโค้ด (Profiling) ---
+# เก็บเวลาต่อรอบของลูปหลัก (jitter) เวลาที่ใช้อัปเดตจอ และเวลาตอบสนองตั้งแต่เห็นสิ่งกีดขวางจนสั่งหยุด (react)
+# กด SW2 เพื่อบันทึกลง PROF_FILE แล้วดูผลบนคอมพิวเตอร์ด้วย python -m host.profdump prof.bin
+PROFILE = True
+PROF_FILE = "prof.bin"
+prof = Profiler(enabled=PROFILE)
+loop_slot = prof.slot("loop")
 
-# --- ฟังก์ชันควบคุมทิศทาง ---
-def fd(speed): # เดินหน้า 
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-def bk(speed): # ถอยหลัง 
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(0); M1_B.duty_u16(pwm)
-    M2_A.duty_u16(0); M2_B.duty_u16(pwm)
-
-def sl(speed): # เลี้ยวซ้ายหมุนอยู่กับที่ 
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(0); M1_B.duty_u16(pwm)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-def sr(speed): # เลี้ยวขวาหมุนอยู่กับที่ 
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(pwm)
-
-def ao(): # หยุดจ่ายไฟมอเตอร์ทั้งหมด 
-    M1_A.duty_u16(0); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(0)
+# --- ตรวจการจองหน่วยความจำ (GC check) ---
+# GC_CHECK = True: นับไบต์ที่ลูปหลักจองในแต่ละรอบ (ไม่นับ 1 วินาทีแรก) และปิด GC อัตโนมัติ
+# แล้วเรียก gc.collect() เองทุก GC_EVERY รอบพร้อมจับเวลา กด SW2 เพื่อพิมพ์ผล (ลูปที่ไม่จองอะไรเลย alloc loops = 0)
+GC_CHECK = False
+GC_EVERY = 200    # ประมาณ 1 ครั้ง/วินาที
+gcmon = GCMonitor(GC_EVERY, warmup=200, enabled=GC_CHECK)
 
 # แสดงข้อความเตรียมพร้อมที่หน้าจอ
 display.fill(0)
@@ -51,48 +40,55 @@ display.text("to Start...", 0, 25, 1)
 display.show()
 
 # วนลูปรอการกดปุ่ม SW1 เพื่อเริ่มทำงาน 
-while start_button.value() == 1:
-    time.sleep_ms(10)
+ready("Object avoiding")
+wait_press(start_button)
+
+# --- ค่าคงที่ของภารกิจ (ปรับได้ หรือหาค่าที่ดีที่สุดบนสนามจำลองด้วย python -m host.tune avoid) ---
+SPEED = 50        # ความเร็วเดินหน้า/เลี้ยว (%)
+STOP_CM = 17      # ระยะที่ถือว่าเจอสิ่งกีดขวาง (ซม.)
+SETTLE_MS = 500   # หยุดรอก่อนเริ่มหลบ
+TURN_MS = 400     # เวลาหมุนอยู่กับที่แต่ละครั้ง (ประมาณ 90 องศา)
+SIDE_MS = 500     # เวลาเดินหน้าออกด้านข้าง/กลับเข้าทางหลัก
+PASS_MS = 600     # เวลาเดินหน้าผ่านสิ่งกีดขวาง
+PAUSE_MS = 200    # หยุดพักระหว่างแต่ละท่า
+STEP_MS = 5       # คาบของลูปหลัก: อ่านระยะทุกรอบแม้กำลังหลบอยู่
 
-speed = 50
-fd(speed) # เริ่มเดินหน้าด้วยความเร็ว 50% 
+# ขั้นตอนหลบ (หยุด -> เลี้ยวขวา -> เดินหน้า -> เลี้ยวซ้าย -> ผ่าน -> เลี้ยวซ้าย -> เดินหน้า -> เลี้ยวขวา) ทำทีละท่าใน avoid.step()
+# โดยไม่ sleep ถ้าเจอสิ่งกีดขวางใหม่ระหว่างเดินหน้า จะหยุดแล้ววางแผนหลบใหม่ทันที
+avoid = Avoider(motors, sonar, SPEED, STOP_CM, SETTLE_MS, TURN_MS, SIDE_MS, PASS_MS, PAUSE_MS, prof)
+avoid.start() # เริ่มเดินหน้า
+
+# จอแสดงผลแยกเป็นงานของตัวเอง: วาดใหม่ไม่เกิน 10 ครั้ง/วินาที และเฉพาะเมื่อค่าเปลี่ยน
+dash = Dashboard(display, max_fps=10)
+status_row = dash.row(10)
+dist_row = dash.row(25)
+service = prof.wrap("display", dash.service)
+saved = False
 
 while True:
-    # อ่านค่าจากเซนเซอร์และคำนวณระยะทางในหน่วยเซนติเมตร 
-    raw_value_16bit = adc_sensor.read_u16()
-    distance = raw_value_16bit // 640 # แปลงค่า ADC เป็นระยะทางโดยประมาณ 
-    
-    # อัปเดตข้อมูลบนจอ OLED ตลอดเวลาขณะเคลื่อนที่ 
-    display.fill(0)
-    display.text("Moving Forward", 0, 10, 1)
-    display.text("Dist: " + str(distance) + " cm", 0, 25, 1)
-    display.show()
-    
-    # ตรวจสอบสิ่งกีดขวางในระยะน้อยกว่า 17 ซม. 
-    if distance < 17:
-        ao() # หยุดรถทันที 
-        display.fill(0)
-        display.text("Obstacle!", 0, 10, 1)
-        display.text("Avoiding...", 0, 25, 1)
-        display.show()
-        
-        # --- ขั้นตอนการหลบสิ่งกีดขวาง ---
-        time.sleep_ms(500)
-        sr(speed); time.sleep_ms(400) # เลี้ยวขวาหลบ 
-        ao(); time.sleep_ms(200)
-        fd(speed); time.sleep_ms(500) # เดินหน้าผ่าน 
-        ao(); time.sleep_ms(200)
-        sl(speed); time.sleep_ms(400) # เลี้ยวซ้ายกลับเข้าทางหลัก 
-        ao(); time.sleep_ms(200)
-        fd(speed); time.sleep_ms(600) # เดินหน้าผ่านสิ่งกีดขวาง 
-        ao(); time.sleep_ms(200)
-        sl(speed); time.sleep_ms(400) # เลี้ยวซ้ายอีกครั้ง 
-        ao(); time.sleep_ms(200)
-        fd(speed); time.sleep_ms(500) # เดินหน้า 
-        ao(); time.sleep_ms(200)
-        sr(speed); time.sleep_ms(400) # เลี้ยวขวาตั้งลำ 
-        ao(); time.sleep_ms(200)
-        
-        fd(speed) # กลับเข้าสู่โหมดเดินหน้าตรวจจับตามปกติ 
-        
-    time.sleep_ms(50) 
+    prof.lap(loop_slot) # เวลาตั้งแต่ต้นรอบที่แล้วถึงต้นรอบนี้
+    gcmon.lap()         # ไบต์ที่รอบก่อนจอง
+
+    # อ่านระยะ (ค่ามัธยฐานที่กรองแล้ว) และเดินแผนหลบต่อ 1 ก้าว
+    phase = avoid.step()
+
+    # ส่งค่าให้จอ แล้วให้ dashboard วาด/ส่งภาพตามจังหวะของมันเอง (ไม่บล็อกการตรวจสิ่งกีดขวาง)
+    if avoid.avoiding():
+        dash.post(status_row, phase, "Avoid: %s")
+    else:
+        dash.post(status_row, "Moving Forward", "%s")
+    dash.post(dist_row, sonar.cm, "Dist: %d cm")
+    service()
+
+    # กด SW2 = บันทึกผลจับเวลา (ครั้งเดียวต่อการกด) และพิมพ์สรุปเวลาตอบสนอง
+    if save_button.value() == 0:
+        if not saved:
+            prof.dump(PROF_FILE)
+            avoid.report()
+            if GC_CHECK:
+                gcmon.report()
+            saved = True
+    else:
+        saved = False
+
+    time.sleep_ms(STEP_MS)
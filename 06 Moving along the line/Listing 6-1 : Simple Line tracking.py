@@ -1,62 +1,35 @@
-from machine import Pin, PWM  # นำเข้าไลบรารีควบคุมขา Pin และสัญญาณ PWM
+from mikrorover.board import SW1, LINE_L, LINE_R, button, wait_press, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน
+from mikrorover.drive import DriveTrain  # ชุดขับล้อกลาง (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.line import LineEvents  # เหตุการณ์เซนเซอร์เส้นด้วย IRQ
+from mikrorover.follow import LineFollower  # ตัวเดินตามเส้นแบบ PID (สั่งล้อด้วย fd2)
 import time                   # นำเข้าไลบรารีจัดการเรื่องเวลา
 
-M1_B = PWM(Pin(13)); M1_A = PWM(Pin(14)) # ล้อซ้าย ต่อขา 13, 14 
-M2_B = PWM(Pin(16)); M2_A = PWM(Pin(17)) # ล้อขวา ต่อขา 16, 17 
-M1_A.freq(1000); M1_B.freq(1000)         # ตั้งความถี่ 1000Hz
-M2_A.freq(1000); M2_B.freq(1000)
+# --- ตั้งค่ามอเตอร์ (Motor Setup) ---
+# ล้อซ้ายขา 14 (เดินหน้า) / 13 (ถอยหลัง), ล้อขวาขา 17 / 16 ความถี่ 1000Hz
+# ความเร็ว 0-100% แปลงด้วยตารางในโมดูล และสั่งค่าเดิมซ้ำจะไม่เขียน PWM ใหม่
+motors = DriveTrain()
 
-start_button = Pin(8, Pin.IN, Pin.PULL_UP) # ปุ่ม SW1 สำหรับเริ่มทำงาน 
-sensor_L = Pin(10, Pin.IN) # เซนเซอร์ด้านซ้าย ต่อขา 10 
-sensor_R = Pin(11, Pin.IN) # เซนเซอร์ด้านขวา ต่อขา 11 
-
-# ฟังก์ชันแปลงความเร็ว 0-100% เป็นค่า PWM 0-65535 
-def _map_constrain(speed):
-    if speed < 0: speed = 0
-    if speed > 100: speed = 100
-    return int(speed / 100 * 65535)
-
-# --- ฟังก์ชันควบคุมทิศทาง ---
-def fd(speed): # เดินหน้า 
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-def sl(speed): # หมุนซ้าย (Spin Left) เมื่อล้อซ้ายถอยหลัง ล้อขวาเดินหน้า
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(0); M1_B.duty_u16(pwm)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-def sr(speed): # หมุนขวา (Spin Right) เมื่อล้อซ้ายเดินหน้า ล้อขวาถอยหลัง 
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(pwm)
-
-def ao(): # หยุดจ่ายไฟมอเตอร์ทั้งหมด (All Off)
-    M1_A.duty_u16(0); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(0)
+start_button = button(SW1) # ปุ่ม SW1 สำหรับเริ่มทำงาน 
+# เซนเซอร์ด้านซ้ายต่อขา 10 ด้านขวาต่อขา 11 (1=ขาว, 0=ดำ)
+# LineEvents ใช้ IRQ บันทึกเฉพาะตอนที่ค่าเซนเซอร์เปลี่ยน ไม่ต้องวนอ่านค่าตลอดเวลา
+line = LineEvents(LINE_L, LINE_R)
 
 # วนลูปรอจนกว่าจะกดปุ่ม SW1 ถึงจะเริ่มทำงาน 
-while start_button.value() == 1:
-    time.sleep_ms(10)
-
-# --- ลูปหลักการเดินตามเส้น (Line Tracking Logic) ---
+ready("Line tracking")
+wait_press(start_button)
+
+# --- การเดินตามเส้น (Line Tracking Logic) ---
+# แทนการเดินหน้าเต็มที่/หมุนอยู่กับที่ ตัวควบคุม PID ประมาณว่าเส้นเบี้ยวไปทางไหนมากแค่ไหน
+# จากเซนเซอร์ทั้งสองตัวและเวลาที่อยู่บนเส้น แล้วลดความเร็วล้อด้านในด้วย fd2(ซ้าย, ขวา) อย่างต่อเนื่อง
+# ถ้ารถส่ายให้ลด KP หรือเพิ่ม KD, ถ้าเลี้ยวไม่ทันโค้งให้เพิ่ม KP หรือลด BASE_SPEED
+BASE_SPEED = 70   # ความเร็วเมื่อเส้นอยู่ตรงกลาง (%)
+KP = 20           # สัดส่วน: % ความเร็วที่ปรับต่อหน่วยความคลาดเคลื่อน (1 = เซนเซอร์ข้างหนึ่งเพิ่งเจอเส้น)
+KI = 0            # ปริพันธ์: แก้การเบี้ยวสะสมในโค้งยาว
+KD = 0.1          # อนุพันธ์: หน่วงการแกว่ง
+follow = LineFollower(motors, line, BASE_SPEED, KP, KI, KD)
+
+# เจอเส้นดำทั้งคู่ (ทางแยกหรือเส้นตัด) step() จะหยุดรถ และเดินต่อเมื่อเซนเซอร์เปลี่ยนค่า
+follow.reset()           # เริ่มจากสถานะปัจจุบัน
 while True:
-    left_val = sensor_L.value()  # อ่านค่าเซนเซอร์ซ้าย (1=ขาว, 0=ดำ) 
-    right_val = sensor_R.value() # อ่านค่าเซนเซอร์ขวา (1=ขาว, 0=ดำ) 
-    
-    # 1. ถ้าทั้งสองตัวตรวจพบพื้นสีขาว ให้เดินหน้าต่อไป 
-    if left_val == 1 and right_val == 1:
-        fd(60)
-    
-    # 2. ถ้าเซนเซอร์ซ้ายเจอเส้นดำ ให้หมุนซ้ายเพื่อกลับเข้าหาเส้น 
-    elif left_val == 0 and right_val == 1:
-        sl(70)
-    
-    # 3. ถ้าเซนเซอร์ขวาเจอเส้นดำ ให้หมุนขวาเพื่อกลับเข้าหาเส้น
-    elif left_val == 1 and right_val == 0:
-        sr(70)
-    
-    # 4. ถ้าเจอเส้นดำทั้งคู่ (ทางแยกหรือเส้นตัด) ให้หยุด
-    else:
-        ao()
+    follow.step()        # คำนวณ PID แล้วสั่งมอเตอร์
+    follow.wait()        # พัก CPU จนเซนเซอร์เปลี่ยนค่าหรือครบรอบควบคุม (5 ms)
@@ -1,38 +1,36 @@
-from machine import Pin, PWM, I2C   
-from ssd1306 import SSD1306_I2C    
+from mikrorover.board import SW1, SW2, SERVO2, oled, button, wait_press, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.servo import Servos  # เซอร์โวที่แปลงมุมด้วยตารางปรับเทียบ (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.sprites import label, NumericField  # ป้ายและตัวเลขที่เรนเดอร์ไว้ล่วงหน้า (วาดใหม่เฉพาะหลักที่เปลี่ยน)
 import time                        
 
-i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000) # เชื่อมต่อจอที่ขา SDA=4, SCL=5
-display = SSD1306_I2C(128, 64, i2c, addr=0x3C)    # กำหนดที่อยู่จอเป็น 0x3C
+display = oled()    # จอ OLED ที่ส่งเฉพาะส่วนที่เปลี่ยน (ขา SDA=4, SCL=5 แอดเดรส 0x3C)
 
 # --- ตั้งค่าเซอร์โวมอเตอร์สำหรับแขนยก (Lift Servo) ---
-SV2_PIN = 19               # กำหนดขาเชื่อมต่อเซอร์โวตัวยกเป็นขา GPIO19 
-sv_grip = PWM(Pin(SV2_PIN)) # สร้างออบเจกต์ PWM เพื่อควบคุมเซอร์โว 
-sv_grip.freq(50)           # ตั้งค่าความถี่มาตรฐานสำหรับเซอร์โวมอเตอร์ที่ 50Hz
+SV2_PIN = SERVO2           # กำหนดขาเชื่อมต่อเซอร์โวตัวยกเป็นขา GPIO19 
+servos = Servos((SV2_PIN,)) # สร้างเซอร์โว (PWM ความถี่มาตรฐาน 50Hz) พร้อมตารางแปลงมุม 
+sv_grip = 0                # หมายเลขเซอร์โวใน servos
 
-sw1 = Pin(8, Pin.IN, Pin.PULL_UP) # ปุ่ม SW1 สำหรับลดองศา 
-sw2 = Pin(9, Pin.IN, Pin.PULL_UP) # ปุ่ม SW2 สำหรับเพิ่มองศา 
+sw1 = button(SW1) # ปุ่ม SW1 สำหรับลดองศา 
+sw2 = button(SW2) # ปุ่ม SW2 สำหรับเพิ่มองศา 
 
 current_angle = 90 # เริ่มต้นตั้งองศาที่ 90 องศา (ตำแหน่งกึ่งกลาง) 
 
-# ฟังก์ชันเทียบเคียงค่า (Mapping) เพื่อแปลงองศาเป็นค่าความกว้างพัลส์ (ns)
-def map_value(x, in_min, in_max, out_min, out_max):
-    return (x - in_min) * (out_max - out_min) // (in_max - in_min) + out_min
-
-# ฟังก์ชันสั่งการเซอร์โวมอเตอร์ตามองศา (0-180)
-def set_servo_angle(servo_pwm, angle):
-    if angle < 0: angle = 0      # จำกัดองศาไม่ให้ต่ำกว่า 0 
-    if angle > 180: angle = 180  # จำกัดองศาไม่ให้เกิน 180 
-    # แปลงองศาเป็นหน่วยนาโนวินาที (500,000ns - 2,500,000ns)
-    duty_ns = map_value(angle, 0, 180, 500000, 2500000)
-    servo_pwm.duty_ns(int(duty_ns))
+# ฟังก์ชันสั่งงานเซอร์โวมอเตอร์ตามเลของศาที่ระบุ (0-180)
+# มุมแปลงเป็นพัลส์ 0.5ms (500,000ns) ถึง 2.5ms (2,500,000ns) ด้วยตารางที่คำนวณไว้ล่วงหน้า
+# ตารางสร้างจากค่าปรับเทียบใน servo_cal.json (ถ้ามี) องศาที่ได้จากโปรแกรมนี้จึงตรงกับ Listing อื่นที่ใช้ Servos
+set_servo_angle = servos.write
 
 # วนลูปรอจนกว่าจะกดปุ่ม SW1 เพื่อเริ่มโปรแกรมทดสอบ 
-while sw1.value() == 1:
-    time.sleep_ms(10)
+ready("Gripper-X lift")
+wait_press(sw1)
 
 set_servo_angle(sv_grip, current_angle) # เริ่มต้นสั่งเซอร์โวไปที่ตำแหน่ง 90
 
+# หน้าจอ: ป้ายชื่อขาวาดครั้งเดียว ตัวเลของศาเป็นช่องที่วาดใหม่เฉพาะหลักที่เปลี่ยน
+display.fill(0)
+label("SV2 (GP19):").draw(display, 0, 10)
+angle_field = NumericField(display, 0, 25, 3, left=True)
+
 while True:
     sw1_pressed = (sw1.value() == 0) # อ่านสถานะปุ่ม SW1 
     sw2_pressed = (sw2.value() == 0) # อ่านสถานะปุ่ม SW2 
@@ -45,9 +43,7 @@ while True:
         current_angle += 1
         
     set_servo_angle(sv_grip, current_angle) # อัปเดตตำแหน่งเซอร์โว
-    display.fill(0)
-    display.text("SV2 (GP19):", 0, 10, 1)      # แสดงชื่อขาเซอร์โว
-    display.text(str(current_angle), 0, 25, 1) # แสดงเลของศาปัจจุบัน
+    angle_field.set(current_angle)  # แสดงเลของศาปัจจุบัน (วาดใหม่เฉพาะหลักที่เปลี่ยน)
     display.show()
     
     time.sleep_ms(50) # หน่วงเวลาเล็กน้อยเพื่อให้ขยับอย่างต่อเนื่องแต่ไม่เร็วเกินไป [cite: 1949]
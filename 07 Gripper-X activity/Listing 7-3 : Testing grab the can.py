@@ -1,57 +1,45 @@
-from machine import Pin, PWM  
+from mikrorover.board import SW1, SW2, SERVO1, SERVO2, button, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน
+from mikrorover.servo import ServoPlanner  # ตัววางแผนการเคลื่อนที่ของเซอร์โว (ต้องมี lib/mikrorover บนบอร์ด)
 import time                   
 
-sv_1 = PWM(Pin(18)) # เซอร์โวตัวที่ 1 ต่อขา 18 
-sv_2 = PWM(Pin(19)) # เซอร์โวตัวที่ 2 ต่อขา 19 
-sv_1.freq(50)       # ตั้งความถี่ 50Hz สำหรับเซอร์โวตัวยก 
-sv_2.freq(50)       # ตั้งความถี่ 50Hz สำหรับเซอร์โวตัวคีบ 
-
-sw1 = Pin(8, Pin.IN, Pin.PULL_UP) # ปุ่ม SW1 สำหรับสั่งคีบ 
-sw2 = Pin(9, Pin.IN, Pin.PULL_UP) # ปุ่ม SW2 สำหรับสั่งวาง 
+sw1 = button(SW1) # ปุ่ม SW1 สำหรับสั่งคีบ 
+sw2 = button(SW2) # ปุ่ม SW2 สำหรับสั่งวาง 
 
 # --- กำหนดค่าองศามาตรฐาน *ตำแหน่งอาจต่างกัน จะต้องหาค่าที่เหมาะสมจากตัวอย่าง Listing 7-1, 7-2* ---
 sv1Up = 5      # องศาสำหรับยกแขนขึ้น 
 sv1Down = 90   # องศาสำหรับลดแขนลง 
 sv2Pick = 100  # องศาสำหรับหุบมือคีบ 
 sv2Drop = 30   # องศาสำหรับกางมือปล่อย 
+SERVO_SPEED = 300  # ความเร็วสูงสุดของเซอร์โว (องศา/วินาที) ถ้าแขนขยับไม่ทันหรือกระตุกให้ลดค่านี้
 
-# ฟังก์ชันเทียบเคียงค่าเพื่อแปลงองศาเป็นพัลส์หน่วยนาโนวินาที (ns) 
-def map_value(x, in_min, in_max, out_min, out_max):
-    return (x - in_min) * (out_max - out_min) // (in_max - in_min) + out_min
+# --- แขนจับ: เซอร์โวตัวที่ 1 (ยก) ขา 18, ตัวที่ 2 (คีบ) ขา 19 ความถี่ 50Hz ---
+# ตัววางแผนค่อย ๆ เลื่อนพัลส์ไปหามุมเป้าหมายด้วย Timer และรู้ว่าแขนถึงตำแหน่งเมื่อไร
+# จึงไม่ต้อง sleep เผื่อเวลา แต่ละท่าจบทันทีที่เซอร์โวขยับเสร็จ
+SV1, SV2 = 0, 1
+arm = ServoPlanner((SERVO1, SERVO2), (sv1Up, sv2Drop), speed=SERVO_SPEED)
 
-# ฟังก์ชันสั่งงานเซอร์โวมอเตอร์ตามเลของศาที่ระบุ 
-def set_servo_angle(servo_pwm, angle):
-    if angle < 0: angle = 0
-    if angle > 180: angle = 180
-    duty_ns = map_value(angle, 0, 180, 500000, 2500000)
-    servo_pwm.duty_ns(int(duty_ns))
+# --- ลำดับท่า (เซอร์โว, องศา) ทำทีละขั้นเมื่อขั้นก่อนหน้าถึงตำแหน่งแล้ว ---
+SET = ((SV1, sv1Up), (SV2, sv2Drop))                       # แขนยกขึ้น -> กางมือจับออก 
+PICK_UP = ((SV1, sv1Down), (SV2, sv2Pick), (SV1, sv1Up))   # ลดแขนลง -> หุบมือคีบวัตถุ -> ยกแขนขึ้นพร้อมวัตถุ 
+DROP_DOWN = ((SV1, sv1Down), (SV2, sv2Drop), (SV1, sv1Up)) # ลดแขนลง -> กางมือปล่อยวัตถุ -> ยกแขนเปล่ากลับขึ้นมา 
 
 # ฟังก์ชันตั้งท่าเริ่มต้น (แขนยกขึ้นและกางมือออก) 
 def servoSet():
-    set_servo_angle(sv_1, sv1Up)   # ยกแขนขึ้น 
-    time.sleep_ms(300)
-    set_servo_angle(sv_2, sv2Drop) # กางมือจับออก 
-    time.sleep_ms(300)
+    arm.play(SET)
+    arm.wait()
 
 # ฟังก์ชันขั้นตอนการคีบ (Pick Up): ลง -> คีบ -> ยก 
 def PickUp():
-    set_servo_angle(sv_1, sv1Down) # ลดแขนลง 
-    time.sleep_ms(300)
-    set_servo_angle(sv_2, sv2Pick) # หุบมือคีบวัตถุ 
-    time.sleep_ms(300)
-    set_servo_angle(sv_1, sv1Up)   # ยกแขนขึ้นพร้อมวัตถุ 
-    time.sleep_ms(300)
+    arm.play(PICK_UP)
+    arm.wait()
 
 # ฟังก์ชันขั้นตอนการวาง (Drop Down): ลง -> ปล่อย -> ยกแขนเปล่า 
 def DropDown():
-    set_servo_angle(sv_1, sv1Down) # ลดแขนลง 
-    time.sleep_ms(300)
-    set_servo_angle(sv_2, sv2Drop) # กางมือปล่อยวัตถุ 
-    time.sleep_ms(300)
-    set_servo_angle(sv_1, sv1Up)   # ยกแขนเปล่ากลับขึ้นมา 
-    time.sleep_ms(300)
+    arm.play(DROP_DOWN)
+    arm.wait()
 
 servoSet() # เรียกใช้งานท่าเริ่มต้นเมื่อเปิดเครื่อง 
+ready("Grab the can")
 
 while True:
     sw1_pressed = (sw1.value() == 0) # อ่านสถานะปุ่ม SW1 
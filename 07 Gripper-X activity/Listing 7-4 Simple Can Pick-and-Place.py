@@ -1,134 +1,113 @@
-from machine import Pin, PWM
+from machine import Pin
+from mikrorover.board import SW1, SW2, LINE_L, LINE_R, SERVO1, SERVO2, button, wait_press, ready  # ขาและอุปกรณ์ของบอร์ดที่ใช้ร่วมกัน
+from mikrorover.drive import DriveTrain  # ชุดขับล้อกลาง (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.line import LineEvents  # เหตุการณ์เซนเซอร์เส้นด้วย IRQ
+from mikrorover.follow import LineFollower  # ตัวเดินตามเส้นแบบ PID (สั่งล้อด้วย fd2)
+from mikrorover.servo import ServoPlanner  # ตัววางแผนการเคลื่อนที่ของเซอร์โว (ขยับแขนได้ระหว่างรถวิ่ง)
+from mikrorover.prof import Profiler  # ตัวจับเวลาโค้ด (ฮิสโทแกรม ticks_us)
 import time
 
-M1_B = PWM(Pin(13)); M1_A = PWM(Pin(14)) # มอเตอร์ล้อซ้าย
-M2_B = PWM(Pin(16)); M2_A = PWM(Pin(17)) # มอเตอร์ล้อขวา
-M1_A.freq(1000); M1_B.freq(1000)         # ตั้งความถี่ 1000Hz
-M2_A.freq(1000); M2_B.freq(1000)
+# --- ตั้งค่ามอเตอร์ (Motor Setup) ---
+# ล้อซ้ายขา 14 (เดินหน้า) / 13 (ถอยหลัง), ล้อขวาขา 17 / 16 ความถี่ 1000Hz
+# ความเร็ว 0-100% แปลงด้วยตารางในโมดูล และสั่งค่าเดิมซ้ำจะไม่เขียน PWM ใหม่
+motors = DriveTrain()
+fd, bk, sl, sr, ao = motors.fd, motors.bk, motors.sl, motors.sr, motors.ao
 
-# --- ตั้งค่าเซอร์โวมอเตอร์ (Servo Setup) ---
-sv_1 = PWM(Pin(18)) # เซอร์โวตัวยกแขน (ขา 18)
-sv_2 = PWM(Pin(19)) # เซอร์โวตัวคีบ (ขา 19)
-sv_1.freq(50); sv_2.freq(50)
-
-sw1 = Pin(8, Pin.IN, Pin.PULL_UP)  # ปุ่มเริ่มงาน SW1
-sw2 = Pin(9, Pin.IN, Pin.PULL_UP)  # ปุ่มสำรอง SW2
-sensor_L = Pin(10, Pin.IN)         # เซนเซอร์เส้นด้านซ้าย
-sensor_R = Pin(11, Pin.IN)         # เซนเซอร์เส้นด้านขวา
+sw1 = button(SW1)                  # ปุ่มเริ่มงาน SW1
+sw2 = button(SW2)                  # ปุ่มสำรอง SW2
+sensor_L = Pin(LINE_L, Pin.IN)     # เซนเซอร์เส้นด้านซ้าย
+sensor_R = Pin(LINE_R, Pin.IN)     # เซนเซอร์เส้นด้านขวา
+line = LineEvents(LINE_L, LINE_R)  # เหตุการณ์เมื่อเซนเซอร์ซ้าย/ขวาเปลี่ยนค่า (บันทึกเวลาด้วย IRQ)
 
 # --- กำหนดค่าคงที่สำหรับองศาเซอร์โว * ตำแหน่งอาจต่างกัน หาค่าที่เหมาะสมได้จาก Listing 7-1, 7-2 *---
 sv1Up = 5      # ยกแขนขึ้น
 sv1Down = 90   # วางแขนลง
 sv2Pick = 100  # หุบคีบ
 sv2Drop = 30   # กางออก
+SERVO_SPEED = 300  # ความเร็วสูงสุดของเซอร์โว (องศา/วินาที) ถ้าแขนขยับไม่ทันหรือกระตุกให้ลดค่านี้
+
+# --- ตั้งค่าเซอร์โวมอเตอร์ (Servo Setup) ---
+# เซอร์โวตัวยกแขน (ขา 18) และตัวคีบ (ขา 19) ความถี่ 50Hz ขยับด้วย Timer ไปหามุมเป้าหมาย
+SV1, SV2 = 0, 1
+arm = ServoPlanner((SERVO1, SERVO2), (sv1Up, sv2Drop), speed=SERVO_SPEED)
 
-# --- ฟังก์ชันช่วยการทำงาน (Utility Functions) ---
-def _map_constrain(speed): # จำกัดความเร็ว 0-100 และแปลงเป็น PWM
-    if speed < 0: speed = 0
-    if speed > 100: speed = 100
-    return int(speed / 100 * 65535)
-
-def map_value(x, in_min, in_max, out_min, out_max): # เทียบเคียงค่าองศา
-    return (x - in_min) * (out_max - out_min) // (in_max - in_min) + out_min
-
-def set_servo_angle(servo_pwm, angle): # สั่งงานเซอร์โวตามองศา
-    if angle < 0: angle = 0
-    if angle > 180: angle = 180
-    duty_ns = map_value(angle, 0, 180, 500000, 2500000)
-    servo_pwm.duty_ns(int(duty_ns))
-
-# --- ฟังก์ชันควบคุมทิศทาง (Movement Functions) ---
-def fd(speed): # เดินหน้า
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-def bk(speed): # ถอยหลัง
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(0); M1_B.duty_u16(pwm)
-    M2_A.duty_u16(0); M2_B.duty_u16(pwm)
-
-def sl(speed): # หมุนซ้าย
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(0); M1_B.duty_u16(pwm)
-    M2_A.duty_u16(pwm); M2_B.duty_u16(0)
-
-def sr(speed): # หมุนขวา
-    pwm = _map_constrain(speed)
-    M1_A.duty_u16(pwm); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(pwm)
-
-def ao(): # หยุดมอเตอร์ทั้งหมด
-    M1_A.duty_u16(0); M1_B.duty_u16(0)
-    M2_A.duty_u16(0); M2_B.duty_u16(0)
+# --- ลำดับท่าของมือจับ (เซอร์โว, องศา) ขั้นถัดไปเริ่มทันทีที่ขั้นก่อนถึงตำแหน่ง ---
+SET = ((SV1, sv1Up), (SV2, sv2Drop))                       # ท่าเริ่มต้น
+PICK_UP = ((SV1, sv1Down), (SV2, sv2Pick), (SV1, sv1Up))   # ขั้นตอนคีบยก
+DROP_DOWN = ((SV1, sv1Down), (SV2, sv2Drop), (SV1, sv1Up)) # ขั้นตอนวางปล่อย
 
 # --- ฟังก์ชันจัดการมือจับ (Gripper Functions) ---
-def servoSet(): # ท่าเริ่มต้น
-    set_servo_angle(sv_1, sv1Up)
-    time.sleep_ms(500)
-    set_servo_angle(sv_2, sv2Drop)
-    time.sleep_ms(500)
-
-def PickUp(): # ขั้นตอนคีบยก
-    set_servo_angle(sv_1, sv1Down)
-    time.sleep_ms(500)
-    set_servo_angle(sv_2, sv2Pick)
-    time.sleep_ms(500)
-    set_servo_angle(sv_1, sv1Up)
-    time.sleep_ms(500)
+def servoSet(): # ท่าเริ่มต้น (ไม่รอ: แขนขยับไปพร้อมกับที่รถเริ่มวิ่ง)
+    arm.play(SET)
+
+def PickUp(): # ขั้นตอนคีบยก (รอจนยกเสร็จจริง ไม่ใช่รอเวลาเผื่อ)
+    arm.play(PICK_UP)
+    arm.wait()
 
 def DropDown(): # ขั้นตอนวางปล่อย
-    set_servo_angle(sv_1, sv1Down)
-    time.sleep_ms(1000)
-    set_servo_angle(sv_2, sv2Drop)
-    time.sleep_ms(500)
-    set_servo_angle(sv_1, sv1Up)
-    time.sleep_ms(500)
+    arm.play(DROP_DOWN)
+    arm.wait()
 
 # --- ฟังก์ชันเดินตามเส้น (Line Tracking) ---
-def track(): # เดินตามเส้นจนกว่าจะเจอเส้นตัด (ดำทั้งคู่)
-    while True:
-        left_val = sensor_L.value()
-        right_val = sensor_R.value()
-        if left_val == 1 and right_val == 1:
-            fd(40)
-        elif left_val == 0 and right_val == 1:
-            sl(50)
-        elif left_val == 1 and right_val == 0:
-            sr(50)
-        elif left_val == 0 and right_val == 0: # เจอเส้นตัด
-            ao()
-            break
+# ตัวควบคุม PID ลดความเร็วล้อด้านในอย่างต่อเนื่องด้วย fd2 แทนการหมุนอยู่กับที่ (ปรับค่าได้ตามสนาม)
+# ค่าคงที่ทั้งหมดหาค่าที่ดีที่สุดบนสนามจำลองได้ด้วย python -m host.tune pick
+TRACK_SPEED = 60  # ความเร็วเมื่อเส้นอยู่ตรงกลาง (%)
+KP = 20
+KI = 0
+KD = 0.1
+NUDGE_SPEED = 50  # ขยับหน้าให้พ้นเส้นตัดก่อนเลี้ยว
+NUDGE_MS = 150
+TURN_SPEED = 40   # ความเร็วหมุนหาเส้น
+TURN_MS = 500     # หมุนก่อนเริ่มหาเส้น (ให้เซนเซอร์พ้นเส้นเดิม)
+follow = LineFollower(motors, line, TRACK_SPEED, KP, KI, KD)
+
+def track(): # เดินตามเส้นจนกว่าจะเจอเส้นตัด (ดำทั้งคู่) แล้วหยุด
+    follow.run()
+    print("cross: stop latency", line.latency_us(), "us")
+
+# --- จับเวลาโค้ด (Profiling) ---
+# ห่อฟังก์ชันหลักเพื่อเก็บจำนวนครั้งและเวลาที่ใช้ บันทึกลง PROF_FILE เมื่อจบภารกิจ
+# ดูผลบนคอมพิวเตอร์ด้วย python -m host.profdump prof.bin
+PROFILE = True
+PROF_FILE = "prof.bin"
+prof = Profiler(enabled=PROFILE)
+fd, sl, sr = prof.wrap("fd", fd), prof.wrap("sl", sl), prof.wrap("sr", sr)
+track = prof.wrap("track", track)
+PickUp = prof.wrap("PickUp", PickUp)
+DropDown = prof.wrap("DropDown", DropDown)
 
 # --- ส่วนการทำงานหลัก (Main Mission Logic) ---
-while sw1.value() == 1: # รอกดปุ่มเริ่มงาน
-    time.sleep_ms(10)
+ready("Pick-and-Place")
+wait_press(sw1) # รอกดปุ่มเริ่มงาน
 
 servoSet()      # ตั้งท่าเริ่มต้น
-time.sleep(0.5)
 track()         # 1. เดินตามเส้นไปจนถึงทางแยก/จุดคีบ
 
-fd(50); time.sleep_ms(150); ao() # ขยับหน้าเล็กน้อยให้พ้นจุดตัด
+fd(NUDGE_SPEED); time.sleep_ms(NUDGE_MS); ao() # ขยับหน้าเล็กน้อยให้พ้นจุดตัด
 while sensor_L.value() == 1:     # หมุนซ้ายหาเส้นถัดไป
-    sl(40); time.sleep_ms(10)
+    sl(TURN_SPEED); time.sleep_ms(10)
 ao()
 
 track() # 2. เดินตามเส้นต่อ
 ao(); time.sleep_ms(200)
 PickUp() # 3. คีบวัตถุ
 
-sl(40); time.sleep_ms(500)   # หมุนตัวกลับ
+sl(TURN_SPEED); time.sleep_ms(TURN_MS)   # หมุนตัวกลับ
 while sensor_L.value() == 1: # หาเส้นเพื่อเดินกลับ
-    sl(40); time.sleep_ms(10)
+    sl(TURN_SPEED); time.sleep_ms(10)
 ao()
 
 track() # 4. เดินตามเส้นกลับ
-fd(50); time.sleep_ms(150)
-sr(40); time.sleep_ms(500)   # เลี้ยวขวาเข้าจุดวาง
+fd(NUDGE_SPEED); time.sleep_ms(NUDGE_MS)
+sr(TURN_SPEED); time.sleep_ms(TURN_MS)   # เลี้ยวขวาเข้าจุดวาง
 while sensor_R.value() == 1:
-    sr(40); time.sleep_ms(10)
+    sr(TURN_SPEED); time.sleep_ms(10)
 ao()
 
 track() # 5. เดินเข้าจุดวางสุดท้าย
 ao(); time.sleep_ms(200)
 DropDown() # 6. วางวัตถุจบภารกิจ
+
+if PROFILE:
+    prof.dump(PROF_FILE)
+    prof.report()
@@ -1,36 +1,22 @@
-from machine import Pin
-import rp2
+from mikrorover.x14 import X14, BUTTONS  # ตัวรับจอย Wireless-X14 ที่กลับเข้าจังหวะเองเมื่อไบต์หาย (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.board import X14_RX, X14_BAUD, ready  # ขาและค่าคงที่ของบอร์ดที่ใช้ร่วมกัน
+from mikrorover.textbuf import TextBuf  # ข้อความในบัฟเฟอร์ที่จองไว้ครั้งเดียว (พิมพ์โดยไม่สร้าง str ใหม่)
 import time
 # ---ส่วนตั้งค่า (Configuration)---
-UART_PIN_ID = 12       # ใช้พอร์ต D3 (ขา 12)
-BAUD_RATE   = 9600     # ความเร็วการสื่อสารของจอย Wireless-X14
+UART_PIN_ID = X14_RX   # ใช้พอร์ต D3 (ขา 12)
+BAUD_RATE   = X14_BAUD # ความเร็วการสื่อสารของจอย Wireless-X14
 TIMEOUT_MS  = 150      # เวลาที่ใช้จับว่าปล่อยมือหรือยัง (มิลลิวินาที)
-# ตารางจับคู่ชื่อปุ่ม (รหัส Hex )
-BUTTONS = {
-    0x0011: "LU", 0x0021: "LL", 0x0081: "LD", 0x0041: "LR",
-    0x1001: "RU", 0x4001: "RL", 0x8001: "RD", 0x2001: "RR",
-    0x0009: "L1", 0x0005: "L2", 0x0003: "LT",
-    0x0801: "R1", 0x0401: "R2", 0x0201: "RT"
-}
+# ตารางจับคู่ชื่อปุ่ม (รหัส Hex ) คือ BUTTONS ในโมดูล mikrorover.x14
 # ---สร้างตัวอ่านสัญญาณ (PIO Setup)---
-# ส่วนนี้ใช้ภาษา Assembly สร้างตัวอ่าน UART จำลองขึ้นมาเอง
-@rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT, autopush=True, push_thresh=8)
-def uart_rx():
-    wait(0, pin, 0)         # รอสัญญาณเริ่ม (Start Bit เป็น 0)
-    set(x, 7)       [10]    # เตรียมวนลูปรับข้อมูล 8 บิต
-    label("bit_loop")       # จุดเริ่มวนลูป
-    in_(pins, 1)            # อ่านข้อมูลเข้ามา 1 บิต
-    nop()           [5]     # รอจังหวะเวลา (ให้ตรงกับความเร็ว)
-    jmp(x_dec, "bit_loop")  # กระโดดกลับไปเริ่มวนลูปใหม่
-# ตั้งค่าขา Pin และเริ่มการทำงาน
-# สำคัญ: เปิด PULL_UP เพื่อป้องกันสัญญาณรบกวน
-pin_setup = Pin(UART_PIN_ID, Pin.IN, Pin.PULL_UP)
-sm = rp2.StateMachine(0, uart_rx, freq=8*BAUD_RATE, in_base=pin_setup)
-sm.active(1)
-print(f"ระบบพร้อมทำงานที่พอร์ต D3 (ขา {UART_PIN_ID})...")
+# X14 สร้าง State Machine รับ UART ที่ขา 12 (เปิด PULL_UP ให้แล้ว) ที่ประกอบเฟรม 2 ไบต์ใน PIO เอง
+# FIFO ได้รหัส 16 บิตครั้งเดียวต่อเฟรม ถ้าไบต์หาย/stop bit ผิด PIO จะทิ้งเฟรมนั้นและรอเฟรมถัดไปเอง
+# codes=None รับทุกรหัสโดยไม่ตรวจกับตาราง BUTTONS จอยที่ส่งรหัสต่างออกไปจึงยังแสดงเป็น Unknown พร้อมรหัสให้ดูได้
+remote = X14(UART_PIN_ID, BAUD_RATE, codes=None)
+ready("Wireless-X14 Reading (D3)")  # ระบบพร้อมทำงาน: เวลาบูตและหน่วยความจำที่เหลือ
+# ชื่อปุ่มเป็น bytes เตรียมไว้ครั้งเดียว และบรรทัดข้อความที่ใช้ซ้ำทุกครั้งที่พิมพ์
+NAMES = {code: name.encode() for code, name in BUTTONS.items()}
+line = TextBuf(40)
 # ---ตัวแปรช่วยจำ (Variables)---
-first_byte = 0              # ตัวแปรพักข้อมูลชุดแรก (ครึ่งแรก)
-waiting_for_byte1 = True    # สถานะ: กำลังรอรับข้อมูลชุดแรกอยู่ใช่ไหม?
 is_pressed = False          # สถานะ: ตอนนี้มีการกดปุ่มค้างอยู่ไหม?
 last_time = time.ticks_ms() # เวลาล่าสุดที่ได้รับข้อมูล
 # ---ลูปหลัก (Main Loop)---
@@ -40,25 +26,23 @@ while True:
     # ถ้ามีการกดปุ่มค้างอยู่ แต่ไม่มีข้อมูลใหม่เข้ามานานเกิน 150ms
     if is_pressed and time.ticks_diff(current_time, last_time) > TIMEOUT_MS:
         print("-> RELEASED (ปล่อยมือ)")
+        # คุณภาพสัญญาณ: เฟรมที่ถูกต้อง / ไบต์ที่ทิ้ง / เฟรมเสีย / จำนวนครั้งที่กลับเข้าจังหวะได้
+        print("   link: frames=%d dropped=%d invalid=%d recovered=%d" % remote.decoder.stats())
         is_pressed = False
     # --- ตรวจสอบข้อมูลเข้า (Incoming Data) ---
-    if sm.rx_fifo(): # ถ้ามีข้อมูลมารอในคิว
-        # อ่านข้อมูลออกมา 1 ตัว (ค่า 0-255)
-        data = sm.get() & 0xFF
+    keycode = remote.read() # รหัสปุ่ม 16 บิตที่ครบเฟรมแล้ว (-1 = ยังไม่มี)
+    if keycode >= 0:
         last_time = current_time # อัปเดตเวลาล่าสุด
-        if waiting_for_byte1:
-            # ขั้นตอนที่ 1: เก็บข้อมูลครึ่งแรกไว้ก่อน
-            first_byte = data
-            waiting_for_byte1 = False # เปลี่ยนสถานะไปรอครึ่งหลัง
-        else:
-            # ขั้นตอนที่ 2: เอาครึ่งแรกมารวมกับครึ่งหลัง
-            # สูตร: เอาตัวแรกเลื่อนซ้าย 8 หลัก แล้วบวกตัวที่สอง
-            keycode = (first_byte << 8) | data
-            # แปลงรหัส Hex เป็นชื่อปุ่มที่มนุษย์อ่านออก
-            button_name = BUTTONS.get(keycode, "Unknown")
-            # กรองค่าว่าง (0x0000, 0x0001) ไม่ให้แสดงรกหน้าจอ
-            if keycode not in (0, 1):
-                # แสดงผล: ชื่อปุ่ม และ รหัสฐาน 16 (Hex)
-                print(f"Button: {button_name:<15} | Code: 0x{keycode:04X}")
-                is_pressed = True # จำสถานะว่ามีการกดปุ่ม
-            waiting_for_byte1 = True # รีเซ็ตกลับไปรอข้อมูลชุดใหม่
+        # แปลงรหัส Hex เป็นชื่อปุ่มที่มนุษย์อ่านออก
+        button_name = NAMES.get(keycode, b"Unknown")
+        # กรองค่าว่าง (0x0000, 0x0001) ไม่ให้แสดงรกหน้าจอ
+        if keycode > 1:
+            # แสดงผล: ชื่อปุ่ม และ รหัสฐาน 16 (Hex) เหมือน f"Button: {button_name:<15} | Code: 0x{keycode:04X}"
+            line.clear()
+            line.put(b"Button: ")
+            line.put(button_name)
+            line.pad(23)             # ชื่อปุ่มชิดซ้ายกว้าง 15 ตัวอักษร
+            line.put(b" | Code: 0x")
+            line.hex(keycode, 4)
+            line.write()
+            is_pressed = True # จำสถานะว่ามีการกดปุ่ม
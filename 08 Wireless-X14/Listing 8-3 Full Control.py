@@ -1,81 +1,34 @@
-from machine import Pin, PWM
-import rp2
+from mikrorover.drive import DriveTrain  # ชุดขับล้อกลาง (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.x14 import X14, Bindings, LU, LD, LL, LR  # ตัวรับจอย Wireless-X14 ที่กลับเข้าจังหวะเองเมื่อไบต์หาย (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.board import X14_RX, X14_BAUD, ready  # ขาและค่าคงที่ของบอร์ดที่ใช้ร่วมกัน
 import time
 
 # --- การตั้งค่าคงที่ ---
-UART_PIN   = 12    # ขา D3 (GPIO 12) สำหรับรับสัญญาณจากรีโมต
-BAUD_RATE  = 9600  # ความเร็วการส่งข้อมูล (Baud rate)
-TIMEOUT_MS = 150   # ระยะเวลา Safety (ถ้าสัญญาณเงียบเกิน 0.15 วิ ให้หยุด)
-SPEED      = 60    # ความเร็วในการเคลื่อนที่ (0-100)
+UART_PIN   = X14_RX    # ขา D3 (GPIO 12) สำหรับรับสัญญาณจากรีโมต
+BAUD_RATE  = X14_BAUD  # ความเร็วการส่งข้อมูล (Baud rate)
+TIMEOUT_MS = 150       # ระยะเวลา Safety (ถ้าสัญญาณเงียบเกิน 0.15 วิ ให้หยุด)
+SPEED      = 60        # ความเร็วในการเคลื่อนที่ (0-100)
 
 # --- การตั้งค่ามอเตอร์ (Motor Setup) ---
-# กำหนดขา PWM ให้มอเตอร์ซ้าย (m1) และขวา (m2)
-m1a = PWM(Pin(13)); m1a.freq(1000) 
-m1b = PWM(Pin(14)); m1b.freq(1000)
-m2a = PWM(Pin(16)); m2a.freq(1000)
-m2b = PWM(Pin(17)); m2b.freq(1000)
-
-# --- ฟังก์ชันควบคุมมอเตอร์ ---
-
-# ฟังก์ชันแปลงค่า 0-100 เป็นค่า Duty Cycle (0-65535)
-def set_speed(pin, value):
-    duty = int(max(0, min(100, value)) * 655.35)
-    pin.duty_u16(duty)
-
-# ฟังก์ชันสั่งหยุด (ตัดไฟมอเตอร์ทุกตัว)
-def stop():
-    m1a.duty_u16(0); m1b.duty_u16(0)
-    m2a.duty_u16(0); m2b.duty_u16(0)
-
-# ฟังก์ชันเดินหน้า (Forward)
-def forward(s):
-    # ล้อซ้ายเดินหน้า, ล้อขวาเดินหน้า
-    m1a.duty_u16(0); set_speed(m1b, s) 
-    m2a.duty_u16(0); set_speed(m2b, s)
-
-# ฟังก์ชันถอยหลัง (Backward)
-def backward(s):
-    # ล้อซ้ายถอยหลัง, ล้อขวาถอยหลัง (สลับขั้วจ่ายไฟ)
-    set_speed(m1a, s); m1b.duty_u16(0)
-    set_speed(m2a, s); m2b.duty_u16(0)
-
-# ฟังก์ชันหมุนซ้าย (Spin Left)
-def turn_left(s):
-    # เทคนิคการหมุนตัว: ล้อซ้ายถอย + ล้อขวาหน้า
-    set_speed(m1a, s); m1b.duty_u16(0) 
-    m2a.duty_u16(0); set_speed(m2b, s) 
-
-# ฟังก์ชันหมุนขวา (Spin Right)
-def turn_right(s):
-    # เทคนิคการหมุนตัว: ล้อซ้ายหน้า + ล้อขวาถอย
-    m1a.duty_u16(0); set_speed(m1b, s) 
-    set_speed(m2a, s); m2b.duty_u16(0) 
+# ล้อซ้ายขา 14 (เดินหน้า) / 13 (ถอยหลัง), ล้อขวาขา 17 / 16 ความถี่ 1000Hz
+# ความเร็ว 0-100% แปลงด้วยตารางในโมดูล และสั่งค่าเดิมซ้ำจะไม่เขียน PWM ใหม่
+motors = DriveTrain()
+forward, backward, stop = motors.fd, motors.bk, motors.ao
+turn_left, turn_right = motors.sl, motors.sr  # หมุนตัวอยู่กับที่
 
 # --- ตารางจับคู่ปุ่มกด (Button Map) ---
-BUTTONS = {
-    0x0011: "LU",  # (เดินหน้า)
-    0x0081: "LD",  # (ถอยหลัง)
-    0x0021: "LL",  # (เลี้ยวซ้าย)
-    0x0041: "LR"   # (เลี้ยวขวา)
-}
-
-# --- โปรแกรม PIO สำหรับรับค่า UART ---
-@rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT, autopush=True, push_thresh=8)
-def uart_rx():
-    wait(0, pin, 0)      # รอสัญญาณ Start Bit
-    set(x, 7) [10]       # ตั้งตัวนับ 8 บิต
-    label("b")           # จุดเริ่มลูป
-    in_(pins, 1)         # อ่าน 1 บิต
-    nop() [5]            # หน่วงเวลาให้ตรงจังหวะ
-    jmp(x_dec, "b")      # วนลูปจนครบ
+# รหัสปุ่ม -> คำสั่ง (ค้นหาครั้งเดียว ไม่ต้องเทียบชื่อปุ่มทีละตัว)
+keys = Bindings()
+keys.bind(LU, forward, SPEED)     # (เดินหน้า)
+keys.bind(LD, backward, SPEED)    # (ถอยหลัง)
+keys.bind(LL, turn_left, SPEED)   # (เลี้ยวซ้าย)
+keys.bind(LR, turn_right, SPEED)  # (เลี้ยวขวา)
 
-# เริ่มการทำงานของ PIO State Machine
-sm = rp2.StateMachine(0, uart_rx, freq=8*BAUD_RATE, in_base=Pin(UART_PIN, Pin.IN, Pin.PULL_UP))
-sm.active(1)
-print("Ready! Full Control")
+# ตัวรับจอย: State Machine รับ UART ที่ขา D3 + ตัวถอดรหัสเฟรม 2 ไบต์ที่ตรวจและกลับเข้าจังหวะเอง
+remote = X14(UART_PIN, BAUD_RATE)
+ready("Full Control")
 
 # ตัวแปรช่วยประมวลผล
-b1, wait = 0, 1          # ตัวแปรเก็บไบต์แรก และสถานะการรอ
 press = 0                # สถานะว่ามีการกดปุ่มอยู่หรือไม่
 last = time.ticks_ms()   # เวลาล่าสุดที่ได้รับข้อมูล
 
@@ -89,23 +42,8 @@ while True:
         press = 0
 
     # ตรวจสอบว่ามีข้อมูลเข้ามาหรือไม่
-    if sm.rx_fifo():
-        data = sm.get() & 0xFF  # อ่านข้อมูล 1 ไบต์
-        last = now              # อัปเดตเวลาล่าสุด (รีเซ็ต Safety Timer)
-        
-        if wait: 
-            b1 = data; wait = 0 # ถ้าเป็นไบต์แรก เก็บไว้ก่อน
-        else:
-            # รวมไบต์ 1 และ 2 เป็นรหัสเต็ม (16-bit)
-            code = (b1 << 8) | data
-            name = BUTTONS.get(code, "Unknown") # แปลรหัสเป็นชื่อปุ่ม
-            wait = 1 # เตรียมรอรับชุดต่อไป
-            
-            if name != "Unknown":
-                press = 1 # ระบุว่ามีการกดปุ่ม
-                
-                # ตรวจสอบชื่อปุ่มแล้วสั่งงานฟังก์ชันที่เกี่ยวข้อง
-                if   name == "LU": forward(SPEED)     # เดินหน้า
-                elif name == "LD": backward(SPEED)    # ถอยหลัง
-                elif name == "LL": turn_left(SPEED)   # หมุนตัวซ้าย
-                elif name == "LR": turn_right(SPEED)  # หมุนตัวขวา
+    code = remote.read() # รหัสปุ่ม 16 บิตที่ครบเฟรมและผ่านการตรวจแล้ว (-1 = ยังไม่มี)
+    if code >= 0:
+        last = now         # อัปเดตเวลาล่าสุด (รีเซ็ต Safety Timer)
+        if keys.dispatch(code): # สั่งงานฟังก์ชันที่ผูกไว้กับปุ่มนี้
+            press = 1 # ระบุว่ามีการกดปุ่ม
@@ -1,148 +1,78 @@
-from machine import Pin, PWM  # เรียกใช้ Pin (คุมไฟเข้า/ออก) และ PWM (คุมความเร็ว/องศา)
-import rp2                    # เรียกใช้ rp2 เพื่อควบคุม PIO (ตัวรับสัญญาณความเร็วสูง)
-import time                   # เรียกใช้ time เพื่อจับเวลา
+from mikrorover.drive import DriveTrain  # ชุดขับล้อกลาง (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.x14 import X14, Bindings, LU, LD, LL, LR, L1, L2, R1, R2  # ตัวรับจอย Wireless-X14 ที่กลับเข้าจังหวะเองเมื่อไบต์หาย (ต้องมี lib/mikrorover บนบอร์ด)
+from mikrorover.runtime import Rover, Gripper, every  # รันไทม์ asyncio: รับจอย / watchdog / มอเตอร์ / แขนจับ แยกเป็น task
+from mikrorover.missionlog import MissionLog, EV_NONE, EV_START, EV_STOP  # บันทึกประวัติภารกิจลงแฟลช
+from mikrorover.board import X14_RX, X14_BAUD, SERVO1, SERVO2, ready  # ขาและค่าคงที่ของบอร์ดที่ใช้ร่วมกัน
+import asyncio                # ตัวจัดคิวงานแบบร่วมมือ (cooperative) ของ MicroPython
 
 # --- [ส่วนตั้งค่าคงที่] ---
-UART_PIN   = 12    # กำหนดขา D3 (GPIO 12) เป็นขารับสัญญาณจากจอย
-BAUD_RATE  = 9600  # ความเร็วในการส่งข้อมูลของจอย Wireless-X14
-TIMEOUT_MS = 150   # ถ้าจอยเงียบเกิน 0.15 วินาที จะถือว่าปล่อยมือ (Safety)
-SPEED      = 50    # ความเร็วในการวิ่งของหุ่นยนต์ (ค่า 0-100)
+UART_PIN   = X14_RX    # กำหนดขา D3 (GPIO 12) เป็นขารับสัญญาณจากจอย
+BAUD_RATE  = X14_BAUD  # ความเร็วในการส่งข้อมูลของจอย Wireless-X14
+TIMEOUT_MS = 150       # ถ้าจอยเงียบเกิน 0.15 วินาที จะถือว่าปล่อยมือ (Safety)
+SPEED      = 50        # ความเร็วในการวิ่งของหุ่นยนต์ (ค่า 0-100)
+LOG_FILE   = "mission.log"   # ประวัติภารกิจ ดูบนคอมพิวเตอร์ด้วย python -m host.logdump mission.log
+LOG_MS     = 50        # บันทึกคำสั่งมอเตอร์และมุมแขนทุก 50 ms
+FLUSH_MS   = 30000     # เขียนบล็อกที่ยังไม่เต็มลงแฟลชทุก 30 วินาที (ปิดเครื่องกะทันหันเสียประวัติไม่เกินนี้)
+                       # บล็อก 4 KB เต็มทุก ~12.8 วินาที (256 ระเบียน x 50 ms) ค่านี้ต้องไม่สั้นกว่านั้น ไม่เช่นนั้นเขียนแฟลชซ้ำบ่อยขึ้น
 
 # --- มอเตอร์ขับเคลื่อน (DC Motors) ---
-# กำหนดขาและสร้าง PWM สำหรับมอเตอร์ ความถี่ 1000Hz (เหมาะกับมอเตอร์ DC)
-m1a = PWM(Pin(14)); m1a.freq(1000)  # ล้อซ้าย ขั้ว A
-m1b = PWM(Pin(13)); m1b.freq(1000)  # ล้อซ้าย ขั้ว B
-m2a = PWM(Pin(17)); m2a.freq(1000)  # ล้อขวา ขั้ว A
-m2b = PWM(Pin(16)); m2b.freq(1000)  # ล้อขวา ขั้ว B
+# ล้อซ้ายขา 14 (เดินหน้า) / 13 (ถอยหลัง), ล้อขวาขา 17 / 16 ความถี่ 1000Hz
+# ปุ่มกดแค่ตั้ง "คำสั่ง" ความเร็ว task ของ Rover เป็นผู้เขียน PWM และสั่งหยุดเมื่อจอยเงียบเกิน TIMEOUT_MS
+# --- บันทึกภารกิจ (Mission Log) ---
+# ไฟล์ขนาดคงที่ใช้วนเขียนทับ ระเบียนเก็บใน RAM แล้วเขียนลงแฟลชทีละบล็อก (4 KB) เมื่อเต็ม
+log = MissionLog(LOG_FILE)
 
-# --- เซอร์โวมอเตอร์ (Servo Motors) ---
-# กำหนดขา PWM ความถี่ 50Hz (มาตรฐานของ Servo Motor)
-sv1 = PWM(Pin(18)); sv1.freq(50) # Servo 1
-sv2 = PWM(Pin(19)); sv2.freq(50) # Servo 2
-
-# --- ฟังก์ชันย่อย ---
-# ฟังก์ชันแปลงความเร็ว (0-100) เป็นค่า Duty Cycle (0-65535) 
-def set_speed(pin, value):
-    # สูตร: (ค่า/100) * 65535 แปลงเป็นเลขจำนวนเต็ม
-    duty = int(max(0, min(100, value)) * 655.35)
-    pin.duty_u16(duty) # สั่งจ่ายไฟตามความแรงที่คำนวณได้
-
-# ฟังก์ชันสั่งหยุดรถ (ตัดไฟมอเตอร์ทุกตัว)
-def stop():
-    m1a.duty_u16(0); m1b.duty_u16(0)
-    m2a.duty_u16(0); m2b.duty_u16(0)
-
-# ฟังก์ชันเดินหน้า (Forward)
-def fd(s): 
-    # ล้อซ้ายหมุนไปข้างหน้า 
-    set_speed(m1a, s); m1b.duty_u16(0) 
-    # ล้อขวาหมุนไปข้างหน้า
-    set_speed(m2a, s); m2b.duty_u16(0)
-
-# ฟังก์ชันถอยหลัง (Backward)
-def bk(s): 
-    # สลับขั้วการจ่ายไฟ เพื่อให้ล้อหมุนกลับหลัง
-    m1a.duty_u16(0); set_speed(m1b, s)
-    m2a.duty_u16(0); set_speed(m2b, s)
-
-# ฟังก์ชันหมุนซ้าย (Spin Left)
-def sl(s): 
-    # ล้อซ้ายถอยหลัง + ล้อขวาเดินหน้า = หมุนตัวทางซ้าย
-    m1a.duty_u16(0); set_speed(m1b, s) 
-    set_speed(m2a, s); m2b.duty_u16(0) 
-
-# ฟังก์ชันหมุนขวา (Spin Right)
-def sr(s): 
-    # ล้อซ้ายเดินหน้า + ล้อขวาถอยหลัง = หมุนตัวทางขวา
-    set_speed(m1a, s); m1b.duty_u16(0) 
-    m2a.duty_u16(0); set_speed(m2b, s) 
-   
-# ฟังก์ชันควบคุมองศาเซอร์โว (0-180 องศา)
-def set_servo(servo, angle):
-    # สูตรแปลง 0-180 องศา เป็นหน่วย Nanoseconds (ns) สำหรับ Pulse Width
-    # 500,000ns (0.5ms) = 0 องศา, 2,500,000ns (2.5ms) = 180 องศา
-    duty = 500_000 + int(angle * 2_000_000 // 180)
-    servo.duty_ns(duty)
+# รถหยุดแล้ว: บันทึกเหตุการณ์ลง RAM เท่านั้น (หยุดทุกครั้งที่ปล่อยจอย จึงไม่เขียนแฟลชที่นี่)
+def stopped():
+    print("-> หยุด (ปล่อยมือ)")
+    log.write(EV_STOP)
 
-# ตารางจับคู่รหัสปุ่ม (Hex Code) กับชื่อปุ่ม (ค่าของแต่ละปุ่มอาจแตกต่างกัน)
-BUTTONS = {
-    # ทิศทาง
-    0x0011: "LU", 0x0081: "LD", 0x0021: "LL", 0x0041: "LR",
-    # เซอร์โว
-    0x0009: "L1", 0x0005: "L2", 
-    0x0801: "R1", 0x0401: "R2"
-}
+rover = Rover(DriveTrain(), TIMEOUT_MS, on_stop=stopped)
 
-# --- ส่วนของ PIO (Programmable I/O) ---
-# เขียนภาษา Assembly จำลองการทำงานเป็นตัวรับ UART (Serial)
-@rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT, autopush=True, push_thresh=8)
-def uart_rx():
-    wait(0, pin, 0)      # 1. รอจนกว่าจะมีสัญญาณเริ่ม (Start Bit)
-    set(x, 7) [10]       # 2. ตั้งตัวนับ 8 บิต และรอให้ถึงกลางบิตแรก
-    label("b")           # จุดวนลูป
-    in_(pins, 1)         # 3. อ่านค่า 1 บิต
-    nop() [5]            # 4. รอเวลาให้ตรงจังหวะความเร็ว (Baudrate)
-    jmp(x_dec, "b")      # 5. วนกลับไปทำจนครบ 8 บิต
-
-# สร้าง State Machine (SM) เพื่อรันโค้ด PIO ด้านบน
-sm = rp2.StateMachine(0, uart_rx, freq=8*BAUD_RATE, in_base=Pin(UART_PIN, Pin.IN, Pin.PULL_UP))
-sm.active(1) # สั่งให้เริ่มทำงาน
-
-# ตัวแปรช่วยประมวลผลข้อมูล
-b1 = 0                  # เก็บข้อมูลไบต์แรก
-wait = 1                # สถานะ (1=รอไบต์แรก, 0=ได้ไบต์แรกแล้วรอไบต์สอง)
-press = 0               # สถานะการกด (0=ปล่อย, 1=กด)
-last = time.ticks_ms()  # เวลาล่าสุดที่ได้รับข้อมูล
-
-# ตั้งค่ามุมเริ่มต้นของ Servo
-angle1 = 90
-angle2 = 90
-set_servo(sv1, angle1)
-set_servo(sv2, angle2)
-
-# --- ลูปหลัก (ทำงานตลอดเวลา) ---
-while True:
-    now = time.ticks_ms() # ดูเวลาปัจจุบัน
-    
-    # [ระบบ Safety] ถ้ามีการกดค้างไว้ แต่ไม่มีข้อมูลใหม่เกิน 0.15 วิ แสดงว่าสัญญาณหลุด/ปล่อยมือ
-    if press and time.ticks_diff(now, last) > TIMEOUT_MS:
-        stop()            # สั่งหยุดรถทันที
-        print("-> หยุด (ปล่อยมือ)")
-        press = 0         # รีเซ็ตสถานะ
-
-    # ตรวจสอบว่ามีข้อมูลส่งมาจาก PIO หรือไม่
-    if sm.rx_fifo():
-        data = sm.get() & 0xFF # อ่านข้อมูลออกมา 1 ไบต์
-        last = now             # อัปเดตเวลาล่าสุด (เพื่อไม่ให้ Safety ทำงาน)
-        
-        if wait: 
-            b1 = data; wait = 0 # ถ้าเป็นไบต์แรก ให้เก็บไว้ก่อน
-        else:
-            # ถ้าเป็นไบต์ที่สอง ให้นำมารวมกับไบต์แรก (Shift & OR)
-            code = (b1 << 8) | data 
-            name = BUTTONS.get(code) # แปลงรหัสเป็นชื่อปุ่ม
-            wait = 1 # เตรียมรอรับชุดถัดไป
-            
-            if name: # ถ้าเป็นปุ่มที่เรารู้จัก
-                press = 1    
-                # --- ส่วนควบคุมการขับเคลื่อน ---
-                if   name == "LU": fd(SPEED)  # เดินหน้า
-                elif name == "LD": bk(SPEED)  # ถอยหลัง
-                elif name == "LL": sl(SPEED)  # หมุนซ้าย
-                elif name == "LR": sr(SPEED)  # หมุนขวา
-                
-                # --- ส่วนควบคุมแขนจับ (Servo 1) ---
-                elif name == "L1":
-                    angle1 = min(180, angle1 + 1) # เพิ่มมุม (max 180)
-                    set_servo(sv1, angle1)        # สั่งขยับ
-                elif name == "L2":
-                    angle1 = max(0, angle1 - 1)   # ลดมุม (min 0)
-                    set_servo(sv1, angle1)
-                
-                # --- ส่วนควบคุมแขนจับ (Servo 2) ---
-                elif name == "R1":
-                    angle2 = min(180, angle2 + 1)
-                    set_servo(sv2, angle2)
-                elif name == "R2":
-                    angle2 = max(0, angle2 - 1)
-                    set_servo(sv2, angle2)
+# --- เซอร์โวมอเตอร์ (Servo Motors) ---
+# Servo 1 ขา 18, Servo 2 ขา 19 ความถี่ 50Hz (มาตรฐานของ Servo Motor) เริ่มที่ 90 องศา
+arm = Gripper((SERVO1, SERVO2), (90, 90))
+
+# ปรับมุมแขนจับทีละ step องศา (จำกัดไว้ที่ 0-180)
+def servo1_step(step):
+    arm.nudge(0, step)
+
+def servo2_step(step):
+    arm.nudge(1, step)
+
+# ตารางจับคู่รหัสปุ่มกับคำสั่ง (รหัสของแต่ละจอยอาจแตกต่างกัน ดู mikrorover/x14.py)
+keys = Bindings()
+# --- ส่วนควบคุมการขับเคลื่อน ---
+keys.bind(LU, rover.fd, SPEED)  # เดินหน้า
+keys.bind(LD, rover.bk, SPEED)  # ถอยหลัง
+keys.bind(LL, rover.sl, SPEED)  # หมุนซ้าย
+keys.bind(LR, rover.sr, SPEED)  # หมุนขวา
+# --- ส่วนควบคุมแขนจับ (Servo 1 / Servo 2) ---
+keys.bind(L1, servo1_step, 1)   # เพิ่มมุม (max 180)
+keys.bind(L2, servo1_step, -1)  # ลดมุม (min 0)
+keys.bind(R1, servo2_step, 1)
+keys.bind(R2, servo2_step, -1)
+
+# ตัวรับจอย: State Machine รับ UART ที่ขา D3 + ตัวถอดรหัสเฟรม 2 ไบต์ที่ตรวจและกลับเข้าจังหวะเอง
+# on_code: PIO แจ้ง IRQ ทุกเฟรม แล้วปลุก remote_task ทันที (ไม่ต้องวนถาม FIFO)
+remote = X14(UART_PIN, BAUD_RATE, on_code=rover.on_code)
+ready("Final Mission")
+
+# บันทึกคำสั่งความเร็วล้อและมุมแขนจับ แล้วเขียนบล็อกที่เต็มลงแฟลช (ถ้ามี)
+def log_state():
+    log.write(EV_NONE, -1, rover.left, rover.right, arm.angle[0], arm.angle[1])
+    log.service()
+
+# --- งานหลัก (แต่ละ task รอด้วย await จึงไม่บล็อกกัน) ---
+async def main():
+    log.write(EV_START)
+    asyncio.create_task(every(LOG_MS, log_state))  # บันทึกภารกิจ
+    asyncio.create_task(every(FLUSH_MS, log.flush))  # เขียนส่วนที่ค้างลงแฟลชเป็นระยะ
+    asyncio.create_task(rover.watchdog_task())  # [ระบบ Safety] หยุดรถเมื่อไม่มีข้อมูลใหม่เกิน 0.15 วิ
+    asyncio.create_task(rover.drive_task())     # เขียนคำสั่งความเร็วลงมอเตอร์
+    await rover.remote_task(remote, keys)       # อ่านรหัสปุ่มแล้วสั่งงานผ่าน Bindings
+
+try:
+    asyncio.run(main())
+finally:
+    log.close()  # จบภารกิจ (เช่น Ctrl-C): เขียนส่วนที่ค้างแล้วปิดไฟล์
@@ -0,0 +1 @@
+# เครื่องมือฝั่งคอมพิวเตอร์ (Host-side tools) สำหรับทดสอบโค้ด mikroRover โดยไม่ต้องใช้บอร์ดจริง
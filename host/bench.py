@@ -0,0 +1,299 @@
+# ชุดวัดประสิทธิภาพ (benchmark) ของทุก Listing บนตัวจำลองบอร์ด
+# รันแต่ละ Listing ตามเวลาเสมือนที่กำหนดพร้อมสัญญาณกระตุ้น (ปุ่ม, เซนเซอร์, จอย) ที่เตรียมไว้ แล้ววัด:
+#   - loop      รอบต่อวินาทีของลูปหลัก (บรรทัด while ที่ถูกรันบ่อยที่สุด นับด้วย sys.settrace)
+#   - alloc     หน่วยความจำที่จองชั่วคราวต่อรอบ (ยอดสูงสุดของ tracemalloc ระหว่างรอบ ลบค่าตอนต้นรอบ)
+#   - x14       เวลาตั้งแต่ได้รับไบต์สุดท้ายของเฟรมจอย จนถึงการเขียน PWM ครั้งแรก (decode -> motor)
+#   - oled      จำนวนไบต์บนบัส I2C, จำนวนเฟรม (กลุ่มการส่งที่ห่างกันไม่เกิน 2 ms) และเวลาบัสโดยประมาณต่อเฟรม
+# ผลลัพธ์เป็น JSON เพื่อเทียบระหว่าง commit
+#
+#   python -m host.bench                         # ทุก Listing, 5 วินาทีเสมือน, พิมพ์ตารางสรุป
+#   python -m host.bench 5-3 8-6 --out bench.json
+#   python -m host.bench --ms 20000 --no-alloc
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections import Counter
+
+from .emu.board import Board
+from .emu.runner import LIB_DIR, ROOT, find_listing, run_listing
+
+LISTINGS = (
+    "3-1", "3-2", "4-1", "4-2", "5-1", "5-2", "5-3", "6-1",
+    "7-1", "7-2", "7-3", "7-4", "8-1", "8-2", "8-3", "8-4", "8-5", "8-6",
+)
+
+I2C_HZ = 400000
+FRAME_GAP_US = 2000      # การส่งข้อมูลจอที่ห่างกันน้อยกว่านี้ถือเป็นเฟรมเดียวกัน
+X14_PRESSES_MS = (500, 1500, 2500, 3500, 4500)
+LATENCY_WINDOW_US = 200000
+HOT_RATIO = 10           # ลูปในไลบรารีต้องวนบ่อยกว่าลูปของ Listing กี่เท่าจึงถือเป็นลูปหลักแทน
+
+
+# --- สัญญาณกระตุ้นของแต่ละ Listing ---
+def _line_pattern(board, period_ms=100, duration_ms=60000):
+    # เซนเซอร์เส้นสลับ ขาว -> ซ้ายเจอเส้น -> ขาว -> ขวาเจอเส้น ทุก period_ms
+    seq = ((1, 1), (0, 1), (1, 1), (1, 0))
+    board.set_input(10, 1, 0)
+    board.set_input(11, 1, 0)
+    t, k = period_ms, 0
+    while t < duration_ms:
+        left, right = seq[k % len(seq)]
+        board.set_input(10, left, t)
+        board.set_input(11, right, t)
+        t += period_ms
+        k += 1
+
+
+def _x14_presses(code):
+    def setup(board):
+        for at in X14_PRESSES_MS:
+            board.x14(code, at, 100)
+    return setup
+
+
+def _stimulus(key, board):
+    if key[0] in "4567":
+        board.press(8, 100, 50)               # SW1 เริ่มงาน
+    if key in ("5-1", "5-2", "5-3"):
+        board.set_adc(27, 40000)              # สิ่งกีดขวางไกล ~62 ซม.
+    elif key in ("6-1", "7-4"):
+        _line_pattern(board)
+    elif key in ("7-1", "7-2"):
+        board.press(9, 1000, 1000)            # SW2 ค้าง: เพิ่มองศา
+    elif key == "7-3":
+        board.press(9, 2000, 50)              # SW2: วาง
+    elif key in ("8-4", "8-5"):
+        _x14_presses(0x0009)(board)           # L1
+    elif key.startswith("8-"):
+        _x14_presses(0x0011)(board)           # LU
+
+
+# --- ตัวเก็บข้อมูลระหว่างรัน ---
+class _LineCounter:
+    # นับจำนวนครั้งที่แต่ละบรรทัด (ไฟล์, บรรทัด) ของ Listing และ lib/mikrorover ถูกรัน
+    def __init__(self, path):
+        self.path = path
+        self.counts = Counter()
+
+    def __call__(self, frame, event, arg):
+        f = frame.f_code.co_filename
+        if f != self.path and not f.startswith(LIB_DIR):
+            return None
+        return self._local
+
+    def _local(self, frame, event, arg):
+        if event == "line":
+            self.counts[frame.f_code.co_filename, frame.f_lineno] += 1
+        return self._local
+
+
+def _source_line(file, line, _cache={}):
+    if file not in _cache:
+        with open(file, encoding="utf-8") as f:
+            _cache[file] = f.read().splitlines()
+    return _cache[file][line - 1].strip()
+
+
+# ลูปหลัก = บรรทัด while ที่ถูกรันบ่อยที่สุดในไฟล์ Listing
+# ถ้า Listing ไม่มีลูปของตัวเอง (เช่นงาน asyncio) ใช้ "while True:" ที่ถูกรันบ่อยที่สุดใน lib/mikrorover แทน
+def _hot_loop(path, counts):
+    own = None
+    best = None
+    for (file, line), hits in counts.most_common():
+        if hits < 2:
+            break
+        src = _source_line(file, line)
+        if own is None and file == path and src.startswith("while"):
+            own = (file, line, hits)
+        if best is None and file != path and src == "while True:":
+            best = (file, line, hits)
+    # ลูปของ Listing เอง เว้นแต่ Listing แค่รอ (เช่นรอปุ่ม) แล้วยกลูปหลักให้ไลบรารี เช่นลูปควบคุมบนคอร์ 1
+    if own is not None and (best is None or own[2] * HOT_RATIO >= best[2]):
+        return own
+    return best
+
+
+class _AllocProbe:
+    # ที่บรรทัด line (ต้นรอบ) บันทึกยอดหน่วยความจำสูงสุดของรอบที่แล้ว เทียบกับค่าตอนต้นรอบ
+    def __init__(self, path, line):
+        self.path = path
+        self.line = line
+        self.samples = []
+        self._base = None
+
+    def __call__(self, frame, event, arg):
+        if frame.f_code.co_filename != self.path:
+            return None
+        return self._local
+
+    def _local(self, frame, event, arg):
+        if event == "line" and frame.f_lineno == self.line:
+            cur, peak = tracemalloc.get_traced_memory()
+            if self._base is not None:
+                self.samples.append(peak - self._base)
+            tracemalloc.reset_peak()
+            self._base = cur
+        return self._local
+
+
+def _make_board(key, ms):
+    board = Board(ms)
+    _stimulus(key, board)
+    return board
+
+
+def _run(path, board, tracer=None):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)                          # ไฟล์ที่ Listing เขียน (เช่น prof.bin) ไม่ปนกับโฟลเดอร์งาน
+        old = sys.gettrace()
+        try:
+            if tracer is not None:
+                sys.settrace(tracer)
+                threading.settrace(tracer)         # งานบนคอร์ 1 (_thread) รันในเธรดแยก
+            run_listing(path, board, None, quiet=True)
+        finally:
+            sys.settrace(old)
+            threading.settrace(None)
+            os.chdir(cwd)
+    return board
+
+
+def _oled_frames(times):
+    frames = 0
+    last = None
+    for t in times:
+        if last is None or t - last > FRAME_GAP_US:
+            frames += 1
+        last = t
+    return frames
+
+
+def _x14_latency(board):
+    line = board.serial.get(12)
+    if line is None:
+        return None
+    pwm = [e[0] for e in board.trace if e[1] == "pwm"]
+    out = []
+    for at in X14_PRESSES_MS:
+        t0 = at * 1000
+        i = next((k for k, s in enumerate(line.starts) if s >= t0), None)
+        if i is None or i + 1 >= len(line.starts):
+            continue
+        end = line.starts[i + 1] + 10 * line.bit_us     # จบ stop bit ของไบต์ที่สองในเฟรมแรก
+        hit = next((t for t in pwm if t >= end), None)
+        if hit is not None and hit - end <= LATENCY_WINDOW_US:
+            out.append(round(hit - end, 1))
+    return out
+
+
+def bench(key, ms=5000, alloc=True):
+    path = find_listing(key)
+
+    # รอบที่ 1: นับบรรทัด + เก็บเวลาการส่งข้อมูลจอ
+    board = _make_board(key, ms)
+    panel = board.panel
+    times = []
+    write = panel.write
+
+    def logged(buf):
+        times.append(board.clock.us)
+        write(buf)
+    panel.write = logged
+    counter = _LineCounter(path)
+    _run(path, board, counter)
+
+    virtual_s = board.clock.us / 1e6
+    result = {
+        "listing": key,
+        "outcome": board.outcome,
+        "virtual_ms": round(board.clock.us / 1000, 1),
+        "wall_s": round(board.wall_s, 3),
+        "pwm_writes": sum(st.writes for st in board.pwm.values()),
+    }
+    loop = _hot_loop(path, counter.counts)
+    if loop is not None:
+        file, line, hits = loop
+        src = _source_line(file, line)
+        result["loop"] = {"file": os.path.relpath(file, ROOT), "line": line, "source": src, "iterations": hits,
+                          "hz": round(hits / virtual_s, 1) if virtual_s else 0}
+        counter_path = file
+    else:
+        line = None
+
+    st = panel.stats
+    frames = _oled_frames(times)
+    result["oled"] = {
+        "bytes": st["bytes"],
+        "transactions": st["transactions"],
+        "frames": frames,
+        "bytes_per_frame": round(st["bytes"] / frames, 1) if frames else 0,
+        "bus_ms_per_frame": round(st["bytes"] * 9 * 1000 / I2C_HZ / frames, 3) if frames else 0,
+    }
+
+    lat = _x14_latency(board)
+    if lat is not None:
+        result["x14"] = {"latency_us": lat}
+        if lat:
+            result["x14"]["mean_us"] = round(sum(lat) / len(lat), 1)
+            result["x14"]["max_us"] = max(lat)
+
+    # รอบที่ 2: หน่วยความจำชั่วคราวต่อรอบของลูปหลัก (รวมส่วนที่ตัวจำลองจองเองด้วย ใช้เทียบระหว่าง commit)
+    if alloc and line is not None:
+        probe = _AllocProbe(counter_path, line)
+        tracemalloc.start()
+        try:
+            _run(path, _make_board(key, ms), probe)
+        finally:
+            tracemalloc.stop()
+        s = sorted(probe.samples)
+        if s:
+            result["alloc"] = {
+                "iterations": len(s),
+                "mean_bytes": round(sum(s) / len(s), 1),
+                "p50_bytes": s[len(s) // 2],
+                "max_bytes": s[-1],
+            }
+    return result
+
+
+def _row(r):
+    loop = r.get("loop", {})
+    alloc = r.get("alloc", {})
+    x14 = r.get("x14") or {}
+    oled = r["oled"]
+    return "%-5s %-9s %9s %9s %9s %9s %11s" % (
+        r["listing"], r["outcome"],
+        loop.get("hz", "-"),
+        alloc.get("mean_bytes", "-"),
+        oled["bytes_per_frame"] if oled["frames"] else "-",
+        oled["bus_ms_per_frame"] if oled["frames"] else "-",
+        x14.get("mean_us", "-"),
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.bench", description="Benchmark listings on the emulated board")
+    ap.add_argument("listings", nargs="*", default=list(LISTINGS), help="listing numbers (default: all)")
+    ap.add_argument("--ms", type=float, default=5000, help="virtual run time per listing (default 5000)")
+    ap.add_argument("--out", metavar="FILE", help="write results as JSON")
+    ap.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    args = ap.parse_args(argv)
+
+    results = []
+    print("%-5s %-9s %9s %9s %9s %9s %11s" % ("lst", "outcome", "loop Hz", "alloc B", "B/frame", "bus ms", "x14 lat us"))
+    for key in args.listings:
+        r = bench(key, args.ms, not args.no_alloc)
+        results.append(r)
+        print(_row(r))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"ms": args.ms, "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# ตัวจำลองบอร์ด mikroRover (KidMotor V4i / RP2040) สำหรับรันโค้ด Listing บนคอมพิวเตอร์
+# ใช้งาน:  python -m host.emu 7-4 --ms 20000 --press 8@100
+from .board import Board, reverse8
+from .clock import SimulationEnd, VirtualClock
+from .runner import emulated, find_listing, run_listing, workdir
+
+__all__ = ["Board", "SimulationEnd", "VirtualClock", "emulated", "find_listing", "reverse8", "run_listing", "workdir"]
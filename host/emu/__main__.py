@@ -0,0 +1,90 @@
+# รัน Listing บนตัวจำลองจากบรรทัดคำสั่ง
+# ตัวอย่าง:
+#   python -m host.emu 4-2 --ms 15000 --press 8@100
+#   python -m host.emu 5-2 --press 8@100 --adc 27=3000@2000 --screen
+#   python -m host.emu 8-6 --ms 600000 --x14 LU@1000:3000 --x14 L1@5000:500
+#   python -m host.emu 5-3 --press 9@3000 --workdir out   # เก็บไฟล์ที่ Listing เขียน (prof.bin) ไว้ที่ out/
+import argparse
+import cProfile
+import pstats
+
+from .board import Board
+from .runner import find_listing, run_listing, workdir
+
+X14_NAMES = {
+    "LU": 0x0011, "LL": 0x0021, "LD": 0x0081, "LR": 0x0041,
+    "RU": 0x1001, "RL": 0x4001, "RD": 0x8001, "RR": 0x2001,
+    "L1": 0x0009, "L2": 0x0005, "LT": 0x0003,
+    "R1": 0x0801, "R2": 0x0401, "RT": 0x0201,
+}
+
+
+# แยกรูปแบบ "ค่า@เวลา:ระยะเวลา" เช่น "8@100:200" -> ("8", 100, 200)
+def _when(spec, default_hold):
+    value, _, at = spec.partition("@")
+    at, _, hold = at.partition(":")
+    return value, float(at or 0), float(hold) if hold else default_hold
+
+
+def build_board(args):
+    board = Board(args.ms, max_idle_us=args.idle_us)
+    for spec in args.press:
+        pin, at, hold = _when(spec, 100)
+        board.press(int(pin), at, hold)
+    for spec in args.pin:
+        pin_level, at, _ = _when(spec, 0)
+        pin, _, level = pin_level.partition("=")
+        board.set_input(int(pin), int(level), at)
+    for spec in args.adc:
+        gpio_value, at, _ = _when(spec, 0)
+        gpio, _, value = gpio_value.partition("=")
+        if at:
+            board.at_ms(at, lambda g=int(gpio), v=int(value): board.set_adc(g, v))
+        else:
+            board.set_adc(int(gpio), int(value))
+    for spec in args.x14:
+        name, at, hold = _when(spec, 0)
+        code = X14_NAMES[name] if name in X14_NAMES else int(name, 0)
+        board.x14(code, at, hold)
+    return board
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.emu", description="Run a listing on the emulated board")
+    ap.add_argument("listing", help="listing number (e.g. 7-4) or path")
+    ap.add_argument("--ms", type=float, default=10000, help="virtual run time in ms (default 10000)")
+    ap.add_argument("--press", action="append", default=[], metavar="PIN@MS[:HOLD]")
+    ap.add_argument("--pin", action="append", default=[], metavar="PIN=LEVEL@MS")
+    ap.add_argument("--adc", action="append", default=[], metavar="GPIO=VALUE[@MS]")
+    ap.add_argument("--x14", action="append", default=[], metavar="BUTTON@MS[:HOLD]")
+    ap.add_argument("--idle-us", type=int, default=2000, help="max time skipped per idle poll (0 = off)")
+    ap.add_argument("--quiet", action="store_true", help="hide the listing's print output")
+    ap.add_argument("--screen", action="store_true", help="print the final OLED image")
+    ap.add_argument("--profile", action="store_true", help="profile the run with cProfile")
+    ap.add_argument("--workdir", help="directory for files the listing writes (default: a temporary directory)")
+    args = ap.parse_args(argv)
+
+    path = find_listing(args.listing)
+    board = build_board(args)
+    with workdir(args.workdir):
+        if args.profile:
+            prof = cProfile.Profile()
+            prof.runcall(run_listing, path, board, None, args.quiet)
+            pstats.Stats(prof).sort_stats("cumulative").print_stats(20)
+        else:
+            run_listing(path, board, None, args.quiet)
+
+    s = board.summary()
+    print("--- %s ---" % path)
+    print("outcome      : %s" % board.outcome)
+    print("virtual time : %.1f ms" % s["virtual_ms"])
+    print("wall time    : %.3f s (x%.0f real time)" % (board.wall_s, s["virtual_ms"] / 1000 / max(board.wall_s, 1e-9)))
+    print("pwm writes   : %d (%d changed)" % (s["pwm_writes"], s["pwm_changes"]))
+    print("i2c bytes    : %d" % s["i2c_bytes"])
+    print("pwm duty_u16 : %s" % board.pwm_duties())
+    if args.screen and board.panel is not None:
+        print(board.panel.render())
+
+
+if __name__ == "__main__":
+    main()
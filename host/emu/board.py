@@ -0,0 +1,287 @@
+# แบบจำลองบอร์ด KidMotor V4i (RP2040) ฝั่งคอมพิวเตอร์
+# เก็บสถานะของขา GPIO, PWM, ADC, อุปกรณ์ I2C และสายสัญญาณ UART จากรีโมต Wireless-X14
+# โมดูลปลอม machine / rp2 / time จะอ้างอิงบอร์ดที่กำลังทำงานอยู่ผ่าน current()
+import bisect
+from collections import Counter
+
+from .clock import VirtualClock
+from .panel import SSD1306Panel
+
+# ต้นทุนเวลาโดยประมาณของการเรียกใช้ฮาร์ดแวร์แต่ละแบบบน RP2040 (ไมโครวินาที)
+COSTS = {
+    "ticks": 1,
+    "pin_read": 3,
+    "pin_write": 3,
+    "pwm_write": 4,
+    "pwm_config": 10,
+    "adc_read": 8,
+    "fifo": 2,
+    "i2c_start": 25,
+    "task": 40,          # สลับ task ของ asyncio 1 ครั้ง
+    "lock": 2,           # _thread lock
+    "gc": 2000,          # gc.collect() ฮีป 192 KB ที่มีออบเจกต์ค้างไม่มาก
+}
+
+IDLE_STREAK = 32      # จำนวนครั้งที่อ่านค่าซ้ำเดิมติดกันก่อนจะถือว่าโค้ดกำลังวนรอ (busy polling)
+
+PULL_UP = 1
+PULL_DOWN = 2
+MODE_OUT = 1
+IRQ_FALLING = 4
+IRQ_RISING = 8
+
+_current = None
+
+
+def current():
+    if _current is None:
+        raise RuntimeError("no emulated board is active")
+    return _current
+
+
+def reverse8(b):
+    # กลับลำดับบิตของข้อมูล 8 บิต (บิต 0 <-> บิต 7)
+    r = 0
+    for _ in range(8):
+        r = (r << 1) | (b & 1)
+        b >>= 1
+    return r
+
+
+class PinState:
+    def __init__(self, board, pin_id):
+        self.board = board
+        self.id = pin_id
+        self.mode = None
+        self.pull = None
+        self.out = 0
+        self.driven = None     # ระดับสัญญาณที่อุปกรณ์ภายนอกป้อนเข้ามา (None = ไม่มี)
+        self.source = None     # ฟังก์ชัน fn(t_us) ที่คืนระดับสัญญาณตามเวลา
+        self.handler = None    # (handler, trigger, pin_obj) ของ Pin.irq()
+        self.last_read = None
+
+    def level(self):
+        if self.mode == MODE_OUT:
+            return self.out
+        if self.source is not None:
+            return self.source(self.board.clock.us)
+        if self.driven is not None:
+            return self.driven
+        return 1 if self.pull == PULL_UP else 0
+
+    # ป้อนระดับสัญญาณจากภายนอก และเรียก IRQ ถ้ามีขอบสัญญาณตรงกับที่ตั้งไว้
+    def drive(self, value):
+        self.board.catch_up_sms()
+        old = self.level()
+        self.driven = 1 if value else 0
+        self._edge(old, self.level())
+
+    def write(self, value):
+        old = self.level()
+        self.out = 1 if value else 0
+        if self.mode == MODE_OUT and old != self.out:
+            self.board.record("pin", self.id, self.out)
+        self._edge(old, self.level())
+
+    def _edge(self, old, new):
+        if old == new or self.handler is None:
+            return
+        handler, trigger, pin_obj = self.handler
+        if (new and trigger & IRQ_RISING) or (not new and trigger & IRQ_FALLING):
+            self.board.counters["pin_irq"] += 1
+            handler(pin_obj)
+
+
+class PWMState:
+    def __init__(self, pin_id):
+        self.id = pin_id
+        self.freq = 0
+        self.duty_u16 = 0
+        self.writes = 0
+
+
+class SerialLine:
+    # สายสัญญาณ UART ขาเข้า (idle = 1, start bit = 0, ข้อมูล 8 บิตส่ง LSB ก่อน, stop bit = 1)
+    def __init__(self, board, pin_id, baud=9600):
+        self.board = board
+        self.pin_id = pin_id
+        self.bit_us = 1000000 / baud
+        self.starts = []
+        self.frames = []
+
+    def send(self, byte, t_us):
+        if self.starts:
+            t_us = max(t_us, self.starts[-1] + 10 * self.bit_us)
+        self.starts.append(t_us)
+        self.frames.append(byte & 0xFF)
+        for sm in self.board.sms.values():
+            sm._idle_until = min(sm._idle_until, t_us)
+        end = t_us + 10 * self.bit_us
+        # เมื่อส่งครบเฟรมให้ state machine ที่ต่ออยู่ประมวลผลตามทัน (เหมือนฮาร์ดแวร์ทำงานคู่ขนาน)
+        self.board.clock.at_us(int(end) + 1, self.board.catch_up_sms)
+        return end
+
+    def level(self, t):
+        i = bisect.bisect_right(self.starts, t) - 1
+        if i < 0:
+            return 1
+        k = int((t - self.starts[i]) / self.bit_us)
+        if k == 0:
+            return 0
+        if k <= 8:
+            return (self.frames[i] >> (k - 1)) & 1
+        return 1
+
+    # เวลาเริ่มเฟรมถัดไปเมื่อสายว่างอยู่ที่เวลา t (ใช้ข้ามช่วงที่ state machine รอ start bit)
+    # คืน None ถ้า t อยู่ระหว่างเฟรม และคืน inf ถ้าไม่มีเฟรมถัดไปแล้ว
+    def next_start(self, t):
+        i = bisect.bisect_right(self.starts, t) - 1
+        if i >= 0 and t < self.starts[i] + 10 * self.bit_us:
+            return None
+        if i + 1 < len(self.starts):
+            return self.starts[i + 1]
+        return float("inf")
+
+
+class Board:
+    def __init__(self, duration_ms=None, max_idle_us=2000):
+        deadline = None if duration_ms is None else int(duration_ms * 1000)
+        self.clock = VirtualClock(deadline)
+        self.max_idle_us = max_idle_us
+        self.costs = dict(COSTS)
+        self.pins = {}
+        self.pwm = {}
+        self.adc = {}
+        self.serial = {}
+        self.sms = {}
+        self.rx_feeds = {}    # หมายเลข state machine -> fn(sm) ที่เติม RX FIFO เองโดยไม่ผ่าน PIO (host/replay.py --fast)
+        self.i2c_devices = {0x3C: SSD1306Panel(lambda: self.clock.us)}
+        self.counters = Counter()
+        self.trace = []
+        self.cores = None     # ตัวจัดลำดับสองคอร์ (สร้างเมื่อ Listing เรียก _thread.start_new_thread)
+        self._idle = 0
+
+    # --- เปิด/ปิดการใช้งานบอร์ดนี้เป็นบอร์ดปัจจุบัน ---
+    def activate(self):
+        global _current
+        _current = self
+
+    def deactivate(self):
+        global _current
+        if _current is self:
+            _current = None
+
+    @property
+    def now_us(self):
+        return self.clock.us
+
+    @property
+    def panel(self):
+        return self.i2c_devices.get(0x3C)
+
+    # --- การคิดเวลาของการเรียกใช้ฮาร์ดแวร์ ---
+    # idle=True หมายถึงการเรียกครั้งนี้ไม่ได้เปลี่ยนแปลงอะไร (อ่านได้ค่าเดิม/เขียนค่าเดิม)
+    # ถ้าวนแบบนี้ติดกันนาน จะกระโดดเวลาข้ามไปครั้งละ max_idle_us เพื่อไม่ต้องจำลองทุกรอบ
+    def spend(self, kind, idle=False):
+        cost = self.costs[kind]
+        self.counters[kind] += 1
+        clock = self.clock
+        if idle:
+            self._idle += 1
+            if self._idle > IDLE_STREAK and self.max_idle_us > cost:
+                step = self.max_idle_us
+                nxt = clock.next_event_us()
+                if nxt is not None and nxt - clock.us < step:
+                    # มีเหตุการณ์ภายนอกในช่วงนี้: หยุดกระโดดเวลาจนกว่าโค้ดจะได้วนตรวจผลของเหตุการณ์นั้นก่อน
+                    step = max(cost, nxt - clock.us)
+                    self._idle = 0
+                clock.advance(step)
+                return
+        else:
+            self._idle = 0
+        clock.advance(cost)
+
+    def sleep_us(self, us):
+        self._idle = 0
+        self.clock.advance(max(0, int(us)))
+
+    def record(self, kind, key, value):
+        self.trace.append((self.clock.us, kind, key, value))
+
+    # --- อุปกรณ์บนบอร์ด ---
+    def pin(self, pin_id):
+        st = self.pins.get(pin_id)
+        if st is None:
+            st = self.pins[pin_id] = PinState(self, pin_id)
+        return st
+
+    def pwm_channel(self, pin_id):
+        st = self.pwm.get(pin_id)
+        if st is None:
+            st = self.pwm[pin_id] = PWMState(pin_id)
+        return st
+
+    def serial_line(self, pin_id, baud=9600):
+        line = self.serial.get(pin_id)
+        if line is None:
+            line = self.serial[pin_id] = SerialLine(self, pin_id, baud)
+            self.pin(pin_id).source = line.level
+        return line
+
+    def catch_up_sms(self):
+        for sm in self.sms.values():
+            sm.catch_up()
+
+    def read_adc(self, gpio):
+        src = self.adc.get(gpio, 65535)
+        value = src(self.clock.us) if callable(src) else src
+        return max(0, min(65535, int(value)))
+
+    # --- ตัวช่วยสร้างเหตุการณ์ภายนอก (Stimulus) ---
+    def at_ms(self, ms, fn):
+        self.clock.at_us(int(ms * 1000), fn)
+
+    def set_input(self, pin_id, level, at_ms=None):
+        if at_ms is None:
+            self.pin(pin_id).drive(level)
+        else:
+            self.at_ms(at_ms, lambda: self.pin(pin_id).drive(level))
+
+    # กดปุ่ม (ขาแบบ Pull-up: กด = 0) ที่เวลา at_ms ค้างไว้ hold_ms
+    def press(self, pin_id, at_ms, hold_ms=100):
+        self.set_input(pin_id, 0, at_ms)
+        self.set_input(pin_id, 1, at_ms + hold_ms)
+
+    def set_adc(self, gpio, value):
+        self.adc[gpio] = value
+
+    # ส่งข้อมูลดิบ 1 ไบต์ (ตามที่ออกจากสายจริง) เข้าขารับ UART
+    def send_byte(self, byte, at_ms, pin_id=12, baud=9600):
+        line = self.serial_line(pin_id, baud)
+        return line.send(byte, at_ms * 1000)
+
+    # ส่งรหัสปุ่ม Wireless-X14 1 ชุด (2 ไบต์)
+    # โปรแกรม PIO ในหนังสือเลื่อนบิตเข้าทางซ้าย (SHIFT_LEFT) จึงได้บิตกลับด้านจากลำดับบนสาย
+    # ตาราง BUTTONS เป็นค่าหลังกลับบิตแล้ว ที่นี่จึงกลับบิตก่อนส่งเพื่อให้โค้ดอ่านได้รหัสตรงตามตาราง
+    def x14(self, code, at_ms, hold_ms=0, period_ms=50, pin_id=12):
+        t = at_ms
+        while True:
+            self.send_byte(reverse8((code >> 8) & 0xFF), t, pin_id)
+            self.send_byte(reverse8(code & 0xFF), t, pin_id)
+            t += period_ms
+            if t > at_ms + hold_ms:
+                break
+
+    # --- สรุปผล ---
+    def pwm_duties(self):
+        return {p: st.duty_u16 for p, st in sorted(self.pwm.items())}
+
+    def summary(self):
+        panel = self.panel
+        return {
+            "virtual_ms": self.clock.us / 1000,
+            "pwm_writes": sum(st.writes for st in self.pwm.values()),
+            "pwm_changes": sum(1 for e in self.trace if e[1] == "pwm"),
+            "i2c_bytes": panel.stats["bytes"] if panel else 0,
+            "calls": dict(self.counters),
+        }
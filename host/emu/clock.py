@@ -0,0 +1,51 @@
+# นาฬิกาเสมือน (Virtual Clock) สำหรับตัวจำลองบอร์ด
+# เวลาเดินหน้าเฉพาะเมื่อโค้ดเรียกใช้ฮาร์ดแวร์หรือสั่ง sleep เท่านั้น จึงรันได้เร็วกว่าเวลาจริงมาก
+import heapq
+
+
+class SimulationEnd(Exception):
+    # ถูกโยนออกมาเมื่อเวลาเสมือนเดินถึงกำหนดสิ้นสุดการจำลอง (deadline)
+    pass
+
+
+class VirtualClock:
+    def __init__(self, deadline_us=None):
+        self.us = 0                   # เวลาปัจจุบัน (ไมโครวินาที)
+        self.deadline_us = deadline_us
+        self.listeners = []           # ฟังก์ชัน fn(t0, t1) ที่ถูกเรียกทุกครั้งที่เวลาเดิน
+        self._events = []             # คิวเหตุการณ์ที่ตั้งเวลาไว้ (เวลา, ลำดับ, ฟังก์ชัน)
+        self._seq = 0
+
+    # ตั้งเวลาให้เรียกฟังก์ชัน fn เมื่อถึงเวลา t (ไมโครวินาที)
+    def at_us(self, t, fn):
+        self._seq += 1
+        heapq.heappush(self._events, (int(t), self._seq, fn))
+
+    def after_us(self, dt, fn):
+        self.at_us(self.us + dt, fn)
+
+    # เวลาของเหตุการณ์ถัดไป (None ถ้าไม่มี)
+    def next_event_us(self):
+        return self._events[0][0] if self._events else None
+
+    # เดินเวลาไปข้างหน้า dt ไมโครวินาที พร้อมเรียกเหตุการณ์ที่ถึงกำหนดตามลำดับเวลา
+    def advance(self, dt):
+        target = self.us + int(dt)
+        events = self._events
+        while events and events[0][0] <= target:
+            t, _, fn = heapq.heappop(events)
+            self._move(t)
+            fn()
+        self._move(target)
+
+    def _move(self, t):
+        if t <= self.us:
+            return
+        if self.deadline_us is not None and t >= self.deadline_us:
+            t = self.deadline_us
+        t0 = self.us
+        self.us = t
+        for fn in self.listeners:
+            fn(t0, t)
+        if self.deadline_us is not None and t >= self.deadline_us:
+            raise SimulationEnd(t)
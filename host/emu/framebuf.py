@@ -0,0 +1,219 @@
+# โมดูล framebuf จำลอง (เขียนด้วย Python ล้วน) รองรับรูปแบบ MONO_VLSB, MONO_HLSB, MONO_HMSB และ GS8
+# ฟอนต์ในตัวเป็นฟอนต์ 5x7 วางในช่อง 8x8 ขนาดและตำแหน่งตัวอักษรตรงกับบอร์ดจริง แต่ลายเส้นอาจต่างเล็กน้อย
+
+MONO_VLSB = 0
+MVLSB = MONO_VLSB
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+# ฟอนต์ 5x7 แบบคอลัมน์ (บิต 0 = แถวบนสุด) สำหรับอักขระ 0x20-0x7E ตัวละ 5 ไบต์
+_FONT = bytes.fromhex(
+    "0000000000" "00005f0000" "0007000700" "147f147f14" "242a7f2a12" "2313086462" "3649552250" "0005030000"
+    "001c224100" "0041221c00" "14083e0814" "08083e0808" "0050300000" "0808080808" "0060600000" "2010080402"
+    "3e5149453e" "00427f4000" "4261514946" "2141454b31" "1814127f10" "2745454539" "3c4a494930" "0171090503"
+    "3649494936" "064949291e" "0036360000" "0056360000" "0814224100" "1414141414" "0041221408" "0201510906"
+    "324979413e" "7e1111117e" "7f49494936" "3e41414122" "7f4141221c" "7f49494941" "7f09090901" "3e4149497a"
+    "7f0808087f" "00417f4100" "2040413f01" "7f08142241" "7f40404040" "7f020c027f" "7f0408107f" "3e4141413e"
+    "7f09090906" "3e4151215e" "7f09192946" "4649494931" "01017f0101" "3f4040403f" "1f2040201f" "3f4038403f"
+    "6314081463" "0708700807" "6151494543" "007f414100" "0204081020" "0041417f00" "0402010204" "4040404040"
+    "0001020400" "2054545478" "7f48444438" "3844444420" "384444487f" "3854545418" "087e090102" "0c5252523e"
+    "7f08040478" "00447d4000" "2040443d00" "7f10284400" "00417f4000" "7c04180478" "7c08040478" "3844444438"
+    "7c14141408" "081414187c" "7c08040408" "4854545420" "043f444020" "3c4040207c" "1c2040201c" "3c4030403c"
+    "4428102844" "0c5050503c" "4464544c44" "0008364100" "00007f0000" "0041360800" "0804081008"
+)
+_BLOCK = b"\x7f\x7f\x7f\x7f\x7f"
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        self.buf = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        stride = width if stride is None else stride
+        if format in (MONO_HLSB, MONO_HMSB):
+            stride = (stride + 7) & ~7
+        self.stride = stride
+
+    # --- การอ่าน/เขียนพิกเซลตามรูปแบบหน่วยความจำ ---
+    def _get(self, x, y):
+        f = self.format
+        if f == MONO_VLSB:
+            return (self.buf[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+        if f == MONO_HLSB or f == MONO_HMSB:
+            bit = (x & 7) if f == MONO_HMSB else 7 - (x & 7)
+            return (self.buf[(x + y * self.stride) >> 3] >> bit) & 1
+        if f == GS8:
+            return self.buf[y * self.stride + x]
+        raise ValueError("unsupported format")
+
+    def _set(self, x, y, c):
+        f = self.format
+        buf = self.buf
+        if f == MONO_VLSB:
+            i = (y >> 3) * self.stride + x
+            m = 1 << (y & 7)
+            buf[i] = (buf[i] | m) if c & 1 else (buf[i] & ~m & 0xFF)
+        elif f == MONO_HLSB or f == MONO_HMSB:
+            i = (x + y * self.stride) >> 3
+            m = 1 << ((x & 7) if f == MONO_HMSB else 7 - (x & 7))
+            buf[i] = (buf[i] | m) if c & 1 else (buf[i] & ~m & 0xFF)
+        elif f == GS8:
+            buf[y * self.stride + x] = c & 0xFF
+        else:
+            raise ValueError("unsupported format")
+
+    # --- คำสั่งวาดพื้นฐาน ---
+    def fill(self, c):
+        if self.format == GS8:
+            v = c & 0xFF
+        else:
+            v = 0xFF if c & 1 else 0
+        n = len(self.buf)
+        self.buf[0:n] = bytes([v]) * n
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + w), min(self.height, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.format == MONO_VLSB:
+            buf = self.buf
+            stride = self.stride
+            for page in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+                lo = max(y0, page * 8) - page * 8
+                hi = min(y1, page * 8 + 8) - page * 8
+                mask = ((1 << hi) - 1) & ~((1 << lo) - 1)
+                base = page * stride
+                if c & 1:
+                    for i in range(base + x0, base + x1):
+                        buf[i] |= mask
+                else:
+                    inv = ~mask & 0xFF
+                    for i in range(base + x0, base + x1):
+                        buf[i] &= inv
+            return
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=15):
+        for yy in range(-yr, yr + 1):
+            for xx in range(-xr, xr + 1):
+                inside = (xx * xx * yr * yr + yy * yy * xr * xr) <= xr * xr * yr * yr
+                if not inside:
+                    continue
+                quad = (1 if xx >= 0 and yy <= 0 else 0) | (2 if xx <= 0 and yy <= 0 else 0) \
+                    | (4 if xx <= 0 and yy >= 0 else 0) | (8 if xx >= 0 and yy >= 0 else 0)
+                if not quad & m:
+                    continue
+                if f:
+                    self.pixel(x + xx, y + yy, c)
+                else:
+                    nx = ((abs(xx) + 1) ** 2 * yr * yr + yy * yy * xr * xr) > xr * xr * yr * yr
+                    ny = (xx * xx * yr * yr + (abs(yy) + 1) ** 2 * xr * xr) > xr * xr * yr * yr
+                    if nx or ny:
+                        self.pixel(x + xx, y + yy, c)
+
+    # --- ข้อความ ---
+    def text(self, s, x, y, c=1):
+        if isinstance(s, bytes):
+            s = s.decode("latin-1")
+        elif not isinstance(s, str):
+            raise TypeError("can't convert '%s' object to str implicitly" % type(s).__name__)
+        for ch in s:
+            if x >= self.width:
+                break
+            code = ord(ch)
+            if 0x20 <= code <= 0x7E:
+                glyph = _FONT[(code - 0x20) * 5:(code - 0x20) * 5 + 5]
+            else:
+                glyph = _BLOCK
+            for j in range(5):
+                col = glyph[j]
+                xx = x + 1 + j
+                if col and 0 <= xx < self.width:
+                    for k in range(7):
+                        if col >> k & 1:
+                            yy = y + k
+                            if 0 <= yy < self.height:
+                                self._set(xx, yy, c)
+            x += 8
+
+    # --- เลื่อนภาพและคัดลอกภาพ ---
+    def scroll(self, xstep, ystep):
+        w, h = self.width, self.height
+        snapshot = [[self._get(x, y) for x in range(w)] for y in range(h)]
+        for y in range(h):
+            sy = y - ystep
+            if not 0 <= sy < h:
+                continue
+            row = snapshot[sy]
+            for x in range(w):
+                sx = x - xstep
+                if 0 <= sx < w:
+                    self._set(x, y, row[sx])
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if not isinstance(fbuf, FrameBuffer):
+            fbuf = FrameBuffer(*fbuf)
+        for sy in range(fbuf.height):
+            yy = y + sy
+            if not 0 <= yy < self.height:
+                continue
+            for sx in range(fbuf.width):
+                xx = x + sx
+                if not 0 <= xx < self.width:
+                    continue
+                c = fbuf._get(sx, sy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self._set(xx, yy, c)
+
+
+def FrameBuffer1(buffer, width, height, format=MONO_VLSB, stride=None):
+    return FrameBuffer(buffer, width, height, format, stride)
@@ -0,0 +1,267 @@
+# โมดูล machine จำลอง (Pin, PWM, ADC, I2C, Timer) สำหรับรันโค้ดบนคอมพิวเตอร์
+# API เหมือน MicroPython พอร์ต rp2 เท่าที่โค้ดในหนังสือใช้งาน
+from . import board as _board
+
+# ช่อง ADC ของ RP2040 -> หมายเลขขา GPIO
+_ADC_GPIO = {0: 26, 1: 27, 2: 28, 3: 29, 4: 4}
+
+
+def _pin_id(p):
+    return p.id if isinstance(p, Pin) else p
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    ALT = 3
+    PULL_UP = _board.PULL_UP
+    PULL_DOWN = _board.PULL_DOWN
+    IRQ_FALLING = _board.IRQ_FALLING
+    IRQ_RISING = _board.IRQ_RISING
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self._st = _board.current().pin(id)
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        st = self._st
+        if mode != -1:
+            st.mode = mode
+        if pull != -1:
+            st.pull = pull
+        if value is not None:
+            st.write(value)
+
+    def value(self, v=None):
+        st = self._st
+        b = st.board
+        if v is None:
+            level = st.level()
+            b.spend("pin_read", idle=level == st.last_read)
+            st.last_read = level
+            return level
+        b.spend("pin_write", idle=(1 if v else 0) == st.out)
+        st.write(v)
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self):
+        self.value(not self._st.out)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        self._st.handler = None if handler is None else (handler, trigger, self)
+        return _PinIRQ(self, trigger)
+
+    def __repr__(self):
+        return "Pin(GPIO%d)" % self.id
+
+
+class _PinIRQ:
+    def __init__(self, pin, trigger):
+        self._pin = pin
+        self._trigger = trigger
+
+    def trigger(self):
+        return self._trigger
+
+    def flags(self):
+        return self._trigger
+
+
+class PWM:
+    def __init__(self, dest, freq=None, duty_u16=None, duty_ns=None, invert=False):
+        self.id = _pin_id(dest)
+        self._b = _board.current()
+        self._st = self._b.pwm_channel(self.id)
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+        if duty_ns is not None:
+            self.duty_ns(duty_ns)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._st.freq
+        self._b.spend("pwm_config")
+        self._st.freq = int(value)
+
+    def duty_u16(self, value=None):
+        st = self._st
+        if value is None:
+            return st.duty_u16
+        value = int(value)
+        if not 0 <= value <= 65535:
+            raise ValueError("duty_u16 must be from 0 to 65535")
+        st.writes += 1
+        changed = value != st.duty_u16
+        self._b.spend("pwm_write", idle=not changed)
+        st.duty_u16 = value
+        if changed:
+            self._b.record("pwm", self.id, value)
+
+    def duty_ns(self, value=None):
+        st = self._st
+        period_ns = 1000000000 // st.freq if st.freq else 0
+        if value is None:
+            return st.duty_u16 * period_ns // 65535
+        value = int(value)
+        if value < 0:
+            raise ValueError("duty_ns must be positive")
+        u16 = min(65535, value * 65535 // period_ns) if period_ns else 0
+        self.duty_u16(u16)
+
+    def deinit(self):
+        self.duty_u16(0)
+
+
+class ADC:
+    CORE_TEMP = 4
+
+    def __init__(self, pin):
+        if isinstance(pin, Pin):
+            self.gpio = pin.id
+        else:
+            self.gpio = _ADC_GPIO.get(pin, pin)
+        self._b = _board.current()
+
+    def read_u16(self):
+        self._b.spend("adc_read")
+        return self._b.read_adc(self.gpio)
+
+
+class I2C:
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        self.id = id
+        self.freq = freq
+        self._b = _board.current()
+
+    def _device(self, addr):
+        dev = self._b.i2c_devices.get(addr)
+        if dev is None:
+            self._b.spend("i2c_start")
+            raise OSError(5)          # EIO: ไม่มีอุปกรณ์ตอบรับ (NACK)
+        return dev
+
+    # เวลาที่บัสถูกใช้งาน: ไบต์ละ 9 บิต (8 บิตข้อมูล + ACK) รวมไบต์ที่อยู่
+    def _busy(self, nbytes):
+        b = self._b
+        b.counters["i2c_bytes"] += nbytes + 1
+        b.spend("i2c_start")
+        b.clock.advance((nbytes + 1) * 9 * 1000000 // self.freq)
+
+    def scan(self):
+        return sorted(self._b.i2c_devices)
+
+    def writeto(self, addr, buf, stop=True):
+        dev = self._device(addr)
+        self._busy(len(buf))
+        dev.write(bytes(buf))
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(v) for v in vector)
+        return self.writeto(addr, data, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        dev = self._device(addr)
+        self._busy(nbytes)
+        return dev.read(nbytes)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.readfrom(addr, len(buf), stop)
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        self.writeto(addr, bytes([memaddr & 0xFF]) + bytes(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        self.writeto(addr, bytes([memaddr & 0xFF]), False)
+        return self.readfrom(addr, nbytes)
+
+
+SoftI2C = I2C
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self._b = _board.current()
+        self._gen = 0
+        if callback is not None:
+            self.init(mode=mode, period=period, freq=freq, callback=callback)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, callback=None, tick_hz=1000):
+        self._gen += 1
+        if freq > 0:
+            period_us = 1000000 // freq
+        else:
+            period_us = int(period * 1000000 // tick_hz)
+        self._period_us = max(1, period_us)
+        self._mode = mode
+        self._callback = callback
+        self._schedule(self._gen)
+
+    def _schedule(self, gen):
+        self._b.clock.after_us(self._period_us, lambda: self._fire(gen))
+
+    def _fire(self, gen):
+        if gen != self._gen:
+            return
+        if self._mode == Timer.PERIODIC:
+            self._schedule(gen)
+        self._b.counters["timer_irq"] += 1
+        if self._callback is not None:
+            self._callback(self)
+
+    def deinit(self):
+        self._gen += 1
+
+
+# --- ฟังก์ชันระดับบอร์ด ---
+def freq(hz=None):
+    return 125000000 if hz is None else None
+
+
+def unique_id():
+    return b"\xe6\x60\x58\x38\x83\x00\x00\x14"
+
+
+def reset():
+    raise SystemExit("machine.reset()")
+
+
+soft_reset = reset
+
+
+def idle():
+    b = _board.current()
+    nxt = b.clock.next_event_us()
+    b.sleep_us(1000 if nxt is None else max(1, min(1000, nxt - b.clock.us)))
+
+
+def lightsleep(ms=None):
+    _board.current().sleep_us((ms or 0) * 1000)
+
+
+deepsleep = lightsleep
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
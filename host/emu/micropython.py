@@ -0,0 +1,46 @@
+# โมดูล micropython จำลอง: const และ decorator สำหรับคอมไพล์โค้ด native ไม่มีผลบนคอมพิวเตอร์
+
+
+def const(value):
+    return value
+
+
+def native(fn):
+    return fn
+
+
+viper = native
+asm_thumb = native
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+# บนบอร์ดจริงฟังก์ชันจะถูกเรียกภายหลังนอก IRQ ในตัวจำลองเรียกทันที
+def schedule(fn, arg):
+    fn(arg)
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
+
+
+def kbd_intr(chr):
+    pass
+
+
+def opt_level(level=None):
+    return 0 if level is None else None
+
+
+def mem_info(verbose=False):
+    print("mem: emulated")
+
+
+def qstr_info(verbose=False):
+    print("qstr: emulated")
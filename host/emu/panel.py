@@ -0,0 +1,167 @@
+# แบบจำลองตัวควบคุมจอ OLED SSD1306 ที่ต่ออยู่บนบัส I2C
+# แปลคำสั่ง (command) และข้อมูล (data) ที่ส่งมาจริงลงหน่วยความจำภาพ GDDRAM
+# พร้อมนับจำนวนไบต์บนบัส เพื่อใช้วัดต้นทุนการอัปเดตหน้าจอ
+
+WIDTH = 128
+PAGES = 8
+FRAME_HZ = 88         # อัตรารีเฟรชภายในของจอ (ออสซิลเลเตอร์ 370 kHz, precharge 0xF1, 64 แถว)
+
+# จำนวนไบต์พารามิเตอร์ที่ตามหลังคำสั่งแต่ละตัว
+_ARGS = {
+    0x20: 1, 0x21: 2, 0x22: 2, 0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5,
+    0x81: 1, 0x8D: 1, 0xA3: 2, 0xA8: 1, 0xAD: 1, 0xD3: 1, 0xD5: 1,
+    0xD9: 1, 0xDA: 1, 0xDB: 1,
+}
+
+# ช่วงเวลาเลื่อน (จำนวนเฟรมต่อ 1 คอลัมน์) ตามรหัส interval ในคำสั่ง 0x26/0x27
+SCROLL_FRAMES = (5, 64, 128, 256, 3, 4, 25, 2)
+
+
+class SSD1306Panel:
+    def __init__(self, now_us=None):
+        self.now_us = now_us or (lambda: 0)
+        self.ram = bytearray(WIDTH * PAGES)
+        self.stats = {"transactions": 0, "bytes": 0, "cmd_bytes": 0, "data_bytes": 0}
+        self.on = False
+        self.mode = 2          # ค่าเริ่มต้นหลังรีเซ็ตคือ page addressing
+        self.col_start, self.col_end = 0, WIDTH - 1
+        self.page_start, self.page_end = 0, PAGES - 1
+        self.col = 0
+        self.page = 0
+        self.start_line = 0
+        self.offset = 0
+        self.scroll = None     # (ทิศทาง +1/-1, หน้าเริ่ม, หน้าสุดท้าย, จำนวนเฟรมต่อขั้น)
+        self.scroll_since = None
+        self.commands = []     # ประวัติคำสั่งทั้งหมด (รหัสคำสั่ง, พารามิเตอร์)
+        self._pending = None
+
+    # --- อินเทอร์เฟซ I2C ---
+    def write(self, buf):
+        st = self.stats
+        st["transactions"] += 1
+        st["bytes"] += len(buf) + 1          # รวมไบต์ที่อยู่ (address byte)
+        i = 1
+        ctrl = buf[0] if buf else 0
+        n = len(buf)
+        while i < n:
+            if ctrl & 0x40:
+                st["data_bytes"] += n - i
+                self._data(buf, i)
+                return
+            st["cmd_bytes"] += 1
+            self._cmd_byte(buf[i])
+            i += 1
+            if ctrl & 0x80 and i < n:        # Co=1: ไบต์ถัดไปเป็น control byte ใหม่
+                ctrl = buf[i]
+                i += 1
+
+    def read(self, n):
+        return bytes(n)
+
+    # --- คำสั่ง ---
+    def _cmd_byte(self, b):
+        p = self._pending
+        if p is not None:
+            p[1].append(b)
+            if len(p[1]) == _ARGS[p[0]]:
+                self._pending = None
+                self._exec(p[0], p[1])
+            return
+        if b in _ARGS:
+            self._pending = (b, [])
+        else:
+            self._exec(b, ())
+
+    def _exec(self, cmd, args):
+        self.commands.append((cmd, tuple(args)))
+        if cmd == 0x20:
+            self.mode = args[0] & 3
+        elif cmd == 0x21:
+            self.col_start, self.col_end = args[0] & 0x7F, args[1] & 0x7F
+            self.col = self.col_start
+        elif cmd == 0x22:
+            self.page_start, self.page_end = args[0] & 7, args[1] & 7
+            self.page = self.page_start
+        elif cmd <= 0x0F:
+            self.col = (self.col & 0xF0) | cmd
+        elif cmd <= 0x1F:
+            self.col = (self.col & 0x0F) | ((cmd & 0x07) << 4)
+        elif 0xB0 <= cmd <= 0xB7:
+            self.page = cmd & 7
+        elif 0x40 <= cmd <= 0x7F:
+            self.start_line = cmd & 0x3F
+        elif cmd == 0xD3:
+            self.offset = args[0] & 0x3F
+        elif cmd in (0x26, 0x27, 0x29, 0x2A):
+            direction = 1 if cmd in (0x26, 0x29) else -1
+            self.scroll = (direction, args[1] & 7, args[3] & 7, SCROLL_FRAMES[args[2] & 7])
+        elif cmd == 0x2F:
+            self._bake()
+            self.scroll_since = self.now_us()
+        elif cmd == 0x2E:
+            self._bake()
+        elif cmd == 0xAE or cmd == 0xAF:
+            self.on = cmd == 0xAF
+
+    # --- ข้อมูลภาพ ---
+    def _data(self, buf, i):
+        ram = self.ram
+        for k in range(i, len(buf)):
+            ram[self.page * WIDTH + self.col] = buf[k]
+            if self.mode == 0:
+                if self.col >= self.col_end:
+                    self.col = self.col_start
+                    self.page = self.page_start if self.page >= self.page_end else self.page + 1
+                else:
+                    self.col += 1
+            elif self.mode == 1:
+                if self.page >= self.page_end:
+                    self.page = self.page_start
+                    self.col = self.col_start if self.col >= self.col_end else self.col + 1
+                else:
+                    self.page += 1
+            else:
+                self.col = (self.col + 1) & 0x7F
+
+    # hardware scroll ของจริงหมุนข้อมูลใน GDDRAM เอง เมื่อหยุดเลื่อนจึงบันทึกผลการหมุนลง RAM
+    def _bake(self):
+        shift = self.scrolled_columns()
+        self.scroll_since = None
+        if not shift:
+            return
+        for page in range(self.scroll[1], self.scroll[2] + 1):
+            row = self.ram[page * WIDTH:(page + 1) * WIDTH]
+            for x in range(WIDTH):
+                self.ram[page * WIDTH + (x + shift) % WIDTH] = row[x]
+
+    # จำนวนคอลัมน์ที่ภาพถูกเลื่อนไปแล้วโดย hardware scroll ณ เวลาปัจจุบัน
+    def scrolled_columns(self):
+        if self.scroll is None or self.scroll_since is None:
+            return 0
+        frames = (self.now_us() - self.scroll_since) * FRAME_HZ // 1000000
+        return self.scroll[0] * (frames // self.scroll[3])
+
+    # ภาพที่ตามองเห็นบนจอ (รวมผลของ start line, display offset และ hardware scroll)
+    def visible(self):
+        src = self.ram
+        out = bytearray(WIDTH * PAGES)
+        shift = self.scrolled_columns()
+        first, last = (self.scroll[1], self.scroll[2]) if self.scroll else (0, -1)
+        for y in range(PAGES * 8):
+            ry = (y + self.start_line + self.offset) & 63
+            for x in range(WIDTH):
+                sx = x
+                if shift and first <= ry // 8 <= last:
+                    sx = (x - shift) % WIDTH
+                if src[(ry >> 3) * WIDTH + sx] >> (ry & 7) & 1:
+                    out[(y >> 3) * WIDTH + x] |= 1 << (y & 7)
+        return out
+
+    # แสดงภาพบนจอเป็นตัวอักษร (ใช้ดูผลบนเทอร์มินัล)
+    def render(self, on="#", off="."):
+        img = self.visible()
+        rows = []
+        for y in range(PAGES * 8):
+            rows.append("".join(on if img[(y >> 3) * WIDTH + x] >> (y & 7) & 1 else off
+                                for x in range(WIDTH)))
+        return "\n".join(rows)
@@ -0,0 +1,416 @@
+# โมดูล rp2 จำลอง: แอสเซมเบลอร์ PIO (@rp2.asm_pio) และ StateMachine ที่รันโปรแกรม PIO จริงทีละคำสั่ง
+# state machine ทำงานตามนาฬิกาของตัวเอง (freq) และประมวลผลตามเวลาเสมือนเฉพาะตอนที่มีสัญญาณเข้ามา
+# รองรับคำสั่ง jmp, wait, in, out, push, pull, mov, irq, set และ nop พร้อม delay, autopush และ autopull
+from . import board as _board
+
+
+class PIO:
+    IN_LOW = 0
+    IN_HIGH = 1
+    OUT_LOW = 2
+    OUT_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+    IRQ_SM0 = 0x100
+    IRQ_SM1 = 0x200
+    IRQ_SM2 = 0x400
+    IRQ_SM3 = 0x800
+
+    def __init__(self, id):
+        self.id = id
+
+    def state_machine(self, id, program=None, *args, **kw):
+        sm = StateMachine(self.id * 4 + id)
+        if program is not None:
+            sm.init(program, *args, **kw)
+        return sm
+
+    def remove_program(self, program=None):
+        pass
+
+
+class PIOASMError(Exception):
+    pass
+
+
+# --- แอสเซมเบลอร์ ---
+class _Instr:
+    def __init__(self, prog, op, *args):
+        self.op = op
+        self.args = args
+        self.delay = 0
+        prog.append(self)
+
+    def __getitem__(self, delay):
+        if not 0 <= delay <= 31:
+            raise PIOASMError("delay too large")
+        self.delay = delay
+        return self
+
+    def side(self, value):
+        return self
+
+
+class _Program:
+    def __init__(self, config):
+        self.config = config
+        self.instrs = []
+        self.labels = {}
+        self.wrap_target = 0
+        self.wrap = None
+
+
+def asm_pio(**kw):
+    config = {
+        "in_shiftdir": PIO.SHIFT_LEFT,
+        "out_shiftdir": PIO.SHIFT_LEFT,
+        "autopush": False,
+        "autopull": False,
+        "push_thresh": 32,
+        "pull_thresh": 32,
+        "fifo_join": PIO.JOIN_NONE,
+    }
+    config.update(kw)
+
+    def dec(f):
+        prog = _Program(config)
+        body = prog.instrs
+
+        def label(name):
+            prog.labels[name] = len(body)
+
+        def wrap_target():
+            prog.wrap_target = len(body)
+
+        def wrap():
+            prog.wrap = len(body) - 1
+
+        def ins(op):
+            return lambda *args: _Instr(body, op, *args)
+
+        gl = {
+            "__builtins__": __builtins__,
+            "label": label, "wrap_target": wrap_target, "wrap": wrap,
+            "jmp": ins("jmp"), "wait": ins("wait"), "in_": ins("in"), "out": ins("out"),
+            "push": ins("push"), "pull": ins("pull"), "mov": ins("mov"), "irq": ins("irq"),
+            "set": ins("set"), "nop": lambda: _Instr(body, "mov", "y", "y"),
+            "word": ins("word"),
+            "pins": "pins", "pin": "pin", "gpio": "gpio", "x": "x", "y": "y", "null": "null",
+            "isr": "isr", "osr": "osr", "pc": "pc", "pindirs": "pindirs", "exec": "exec",
+            "status": "status",
+            "x_dec": "x_dec", "y_dec": "y_dec", "not_x": "not_x", "not_y": "not_y",
+            "x_not_y": "x_not_y", "not_osre": "not_osre",
+            "block": "block", "noblock": "noblock", "iffull": "iffull", "ifempty": "ifempty",
+            "clear": "clear", "rel": lambda i: ("rel", i),
+            "invert": lambda s: ("invert", s), "reverse": lambda s: ("reverse", s),
+        }
+        exec(f.__code__, gl)
+        if len(body) > 32:
+            raise PIOASMError("program too long")
+        if prog.wrap is None:
+            prog.wrap = len(body) - 1
+        return prog
+
+    return dec
+
+
+# --- state machine ---
+class StateMachine:
+    # StateMachine(id) หมายเลขเดิมคืนออบเจกต์ตัวเดิมเหมือนบนบอร์ดจริง
+    def __new__(cls, id, *args, **kw):
+        b = _board.current()
+        sm = b.sms.get(id)
+        if sm is None:
+            sm = b.sms[id] = object.__new__(cls)
+            sm._active = False
+            sm._handler = None
+        return sm
+
+    def __init__(self, id, program=None, freq=-1, **kw):
+        self.id = id
+        self._b = _board.current()
+        if program is not None:
+            self.init(program, freq, **kw)
+
+    def init(self, program, freq=-1, in_base=None, out_base=None, set_base=None,
+             jmp_pin=None, sideset_base=None, in_shiftdir=None, out_shiftdir=None,
+             push_thresh=None, pull_thresh=None):
+        cfg = dict(program.config)
+        for k, v in (("in_shiftdir", in_shiftdir), ("out_shiftdir", out_shiftdir),
+                     ("push_thresh", push_thresh), ("pull_thresh", pull_thresh)):
+            if v is not None:
+                cfg[k] = v
+        self._prog = program
+        self._cfg = cfg
+        self._freq = 125000000 if freq <= 0 else freq
+        self._period = 1000000 / self._freq
+        self._in_base = None if in_base is None else in_base.id
+        self._jmp_pin = None if jmp_pin is None else jmp_pin.id
+        depth = 8 if cfg["fifo_join"] == PIO.JOIN_RX else 4
+        self._rx_depth = 0 if cfg["fifo_join"] == PIO.JOIN_TX else depth
+        self._tx_depth = 8 if cfg["fifo_join"] == PIO.JOIN_TX else (0 if cfg["fifo_join"] == PIO.JOIN_RX else 4)
+        self.restart()
+
+    def restart(self):
+        self._pc = 0
+        self._x = self._y = 0
+        self._isr = self._isr_n = 0
+        self._osr = 0
+        self._osr_n = 32
+        self._rx = []
+        self._tx = []
+        self._t = float(self._b.clock.us)
+        self._irq_pending = 0
+        self._idle_until = 0
+
+    def active(self, value=None):
+        if value is None:
+            return self._active
+        self.catch_up()
+        self._active = bool(value)
+        self._t = max(self._t, float(self._b.clock.us))
+
+    def irq(self, handler=None, trigger=0, hard=False):
+        self._handler = handler
+
+    # --- FIFO ฝั่ง CPU ---
+    def rx_fifo(self):
+        self.catch_up()
+        n = len(self._rx)
+        self._b.spend("fifo", idle=n == 0)
+        return n
+
+    def tx_fifo(self):
+        self.catch_up()
+        return len(self._tx)
+
+    def get(self, buf=None, shift=0):
+        b = self._b
+        self.catch_up()
+        while not self._rx:
+            # FIFO ว่าง: CPU ถูกบล็อกจนกว่าจะมีข้อมูลเข้ามา
+            nxt = b.clock.next_event_us()
+            b.sleep_us(1000 if nxt is None else max(1, min(1000, nxt - b.clock.us)))
+            self.catch_up()
+        b.spend("fifo")
+        value = self._rx.pop(0) >> shift
+        if buf is not None:
+            buf[0] = value
+            return None
+        return value
+
+    def put(self, value, shift=0):
+        self.catch_up()
+        self._tx.append((value << shift) & 0xFFFFFFFF)
+        self._b.spend("fifo")
+
+    def exec(self, instr):
+        pass
+
+    # --- ตัวประมวลผลคำสั่ง PIO ---
+    def _pin(self, gpio, t):
+        st = self._b.pin(gpio)
+        if st.source is not None:
+            return st.source(t)
+        return st.level()
+
+    def catch_up(self):
+        if not self._active or self._b.clock.us < self._idle_until:
+            return
+        self._run()
+        feed = self._b.rx_feeds.get(self.id)
+        if feed is not None:
+            feed(self)
+        # เรียก handler ของ IRQ หลังประมวลผลเสร็จ (เหมือน soft IRQ ที่ทำงานนอกตัว state machine)
+        while self._irq_pending:
+            self._irq_pending -= 1
+            self._b.counters["pio_irq"] += 1
+            if self._handler is not None:
+                self._handler(self)
+
+    def _run(self):
+        now = self._b.clock.us
+        instrs = self._prog.instrs
+        period = self._period
+        while self._t + period <= now:
+            ins = instrs[self._pc]
+            if ins.op == "wait" and not self._wait_done(ins):
+                if not self._skip_wait(ins, now):
+                    return
+                continue
+            if not self._step(ins):
+                # หยุดรอ (stall) เพราะ FIFO เต็ม/ว่าง: เดินเวลาไปเฉย ๆ
+                self._t = float(now)
+                return
+
+    def _wait_done(self, ins):
+        pol, src, idx = ins.args
+        if src == "irq":
+            return True
+        gpio = idx if src == "gpio" else (self._in_base or 0) + idx
+        return self._pin(gpio, self._t) == pol
+
+    # ระหว่างรอสัญญาณ ข้ามเวลาไปยังจุดที่ระดับสัญญาณอาจเปลี่ยน โดยไม่ต้องจำลองทีละรอบ
+    # คืน False เมื่อรอต่อไปจนถึงเวลาปัจจุบันแล้ว
+    def _skip_wait(self, ins, now):
+        pol, src, idx = ins.args
+        period = self._period
+        gpio = idx if src == "gpio" else (self._in_base or 0) + idx
+        line = self._b.serial.get(gpio)
+        if line is not None:
+            nxt = line.next_start(self._t)
+            if nxt is None:
+                # อยู่กลางเฟรม: จำลองทีละรอบสัญญาณนาฬิกา
+                self._t += period
+                return True
+            if nxt <= now:
+                self._t += max(1, int((nxt - self._t) / period)) * period
+                return True
+            # ไม่มีอะไรให้ทำจนกว่าเฟรมถัดไปจะเริ่ม (SerialLine.send จะปลุกถ้ามีเฟรมใหม่)
+            self._idle_until = nxt
+        # ขาอื่นเปลี่ยนระดับได้เฉพาะตอนมีเหตุการณ์ (ซึ่งจะเรียก catch_up ก่อนเปลี่ยนเสมอ)
+        self._t += int((now - self._t) / period) * period
+        return False
+
+    def _read(self, src):
+        if src == "pins":
+            return self._pin(self._in_base or 0, self._t)
+        if src == "x":
+            return self._x
+        if src == "y":
+            return self._y
+        if src == "isr":
+            return self._isr
+        if src == "osr":
+            return self._osr
+        if src == "null":
+            return 0
+        if src == "status":
+            return 0xFFFFFFFF if len(self._tx) < 1 else 0
+        if isinstance(src, tuple):
+            v = self._read(src[1])
+            if src[0] == "invert":
+                return ~v & 0xFFFFFFFF
+            return int("{:032b}".format(v)[::-1], 2)
+        raise PIOASMError("bad source %r" % (src,))
+
+    def _push(self, block=True):
+        if len(self._rx) >= self._rx_depth:
+            if block:
+                return False
+        else:
+            self._rx.append(self._isr & 0xFFFFFFFF)
+            self._b.counters["pio_push"] += 1
+        self._isr = self._isr_n = 0
+        return True
+
+    def _step(self, ins):
+        op = ins.op
+        a = ins.args
+        cfg = self._cfg
+        nxt = self._pc + 1
+        if op == "jmp":
+            if len(a) == 1:
+                cond, target = None, a[0]
+            else:
+                cond, target = a
+            take = True
+            if cond == "not_x":
+                take = self._x == 0
+            elif cond == "x_dec":
+                take = self._x != 0
+                self._x = (self._x - 1) & 0xFFFFFFFF
+            elif cond == "not_y":
+                take = self._y == 0
+            elif cond == "y_dec":
+                take = self._y != 0
+                self._y = (self._y - 1) & 0xFFFFFFFF
+            elif cond == "x_not_y":
+                take = self._x != self._y
+            elif cond == "pin":
+                take = self._pin(self._jmp_pin or 0, self._t) == 1
+            elif cond == "not_osre":
+                take = self._osr_n < cfg["pull_thresh"]
+            if take:
+                nxt = self._prog.labels[target] if isinstance(target, str) else target
+        elif op == "in":
+            src, n = a
+            if cfg["autopush"] and self._isr_n >= cfg["push_thresh"] and len(self._rx) >= self._rx_depth:
+                return False
+            if src == "pins":
+                v = 0
+                for k in range(n):
+                    v |= self._pin((self._in_base or 0) + k, self._t) << k
+            else:
+                v = self._read(src)
+            v &= (1 << n) - 1
+            if cfg["in_shiftdir"] == PIO.SHIFT_LEFT:
+                self._isr = ((self._isr << n) | v) & 0xFFFFFFFF
+            else:
+                self._isr = (self._isr >> n) | (v << (32 - n))
+            self._isr_n = min(32, self._isr_n + n)
+            if cfg["autopush"] and self._isr_n >= cfg["push_thresh"]:
+                self._push(True)
+        elif op == "push":
+            iffull = "iffull" in a
+            block = "noblock" not in a
+            if not iffull or self._isr_n >= cfg["push_thresh"]:
+                if not self._push(block):
+                    return False
+        elif op == "pull":
+            block = "noblock" not in a
+            if self._tx:
+                self._osr = self._tx.pop(0)
+                self._osr_n = 0
+            elif block:
+                return False
+            else:
+                self._osr = self._x
+                self._osr_n = 0
+        elif op == "out":
+            dest, n = a
+            if cfg["out_shiftdir"] == PIO.SHIFT_LEFT:
+                v = self._osr >> (32 - n)
+                self._osr = (self._osr << n) & 0xFFFFFFFF
+            else:
+                v = self._osr & ((1 << n) - 1)
+                self._osr >>= n
+            self._osr_n = min(32, self._osr_n + n)
+            if dest == "x":
+                self._x = v
+            elif dest == "y":
+                self._y = v
+            elif dest == "isr":
+                self._isr, self._isr_n = v, n
+            elif dest == "pc":
+                nxt = v
+        elif op == "mov":
+            dest, src = a
+            v = self._read(src)
+            if dest == "x":
+                self._x = v
+            elif dest == "y":
+                self._y = v
+            elif dest == "isr":
+                self._isr, self._isr_n = v, 0
+            elif dest == "osr":
+                self._osr, self._osr_n = v, 0
+            elif dest == "pc":
+                nxt = v
+        elif op == "set":
+            dest, v = a
+            if dest == "x":
+                self._x = v
+            elif dest == "y":
+                self._y = v
+        elif op == "irq":
+            if "clear" not in a:
+                self._irq_pending += 1
+        if nxt > self._prog.wrap and self._pc == self._prog.wrap:
+            nxt = self._prog.wrap_target
+        self._pc = nxt % len(self._prog.instrs)
+        self._t += self._period * (1 + ins.delay)
+        return True
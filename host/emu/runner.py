@@ -0,0 +1,106 @@
+# ตัวรันโค้ด Listing บนคอมพิวเตอร์: สลับโมดูล machine / rp2 / ssd1306 / time / asyncio เป็นตัวจำลองชั่วคราว
+# แล้วรันไฟล์ .py ตามเวลาเสมือนที่กำหนด
+import contextlib
+import glob
+import io
+import os
+import runpy
+import sys
+import tempfile
+import time as _host_time
+
+from .board import Board
+from .clock import SimulationEnd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LIB_DIR = os.path.join(ROOT, "lib")
+
+_FAKE_NAMES = ("micropython", "framebuf", "machine", "rp2", "time", "utime", "asyncio", "uasyncio", "_thread", "gc", "ssd1306")
+_LIB_PACKAGES = ("mikrorover",)
+
+
+def find_listing(key):
+    # รับได้ทั้งพาธเต็มหรือหมายเลข Listing เช่น "7-4"
+    if os.path.exists(key):
+        return os.path.abspath(key)
+    hits = sorted(glob.glob(os.path.join(ROOT, "*", "Listing %s*.py" % key)))
+    hits = [h for h in hits if os.path.basename(h)[len("Listing %s" % key)] in " :"]
+    if len(hits) != 1:
+        raise FileNotFoundError("cannot find listing %r" % key)
+    return hits[0]
+
+
+# ย้ายไปทำงานในโฟลเดอร์ path ระหว่างรัน ไฟล์ที่ Listing เขียน (prof.bin, mission.log) จึงไม่ปนกับโฟลเดอร์งาน
+# path=None ใช้โฟลเดอร์ชั่วคราวที่ลบทิ้งเมื่อจบ
+@contextlib.contextmanager
+def workdir(path=None):
+    cwd = os.getcwd()
+    with contextlib.ExitStack() as stack:
+        if path is None:
+            path = stack.enter_context(tempfile.TemporaryDirectory())
+        else:
+            os.makedirs(path, exist_ok=True)
+        os.chdir(path)
+        try:
+            yield path
+        finally:
+            os.chdir(cwd)
+
+
+def _purge_lib():
+    for name in list(sys.modules):
+        if name.split(".")[0] in _LIB_PACKAGES:
+            del sys.modules[name]
+
+
+@contextlib.contextmanager
+def emulated(board):
+    from . import framebuf, machine, micropython, rp2, vasyncio, vgc, vthread, vtime
+
+    fakes = {
+        "micropython": micropython, "framebuf": framebuf, "machine": machine,
+        "rp2": rp2, "time": vtime, "utime": vtime,
+        "asyncio": vasyncio, "uasyncio": vasyncio, "_thread": vthread, "gc": vgc,
+    }
+    saved = {name: sys.modules.get(name) for name in _FAKE_NAMES}
+    sys.modules.update(fakes)
+    from . import ssd1306
+    sys.modules["ssd1306"] = ssd1306
+    sys.path.insert(0, LIB_DIR)
+    _purge_lib()
+    board.activate()
+    try:
+        yield board
+    finally:
+        vthread.shutdown(board)
+        board.deactivate()
+        _purge_lib()
+        sys.path.remove(LIB_DIR)
+        for name, mod in saved.items():
+            if mod is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = mod
+
+
+def run_listing(path, board=None, duration_ms=10000, quiet=False, init_globals=None):
+    # รัน Listing จนจบโปรแกรมหรือจนเวลาเสมือนครบ duration_ms
+    # ผลลัพธ์อยู่ที่ board.outcome ("finished" / "deadline") และ board.wall_s (เวลาจริงที่ใช้)
+    if board is None:
+        board = Board(duration_ms)
+    elif duration_ms is not None:
+        board.clock.deadline_us = int(duration_ms * 1000)
+    path = find_listing(path)
+    out = io.StringIO() if quiet else None
+    t0 = _host_time.perf_counter()
+    with emulated(board), contextlib.ExitStack() as stack:
+        if out is not None:
+            stack.enter_context(contextlib.redirect_stdout(out))
+        try:
+            runpy.run_path(path, init_globals=init_globals, run_name="__main__")
+            board.outcome = "finished"
+        except SimulationEnd:
+            board.outcome = "deadline"
+    board.wall_s = _host_time.perf_counter() - t0
+    board.output = out.getvalue() if out is not None else None
+    return board
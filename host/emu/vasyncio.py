@@ -0,0 +1,294 @@
+# โมดูล asyncio จำลอง (ใช้แทน asyncio / uasyncio ของ MicroPython) ที่เดินตามนาฬิกาเสมือนของบอร์ด
+# task เป็น coroutine (async def) ที่สลับกันทำงานแบบร่วมมือ (cooperative) เหมือนบนบอร์ดจริง
+# เมื่อทุก task กำลังรอ ตัวจัดคิวจะเลื่อนเวลาไปยัง task ถัดไปหรือเหตุการณ์ของบอร์ด (IRQ/Timer) ที่ใกล้ที่สุดทันที
+# รองรับ run, create_task, sleep, sleep_ms, gather, wait_for, wait_for_ms, Event, ThreadSafeFlag และ Task.cancel
+import heapq
+import sys
+import traceback
+
+from . import board as _board
+from .clock import SimulationEnd
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class TimeoutError(Exception):
+    pass
+
+
+class _Suspend:
+    # สิ่งที่ coroutine ส่งให้ตัวจัดคิว: รอในรายการ waitlist และ/หรือจนถึงเวลา until (ไมโครวินาที)
+    # กลับมาทำงานพร้อมค่า True ถ้าถูกปลุกจากรายการ หรือ False ถ้าครบเวลา
+    __slots__ = ("waitlist", "until")
+
+    def __init__(self, waitlist=None, until=None):
+        self.waitlist = waitlist
+        self.until = until
+
+    def __await__(self):
+        woke = yield self
+        return woke
+
+
+class Task:
+    def __init__(self, coro, loop):
+        self.coro = coro
+        self.data = None          # ผลลัพธ์ หรือข้อผิดพลาดเมื่อจบแล้ว
+        self._loop = loop
+        self._done = False
+        self._failed = False
+        self._waiters = []        # task ที่รอ task นี้จบ
+        self._list = None         # รายการรอที่ task นี้อยู่
+        self._token = 0           # ลำดับการปลุก (รายการในคิวเวลาที่เก่ากว่านี้ถือว่ายกเลิกแล้ว)
+        self._throw = None
+
+    def done(self):
+        return self._done
+
+    def cancel(self):
+        return self._loop._cancel(self)
+
+    def __await__(self):
+        while not self._done:
+            yield _Suspend(self._waiters)
+        if self._failed:
+            raise self.data
+        return self.data
+
+    def __repr__(self):
+        return "<Task %s>" % getattr(self.coro, "__name__", self.coro)
+
+
+class Loop:
+    def __init__(self):
+        self._b = _board.current()
+        self._heap = []
+        self._seq = 0
+        self._stop = False
+        self.current = None
+
+    def _push(self, task, t_us, value=None):
+        task._token += 1
+        self._seq += 1
+        heapq.heappush(self._heap, (t_us, self._seq, task, task._token, value))
+
+    def _detach(self, task):
+        if task._list is not None:
+            try:
+                task._list.remove(task)
+            except ValueError:
+                pass
+            task._list = None
+
+    def _wake(self, task, value=True):
+        self._detach(task)
+        self._push(task, self._b.clock.us, value)
+
+    def _cancel(self, task):
+        if task._done:
+            return False
+        task._throw = CancelledError()
+        self._wake(task, None)
+        return True
+
+    def create_task(self, coro):
+        task = Task(coro, self)
+        self._push(task, self._b.clock.us)
+        return task
+
+    def _step(self, task, value):
+        self.current = task
+        self._b.spend("task")
+        try:
+            if task._throw is not None:
+                exc, task._throw = task._throw, None
+                cmd = task.coro.throw(exc)
+            else:
+                cmd = task.coro.send(value)
+        except StopIteration as e:
+            self._finish(task, e.value, False)
+            return
+        except SimulationEnd:
+            raise
+        except CancelledError as e:
+            self._finish(task, e, True)
+            return
+        except Exception as e:
+            self._finish(task, e, True)
+            return
+        finally:
+            self.current = None
+        if cmd is None:
+            self._push(task, self._b.clock.us)
+            return
+        if cmd.waitlist is not None:
+            cmd.waitlist.append(task)
+            task._list = cmd.waitlist
+        if cmd.until is not None:
+            self._push(task, cmd.until, False)
+        elif cmd.waitlist is None:
+            self._push(task, self._b.clock.us)
+        else:
+            task._token += 1
+
+    def _finish(self, task, data, failed):
+        task._done = True
+        task._failed = failed
+        task.data = data
+        if failed and not task._waiters and not isinstance(data, CancelledError):
+            # เหมือน MicroPython: แจ้งข้อผิดพลาดของ task ที่ไม่มีใครรอผล
+            print("Task exception wasn't retrieved")
+            print("future:", task, "coro=", task.coro)
+            traceback.print_exception(type(data), data, data.__traceback__, file=sys.stdout)
+        while task._waiters:
+            self._wake(task._waiters[0], True)
+
+    # วนจัดคิวจนกว่า task main จะจบ (main = None: วนจนกว่าจะเรียก stop())
+    def _run(self, main=None):
+        b = self._b
+        clock = b.clock
+        heap = self._heap
+        self._stop = False
+        while not self._stop and not (main is not None and main._done):
+            while heap and heap[0][3] != heap[0][2]._token:
+                heapq.heappop(heap)
+            now = clock.us
+            if heap and heap[0][0] <= now:
+                _, _, task, _, value = heapq.heappop(heap)
+                self._detach(task)
+                self._step(task, value)
+                continue
+            # ไม่มี task พร้อมทำงาน: เลื่อนเวลาไปยัง task หรือเหตุการณ์ของบอร์ดที่ใกล้ที่สุด (CPU พัก)
+            target = heap[0][0] if heap else None
+            nxt = clock.next_event_us()
+            if nxt is not None and (target is None or nxt < target):
+                target = nxt
+            b.sleep_us(1000 if target is None else max(1, target - now))
+
+    def run_until_complete(self, aw):
+        task = aw if isinstance(aw, Task) else self.create_task(aw)
+        self._run(task)
+        if task._failed:
+            raise task.data
+        return task.data
+
+    def run_forever(self):
+        self._run()
+
+    def stop(self):
+        self._stop = True
+
+    def close(self):
+        pass
+
+
+_loop = None
+
+
+def get_event_loop():
+    global _loop
+    if _loop is None or _loop._b is not _board.current():
+        _loop = Loop()
+    return _loop
+
+
+def new_event_loop():
+    global _loop
+    _loop = Loop()
+    return _loop
+
+
+def run(coro):
+    return get_event_loop().run_until_complete(coro)
+
+
+def create_task(coro):
+    return get_event_loop().create_task(coro)
+
+
+def current_task():
+    return get_event_loop().current
+
+
+def _now_us():
+    return _board.current().clock.us
+
+
+def sleep_ms(ms):
+    return _Suspend(None, _now_us() + max(0, int(ms * 1000)))
+
+
+def sleep(seconds):
+    return sleep_ms(seconds * 1000)
+
+
+async def gather(*aws, return_exceptions=False):
+    tasks = [a if isinstance(a, Task) else create_task(a) for a in aws]
+    results = []
+    for t in tasks:
+        try:
+            results.append(await t)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+async def wait_for_ms(aw, timeout_ms):
+    task = aw if isinstance(aw, Task) else create_task(aw)
+    if not task._done:
+        await _Suspend(task._waiters, _now_us() + int(timeout_ms * 1000))
+        if not task._done:
+            task.cancel()
+            raise TimeoutError
+    return await task
+
+
+def wait_for(aw, timeout):
+    return wait_for_ms(aw, timeout * 1000)
+
+
+class Event:
+    def __init__(self):
+        self.state = False
+        self._waiters = []
+
+    def is_set(self):
+        return self.state
+
+    def set(self):
+        self.state = True
+        loop = get_event_loop()
+        while self._waiters:
+            loop._wake(self._waiters[0], True)
+
+    def clear(self):
+        self.state = False
+
+    async def wait(self):
+        if not self.state:
+            await _Suspend(self._waiters)
+        return True
+
+
+class ThreadSafeFlag:
+    # set() เรียกจาก IRQ ได้ ปลุก task ที่รออยู่ 1 ตัว และล้างสถานะเองเมื่อ wait() คืนค่า
+    def __init__(self):
+        self.state = False
+        self._waiters = []
+
+    def set(self):
+        self.state = True
+        if self._waiters:
+            get_event_loop()._wake(self._waiters[0], True)
+
+    def clear(self):
+        self.state = False
+
+    async def wait(self):
+        if not self.state:
+            await _Suspend(self._waiters)
+        self.state = False
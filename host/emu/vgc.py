@@ -0,0 +1,51 @@
+# โมดูล gc จำลอง (ใช้แทน gc ของ MicroPython) คอมพิวเตอร์ไม่มีฮีปขนาดคงที่แบบบนบอร์ด
+# mem_alloc() จึงใช้ยอดหน่วยความจำที่ tracemalloc ติดตามอยู่ (ถ้าเปิดไว้ เช่นตอนรัน host.bench) ไม่เช่นนั้นเป็น 0
+# ตัวเลขใช้เทียบแนวโน้มบนคอมพิวเตอร์เท่านั้น ค่าจริงต้องวัดบนบอร์ด
+# collect() เดินเวลาเสมือนตามต้นทุน "gc" ของบอร์ด (เวลาที่ GC หยุดโปรแกรมโดยประมาณ)
+import tracemalloc
+
+from . import board as _board
+
+HEAP_BYTES = 192 * 1024     # ฮีปของ MicroPython บน RP2040 โดยประมาณ
+
+_enabled = True
+_threshold = -1
+collections = 0
+
+
+def collect():
+    global collections
+    collections += 1
+    b = _board._current
+    if b is not None:
+        b.spend("gc")
+    return 0
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def isenabled():
+    return _enabled
+
+
+def mem_alloc():
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def mem_free():
+    return max(0, HEAP_BYTES - mem_alloc())
+
+
+def threshold(amount=None):
+    global _threshold
+    if amount is None:
+        return _threshold
+    _threshold = amount
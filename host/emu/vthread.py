@@ -0,0 +1,191 @@
+# โมดูล _thread จำลอง (ใช้แทน _thread ของ MicroPython บน RP2040) ที่เดินตามนาฬิกาเสมือนของบอร์ด
+# RP2040 มี 2 คอร์: โค้ดหลักอยู่บนคอร์ 0 และ start_new_thread() รันฟังก์ชันบนคอร์ 1 ได้ครั้งละหนึ่งงาน
+# แต่ละคอร์เป็นเธรดของ Python แต่ทำงานทีละคอร์ (ส่งไม้ต่อ) ตามเวลาเสมือน:
+# คอร์ที่กำลังทำงานเดินเวลาได้จนถึงเวลาที่อีกคอร์รออยู่ แล้วสลับให้อีกคอร์ทำงานต่อ
+# ผลลัพธ์จึงเหมือนสองคอร์ทำงานคู่ขนานกันและได้ผลเดิมทุกครั้งที่รัน (deterministic)
+import sys
+import threading
+import traceback
+
+from . import board as _board
+from .clock import SimulationEnd
+
+
+class error(Exception):
+    pass
+
+
+class _Killed(BaseException):
+    # ใช้หยุดเธรดของคอร์ 1 เมื่อจบการจำลอง
+    pass
+
+
+class _Core:
+    def __init__(self, num):
+        self.num = num
+        self.resume_us = None     # เวลาเสมือนที่คอร์นี้รอจะทำงานต่อ (None = กำลังทำงานหรือจบแล้ว)
+        self.done = False
+        self.thread = None
+
+
+class Cores:
+    # ตัวจัดลำดับการทำงานของสองคอร์บนบอร์ดหนึ่งตัว ติดตั้งครั้งแรกที่เรียก start_new_thread()
+    def __init__(self, board):
+        self.board = board
+        self.clock = board.clock
+        self._advance = self.clock.advance
+        self.clock.advance = self.advance
+        self.cv = threading.Condition()
+        self.main = _Core(0)
+        self.main.thread = threading.current_thread()
+        self.core1 = None
+        self.running = self.main
+        self.killed = False
+        self.end = None           # SimulationEnd ที่เกิดบนคอร์ 1 (ส่งต่อให้คอร์ 0)
+        self.starts = 0
+
+    def me(self):
+        if self.core1 is not None and threading.current_thread() is self.core1.thread:
+            return self.core1
+        return self.main
+
+    # แทน VirtualClock.advance: เดินเวลาของคอร์ปัจจุบัน สลับคอร์เมื่อเวลาเลยจุดที่อีกคอร์รออยู่
+    def advance(self, dt):
+        if self.killed:
+            raise _Killed()
+        me = self.me()
+        target = self.clock.us + int(dt)
+        while True:
+            other = self.core1 if me is self.main else self.main
+            if other is None or other.done or other.resume_us is None or other.resume_us >= target:
+                self._advance(max(0, target - self.clock.us))
+                return
+            self._advance(max(0, other.resume_us - self.clock.us))
+            me.resume_us = target
+            self._switch(me, other)
+            me.resume_us = None
+            if self.end is not None and me is self.main:
+                raise self.end
+
+    def _switch(self, me, other):
+        with self.cv:
+            self.running = other
+            self.cv.notify_all()
+            while self.running is not me:
+                self.cv.wait()
+        if self.killed:
+            raise _Killed()
+
+    def start(self, fn, args, kwargs):
+        if self.core1 is not None and not self.core1.done:
+            raise OSError(16, "core1 in use")
+        core = self.core1 = _Core(1)
+        core.resume_us = self.clock.us
+        core.thread = threading.Thread(target=self._entry, args=(core, fn, args, kwargs), daemon=True)
+        self.starts += 1
+        core.thread.start()
+        return self.starts
+
+    def _entry(self, core, fn, args, kwargs):
+        with self.cv:
+            while self.running is not core and not self.killed:
+                self.cv.wait()
+        core.resume_us = None
+        try:
+            if not self.killed:
+                fn(*args, **kwargs)
+        except (_Killed, SystemExit):
+            pass
+        except SimulationEnd as e:
+            self.end = e
+        except BaseException as e:
+            # เหมือน MicroPython: พิมพ์ข้อผิดพลาดแล้วจบเฉพาะเธรดนั้น
+            print("Unhandled exception in thread started by", fn)
+            traceback.print_exception(type(e), e, e.__traceback__, file=sys.stdout)
+        finally:
+            core.done = True
+            with self.cv:
+                self.running = self.main
+                self.cv.notify_all()
+
+    # หยุดคอร์ 1 (ถ้ายังทำงานอยู่) และถอดตัวจัดลำดับออกจากนาฬิกา เรียกตอนจบการจำลอง
+    def shutdown(self):
+        core = self.core1
+        if core is not None and not core.done:
+            with self.cv:
+                self.killed = True
+                self.running = core
+                self.cv.notify_all()
+            core.thread.join()
+        self.clock.advance = self._advance
+
+
+def _cores():
+    b = _board.current()
+    cores = getattr(b, "cores", None)
+    if cores is None:
+        cores = b.cores = Cores(b)
+    return cores
+
+
+def shutdown(board):
+    cores = getattr(board, "cores", None)
+    if cores is not None:
+        cores.shutdown()
+        board.cores = None
+
+
+def start_new_thread(function, args, kwargs=None):
+    return _cores().start(function, tuple(args), kwargs or {})
+
+
+def get_ident():
+    cores = getattr(_board.current(), "cores", None)
+    return 1 if cores is None or cores.me() is cores.main else cores.starts + 1
+
+
+def exit():
+    raise SystemExit
+
+
+def stack_size(size=None):
+    return 4096
+
+
+class LockType:
+    def __init__(self):
+        self._held = False
+
+    # ถ้าอีกคอร์ถือล็อกอยู่ วนรอด้วยการเดินเวลา (อีกคอร์จึงได้ทำงานและปล่อยล็อก)
+    def acquire(self, waitflag=1, timeout=-1):
+        b = _board.current()
+        b.spend("lock")
+        if self._held:
+            if not waitflag:
+                return False
+            until = None if timeout < 0 else b.clock.us + timeout * 1000000
+            while self._held:
+                if until is not None and b.clock.us >= until:
+                    return False
+                b.spend("lock", idle=True)
+        self._held = True
+        return True
+
+    def release(self):
+        if not self._held:
+            raise RuntimeError("release unlocked lock")
+        self._held = False
+
+    def locked(self):
+        return self._held
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def allocate_lock():
+    return LockType()
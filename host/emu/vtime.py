@@ -0,0 +1,69 @@
+# โมดูล time จำลองที่อ้างอิงนาฬิกาเสมือนของบอร์ด (ใช้แทน time/utime ของ MicroPython)
+# sleep ไม่ได้รอจริง แต่เลื่อนเวลาเสมือนไปข้างหน้าทันที
+import calendar as _calendar
+import time as _host_time
+
+from . import board as _board
+
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALF = _TICKS_PERIOD // 2
+_EPOCH = 1609459200        # RTC ของ RP2040 เริ่มที่ 2021-01-01 00:00:00
+
+
+def sleep(seconds):
+    _board.current().sleep_us(seconds * 1000000)
+
+
+def sleep_ms(ms):
+    _board.current().sleep_us(ms * 1000)
+
+
+def sleep_us(us):
+    _board.current().sleep_us(us)
+
+
+def _now_us():
+    b = _board.current()
+    b.spend("ticks", idle=True)
+    return b.clock.us
+
+
+def ticks_us():
+    return _now_us() & _TICKS_MAX
+
+
+def ticks_ms():
+    return (_now_us() // 1000) & _TICKS_MAX
+
+
+def ticks_cpu():
+    return ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & _TICKS_MAX
+
+
+def ticks_diff(ticks1, ticks2):
+    return ((ticks1 - ticks2 + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+
+def time():
+    return _EPOCH + _board.current().clock.us // 1000000
+
+
+def time_ns():
+    return (_EPOCH * 1000000 + _board.current().clock.us) * 1000
+
+
+def localtime(secs=None):
+    t = _host_time.gmtime(time() if secs is None else secs)
+    return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, t.tm_wday, t.tm_yday)
+
+
+gmtime = localtime
+
+
+def mktime(t):
+    return _calendar.timegm(tuple(t[:6]) + (0, 0, 0))
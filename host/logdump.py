@@ -0,0 +1,102 @@
+# อ่านไฟล์บันทึกภารกิจ (mission.log) จาก mikrorover.missionlog แล้วพิมพ์สรุป / ส่งออก CSV / แปลงเป็นอาร์เรย์ NumPy
+# ใช้งาน:
+#   mpremote cp :mission.log .                   # ดึงไฟล์จากบอร์ด
+#   python -m host.logdump mission.log           # สรุปแต่ละช่วงการทำงาน (เปิดไฟล์ 1 ครั้ง = 1 ช่วง)
+#   python -m host.logdump mission.log --csv mission.csv
+#
+#   from host.logdump import arrays
+#   a = arrays("mission.log")                    # {"seq": ndarray, "t_ms": ..., "cm": ..., "run": ...}
+#   a["cm"][a["event"] == 3]                     # ระยะตอนเจอสิ่งกีดขวาง
+import argparse
+import struct
+
+MAGIC = b"MRLG"
+HEADER = struct.Struct("<4sBBHII")
+RECORD = struct.Struct("<IIhbbBBBB")      # ตรงกับ lib/mikrorover/missionlog.py
+FIELDS = ("seq", "t_ms", "cm", "left", "right", "sv1", "sv2", "line", "event")
+EVENTS = {0: "", 1: "start", 2: "stop", 3: "obstacle", 4: "key", 5: "pick", 6: "drop", 7: "mark"}
+
+
+# ระเบียนทั้งหมดเรียงตาม seq [(seq, t_ms, cm, left, right, sv1, sv2, line, event), ...]
+# ช่องที่ยังไม่เคยเขียน (seq = 0) ถูกข้าม ลำดับในไฟล์ไม่สำคัญเพราะไฟล์วนเขียนทับ
+def parse(blob):
+    magic, version, size, block, blocks, _ = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("not a mikrorover mission log (bad magic)")
+    if version != 1 or size != RECORD.size:
+        raise ValueError("unsupported mission log version %d (record %d bytes)" % (version, size))
+    out = []
+    for pos in range(RECORD.size, min(len(blob), block * blocks) - RECORD.size + 1, RECORD.size):
+        rec = RECORD.unpack_from(blob, pos)
+        if rec[0]:
+            out.append(rec)
+    out.sort()
+    return out
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return parse(f.read())
+
+
+# แยกช่วงการทำงาน: t_ms ลดลง (เปิดไฟล์ใหม่หลังรีเซ็ต) หรือ seq ขาดช่วง (ถูกเขียนทับ) ถือเป็นช่วงใหม่
+def runs(records):
+    out = []
+    run = 0
+    prev = None
+    for rec in records:
+        if prev is not None and (rec[1] < prev[1] or rec[0] != prev[0] + 1):
+            run += 1
+        out.append(run)
+        prev = rec
+    return out
+
+
+# คอลัมน์ละหนึ่งอาร์เรย์ NumPy พร้อมคอลัมน์ "run" (หมายเลขช่วงการทำงาน)
+def arrays(path):
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("host.logdump.arrays() needs NumPy (pip install numpy); use load() for plain tuples")
+    records = load(path)
+    types = ("u4", "u4", "i2", "i1", "i1", "u1", "u1", "u1", "u1")
+    out = {name: np.array([r[k] for r in records], dtype=types[k]) for k, name in enumerate(FIELDS)}
+    out["run"] = np.array(runs(records), dtype="u2")
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.logdump", description="Read a mikrorover mission log")
+    ap.add_argument("file")
+    ap.add_argument("--csv", metavar="FILE", help="write every record as CSV")
+    args = ap.parse_args(argv)
+
+    records = load(args.file)
+    run_of = runs(records)
+    print("%s: %d records, seq %d-%d" % (args.file, len(records), records[0][0] if records else 0,
+                                        records[-1][0] if records else 0))
+    print("%4s %8s %8s %9s %8s %s" % ("run", "records", "first", "length s", "min cm", "events"))
+    start = 0
+    for i in range(1, len(records) + 1):
+        if i < len(records) and run_of[i] == run_of[start]:
+            continue
+        part = records[start:i]
+        cms = [r[2] for r in part if r[2] >= 0]
+        events = {}
+        for r in part:
+            if r[8]:
+                name = EVENTS.get(r[8], str(r[8]))
+                events[name] = events.get(name, 0) + 1
+        print("%4d %8d %8d %9.1f %8s %s" % (
+            run_of[start], len(part), part[0][0], (part[-1][1] - part[0][1]) / 1000,
+            min(cms) if cms else "-", " ".join("%s=%d" % kv for kv in sorted(events.items()))))
+        start = i
+    if args.csv:
+        with open(args.csv, "w") as f:
+            f.write(",".join(FIELDS + ("run",)) + "\n")
+            for rec, run in zip(records, run_of):
+                f.write(",".join(str(v) for v in rec + (run,)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
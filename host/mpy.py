@@ -0,0 +1,74 @@
+# คอมไพล์ไลบรารี lib/mikrorover เป็น bytecode (.mpy) ด้วย mpy-cross ก่อนคัดลอกขึ้นบอร์ด
+# บอร์ดโหลด .mpy ได้ทันทีโดยไม่ต้องคอมไพล์ .py ทุกครั้งที่บูต (เร็วขึ้นและไม่ต้องใช้ RAM ของตัวคอมไพเลอร์)
+# ฟังก์ชันที่มี @micropython.native ต้องคอมไพล์เป็นโค้ดเครื่องของ RP2040 (Cortex-M0+) จึงใช้ -march=armv6m
+# เวอร์ชันของ mpy-cross ต้องตรงกับเฟิร์มแวร์บนบอร์ด (ดูจาก sys.implementation._mpy บนบอร์ด)
+# ถ้าต้องการให้ไลบรารีอยู่ในเฟิร์มแวร์เลย (frozen, ไม่ใช้ RAM สำหรับ bytecode) ใช้ manifest.py ที่รากของ repo แทน
+#
+#   pip install mpy-cross
+#   python -m host.mpy                     # สร้าง build/lib/mikrorover/*.mpy และพิมพ์ขนาดเทียบกับ .py
+#   mpremote cp -r build/lib/mikrorover :lib/
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+from .emu.runner import LIB_DIR, ROOT
+
+PACKAGE = "mikrorover"
+MARCH = "armv6m"
+
+
+def find_mpy_cross(path=None):
+    exe = path or shutil.which("mpy-cross")
+    if exe:
+        return [exe]
+    try:
+        import mpy_cross  # noqa: F401
+    except ImportError:
+        raise SystemExit("mpy-cross not found: pip install mpy-cross (same version as the board firmware)")
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+# คอมไพล์ทุกไฟล์ในแพ็กเกจ คืนค่า [(ชื่อไฟล์, ไบต์ .py, ไบต์ .mpy), ...]
+def build(out_dir, mpy_cross=None, march=MARCH, opt=None):
+    cmd = find_mpy_cross(mpy_cross)
+    src_dir = os.path.join(LIB_DIR, PACKAGE)
+    dst_dir = os.path.join(out_dir, PACKAGE)
+    os.makedirs(dst_dir, exist_ok=True)
+    out = []
+    for name in sorted(os.listdir(src_dir)):
+        if not name.endswith(".py"):
+            continue
+        src = os.path.join(src_dir, name)
+        dst = os.path.join(dst_dir, name[:-3] + ".mpy")
+        args = cmd + ["-march=" + march, "-s", PACKAGE + "/" + name, "-o", dst]
+        if opt is not None:
+            args.append("-O%d" % opt)
+        res = subprocess.run(args + [src], capture_output=True, text=True)
+        if res.returncode:
+            raise SystemExit("%s: %s" % (name, (res.stderr or res.stdout).strip()))
+        out.append((name, os.path.getsize(src), os.path.getsize(dst)))
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.mpy", description="Compile lib/mikrorover to .mpy with mpy-cross")
+    ap.add_argument("--out", default=os.path.join(ROOT, "build", "lib"), help="output directory (default: build/lib)")
+    ap.add_argument("--mpy-cross", help="path to the mpy-cross executable")
+    ap.add_argument("--march", default=MARCH, help="native code architecture (default: armv6m for RP2040)")
+    ap.add_argument("-O", dest="opt", type=int, help="optimisation level passed to mpy-cross (e.g. 3 drops asserts)")
+    args = ap.parse_args(argv)
+
+    rows = build(args.out, args.mpy_cross, args.march, args.opt)
+    print("%-16s %8s %8s %6s" % ("module", ".py", ".mpy", "ratio"))
+    for name, py, mpy in rows:
+        print("%-16s %8d %8d %5.0f%%" % (name, py, mpy, 100 * mpy / py if py else 0))
+    py = sum(r[1] for r in rows)
+    mpy = sum(r[2] for r in rows)
+    print("%-16s %8d %8d %5.0f%%" % ("total", py, mpy, 100 * mpy / py if py else 0))
+    print("-> %s" % os.path.join(args.out, PACKAGE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# อ่านไฟล์ผลการจับเวลา (prof.bin) จาก mikrorover.prof แล้วพิมพ์ตารางเปอร์เซ็นไทล์
+# ใช้งาน:
+#   mpremote cp :prof.bin .              # ดึงไฟล์จากบอร์ด
+#   python -m host.profdump prof.bin
+#   python -m host.profdump prof.bin --hist track   # ดูฮิสโทแกรมของจุดวัดเดียว
+import argparse
+import struct
+
+MAGIC = b"MRPF"
+PERCENTILES = (50, 90, 99)
+
+
+# เวลาต่ำสุด/สูงสุดของช่องฮิสโทแกรม b (ตรงกับ bucket() ใน lib/mikrorover/prof.py)
+def bucket_range(b):
+    if b < 4:
+        return b, b
+    e = b // 4 + 1
+    lo = (4 + b % 4) << (e - 2)
+    return lo, lo + (1 << (e - 2)) - 1
+
+
+def parse(blob):
+    if blob[:4] != MAGIC:
+        raise ValueError("not a mikrorover profile (bad magic)")
+    version, nslots, nbuckets = struct.unpack_from("<BBB", blob, 4)
+    if version != 1:
+        raise ValueError("unsupported profile version %d" % version)
+    pos = 7
+    slots = []
+    for _ in range(nslots):
+        n = blob[pos]
+        name = blob[pos + 1:pos + 1 + n].decode()
+        pos += 1 + n
+        count, total, peak = struct.unpack_from("<III", blob, pos)
+        pos += 12
+        hist = list(struct.unpack_from("<%dI" % nbuckets, blob, pos))
+        pos += 4 * nbuckets
+        slots.append({"name": name, "count": count, "total_us": total, "max_us": peak, "hist": hist})
+    return slots
+
+
+# เปอร์เซ็นไทล์ p จากฮิสโทแกรม (ประมาณด้วยค่ากลางของช่อง และไม่เกินค่าสูงสุดที่วัดได้)
+def percentile(slot, p):
+    hist = slot["hist"]
+    n = sum(hist)
+    if n == 0:
+        return 0
+    rank = p * n / 100.0
+    seen = 0
+    for b, c in enumerate(hist):
+        seen += c
+        if c and seen >= rank:
+            lo, hi = bucket_range(b)
+            return min((lo + hi) / 2.0, slot["max_us"])
+    return slot["max_us"]
+
+
+def table(slots):
+    head = "%-14s %8s %10s %9s" % ("name", "count", "total ms", "mean us")
+    head += "".join(" %8s" % ("p%d us" % p) for p in PERCENTILES) + " %9s" % "max us"
+    lines = [head, "-" * len(head)]
+    for s in slots:
+        n = s["count"]
+        row = "%-14s %8d %10.1f %9.1f" % (s["name"], n, s["total_us"] / 1000.0, s["total_us"] / n if n else 0)
+        row += "".join(" %8.0f" % percentile(s, p) for p in PERCENTILES) + " %9d" % s["max_us"]
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def histogram(slot, width=40):
+    hist = slot["hist"]
+    top = max(hist) or 1
+    lines = []
+    for b, c in enumerate(hist):
+        if c:
+            lo, hi = bucket_range(b)
+            lines.append("%8d-%-8d %7d %s" % (lo, hi, c, "#" * max(1, c * width // top)))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.profdump", description="Print percentile tables from a mikrorover.prof dump")
+    ap.add_argument("file", help="binary dump written by Profiler.dump()")
+    ap.add_argument("--hist", metavar="NAME", help="also print the histogram of one slot")
+    args = ap.parse_args(argv)
+    with open(args.file, "rb") as f:
+        slots = parse(f.read())
+    print(table(slots))
+    if args.hist:
+        for s in slots:
+            if s["name"] == args.hist:
+                print()
+                print(histogram(s))
+
+
+if __name__ == "__main__":
+    main()
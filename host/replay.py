@@ -0,0 +1,231 @@
+# บันทึก/เล่นซ้ำสัญญาณจอย Wireless-X14 สำหรับวัดความเร็วตัวถอดรหัสและทดสอบถดถอย (regression) ของ Listing 8-x
+# ไฟล์บันทึกมาจาก mikrorover.x14cap.Capture (รันบนบอร์ดจริง หรือบนตัวจำลองด้วยคำสั่ง record)
+# เล่นซ้ำได้ 2 แบบ:
+#   ตามเวลาจริง (ค่าเริ่มต้น) ส่งแต่ละไบต์เข้าสาย UART จำลองตามเวลาที่บันทึก ผ่านโปรแกรม PIO ของ Listing ตามปกติ
+#   --fast       เติม RX FIFO ของ state machine ให้เต็มตลอดเวลา (ไม่รอสาย 9600 baud) จึงวัดได้ว่าลูปถอดรหัส
+#                รับรหัสปุ่มได้กี่รหัสต่อวินาที FIFO ได้คำละ 1 ไบต์ (uart_rx) หรือ 1 เฟรม (uart_rx16) ตามโปรแกรมที่ใช้
+# ทุกการรันพิมพ์ลายนิ้วมือ (digest) ของลำดับคำสั่ง PWM (มอเตอร์และเซอร์โว) เล่นซ้ำกี่ครั้งต้องได้ค่าเดิม
+#
+#   python -m host.replay record x14.cap --ms 5000 --x14 LU@500:1000 --x14 R1@2500:500   # สร้างไฟล์บนตัวจำลอง
+#   python -m host.replay play x14.cap 8-3                  # เล่นซ้ำตามเวลาจริง
+#   python -m host.replay play x14.cap 8-6 --fast --runs 3  # เร็วที่สุด รัน 3 ครั้งแล้วเทียบคำสั่ง PWM
+import argparse
+import hashlib
+import os
+import struct
+import tempfile
+
+from .emu.__main__ import X14_NAMES, _when
+from .emu.board import Board, reverse8
+from .emu.runner import find_listing, run_listing, workdir
+
+# ตรงกับ lib/mikrorover/x14cap.py
+MAGIC = b"X14C"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+RECORD = struct.Struct("<IB")
+WRAP = 1 << 32        # เวลาในระเบียนวนกลับทุก 2^32 us (~71.6 นาที)
+
+PAIR_BITS = 20        # สองไบต์ที่ห่างกันไม่เกินเท่านี้ (เวลาบิต) คือเฟรมเดียวกัน (เหมือน uart_rx16 ที่รอไบต์ต่ำไม่เกิน 8 บิต + เวลาอ่าน FIFO)
+TAIL_MS = 500         # เวลาที่รันต่อหลังส่งข้อมูลหมด (ให้ Listing ปล่อยมอเตอร์เมื่อหมดเวลารอปุ่ม)
+
+
+class Capture:
+    def __init__(self, pin=12, baud=9600, records=None):
+        self.pin = pin
+        self.baud = baud
+        self.records = records or []     # [(เวลา us, ไบต์), ...] ไบต์ตามลำดับบิตของ uart_rx
+
+    def bit_us(self):
+        return 1000000 / self.baud
+
+    # รวมไบต์ที่ติดกันเป็นเฟรม [(เวลา us, รหัส 16 บิต), ...] ไบต์ที่ไม่มีคู่ถูกทิ้งเหมือนที่ uart_rx16 ทำ
+    def frames(self):
+        out = []
+        recs = self.records
+        gap = PAIR_BITS * self.bit_us()
+        i = 0
+        while i + 1 < len(recs):
+            (t0, hi), (t1, lo) = recs[i], recs[i + 1]
+            if t1 - t0 <= gap:
+                out.append((t1, (hi << 8) | lo))
+                i += 2
+            else:
+                i += 1
+        return out
+
+
+def load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError("%s: not an X14 capture" % path)
+    magic, version, pin, _, baud = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("%s: not an X14 capture (version %d)" % (path, VERSION))
+    body = data[HEADER.size:]
+    n = len(body) // RECORD.size
+    # คลายเวลาที่วนกลับเป็นเวลาต่อเนื่อง (ไบต์ที่ติดกันห่างกันไม่เกิน ~71.6 นาที)
+    records = []
+    base = prev = 0
+    for k in range(n):
+        t, b = RECORD.unpack_from(body, k * RECORD.size)
+        if t < prev:
+            base += WRAP
+        prev = t
+        records.append((base + t, b))
+    return Capture(pin, baud, records)
+
+
+def save(path, cap):
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, cap.pin, 0, cap.baud))
+        for t, b in cap.records:
+            f.write(RECORD.pack(int(t) % WRAP, b))
+
+
+class Replayer:
+    # at_ms = เวลาเสมือนที่เริ่มเล่น, sm_id = state machine ที่ Listing ใช้รับจอย (--fast)
+    def __init__(self, cap, board, fast=False, at_ms=0, sm_id=0):
+        self.cap = cap
+        self.board = board
+        self.fast = fast
+        self.at_us = at_ms * 1000
+        self.sm_id = sm_id
+        self.codes = 0            # จำนวนรหัสปุ่ม (เฟรม) ที่ส่งเข้าไป
+        self.t_first = None       # เวลาที่เติม FIFO ครั้งแรก / CPU อ่าน FIFO หมดหลังข้อมูลหมด (--fast)
+        self.t_done = None
+        self._words = None
+        self._i = 0
+        self._irq = False
+
+    def attach(self):
+        b = self.board
+        if self.fast:
+            b.rx_feeds[self.sm_id] = self._fill
+            return
+        bits = 10 * self.cap.bit_us()
+        for t, byte in self.cap.records:
+            # เวลาในไฟล์คือตอนอ่านไบต์ได้ (หลัง stop bit) จึงเริ่มส่งก่อนหน้านั้น 1 ไบต์
+            b.send_byte(reverse8(byte), (self.at_us + max(0, t - bits)) / 1000, self.cap.pin, self.cap.baud)
+        self.codes = len(self.cap.frames())
+
+    def _prepare(self, sm):
+        if sm._cfg["push_thresh"] >= 16:
+            self._words = [code for _, code in self.cap.frames()]
+            self.codes = len(self._words)
+        else:
+            self._words = [b for _, b in self.cap.records]
+            self.codes = len(self.cap.frames())
+        self._irq = any(ins.op == "irq" for ins in sm._prog.instrs)
+
+    def _fill(self, sm):
+        b = self.board
+        now = b.clock.us
+        if now < self.at_us or self.t_done is not None:
+            return
+        if self._words is None:
+            self._prepare(sm)
+            self.t_first = now
+        words = self._words
+        while len(sm._rx) < sm._rx_depth and self._i < len(words):
+            sm._rx.append(words[self._i])
+            self._i += 1
+            b.counters["pio_push"] += 1
+            if self._irq:
+                sm._irq_pending += 1
+        if self._i >= len(words) and not sm._rx:
+            self.t_done = now
+            b.clock.deadline_us = min(b.clock.deadline_us or now + TAIL_MS * 1000, now + TAIL_MS * 1000)
+
+    # รหัสปุ่มต่อวินาทีที่ลูปถอดรหัสรับได้ (--fast เท่านั้น)
+    def rate(self):
+        if self.t_done is None or self.t_done <= self.t_first:
+            return None
+        return self.codes * 1e6 / (self.t_done - self.t_first)
+
+
+# ลายนิ้วมือของลำดับคำสั่ง PWM ที่เปลี่ยนค่า (เวลา, ขา, duty) ของทั้งการรัน
+def pwm_digest(board):
+    h = hashlib.sha1()
+    n = 0
+    for t, kind, key, value in board.trace:
+        if kind == "pwm":
+            h.update(("%d %s %s\n" % (t, key, value)).encode())
+            n += 1
+    return h.hexdigest()[:12], n
+
+
+def play(cap, listing, fast=False, ms=None, at_ms=0, sm_id=0):
+    if ms is None:
+        last = cap.records[-1][0] / 1000 if cap.records else 0
+        ms = (60000 if fast else at_ms + last) + TAIL_MS
+    board = Board(ms)
+    rep = Replayer(cap, board, fast, at_ms, sm_id)
+    rep.attach()
+    run_listing(listing, board, None, quiet=True)
+    return board, rep
+
+
+def record(path, presses, ms, pin=12, baud=9600):
+    board = Board(ms)
+    for name, at, hold in presses:
+        board.x14(X14_NAMES[name] if name in X14_NAMES else int(name, 0), at, hold, pin_id=pin)
+    path = os.path.abspath(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, "capture.py")
+        with open(script, "w") as f:
+            f.write("from mikrorover.x14cap import Capture\n"
+                    "Capture(%r, %d, %d).run(%d)\n" % (path, pin, baud, ms - 50))
+        run_listing(script, board, None)
+    return load(path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.replay", description="Record and replay Wireless-X14 byte streams")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record", help="capture simulated button presses with mikrorover.x14cap")
+    rec.add_argument("file")
+    rec.add_argument("--x14", action="append", default=[], metavar="BUTTON@MS[:HOLD]")
+    rec.add_argument("--ms", type=float, default=5000)
+    pl = sub.add_parser("play", help="replay a capture into a listing")
+    pl.add_argument("file")
+    pl.add_argument("listing", help="listing number (e.g. 8-3) or path")
+    pl.add_argument("--fast", action="store_true", help="keep the RX FIFO full instead of following the timestamps")
+    pl.add_argument("--runs", type=int, default=1, help="replay several times and check the PWM commands match")
+    pl.add_argument("--ms", type=float, help="virtual run time (default: length of the capture)")
+    pl.add_argument("--at", type=float, default=0, help="virtual time (ms) to start replaying")
+    pl.add_argument("--sm", type=int, default=0, help="state machine receiving the remote (--fast)")
+    pl.add_argument("--workdir", help="directory for files the listing writes (default: a temporary directory)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "record":
+        cap = record(args.file, [_when(s, 0) for s in args.x14], args.ms)
+        print("%s: %d bytes, %d frames" % (args.file, len(cap.records), len(cap.frames())))
+        return
+
+    cap = load(args.file)
+    path = find_listing(args.listing)
+    print("%s: %d bytes, %d frames, %.1f s -> %s (%s)" % (
+        args.file, len(cap.records), len(cap.frames()), cap.records[-1][0] / 1e6 if cap.records else 0,
+        os.path.basename(path), "fast" if args.fast else "real time"))
+    digests = set()
+    for k in range(args.runs):
+        with workdir(args.workdir):
+            board, rep = play(cap, path, args.fast, args.ms, args.at, args.sm)
+        digest, n = pwm_digest(board)
+        digests.add(digest)
+        line = "run %d: %s %.1f ms, codes=%d pwm changes=%d digest=%s" % (
+            k + 1, board.outcome, board.clock.us / 1000, rep.codes, n, digest)
+        rate = rep.rate()
+        if rate is not None:
+            line += " | %.0f codes/s, fifo reads=%d" % (rate, board.counters["fifo"])
+        print(line)
+    if args.runs > 1:
+        print("deterministic" if len(digests) == 1 else "MISMATCH: %d different PWM sequences" % len(digests))
+        if len(digests) != 1:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
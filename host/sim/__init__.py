@@ -0,0 +1,8 @@
+# ตัวจำลองสนาม 2 มิติของ mikroRover: ต่อบอร์ดจำลอง (host/emu) เข้ากับการเคลื่อนที่ของหุ่น เซนเซอร์เส้น และเซนเซอร์ระยะ
+# ใช้งาน:  python -m host.sim oval --ms 30000 --map
+from .rover import RoverModel, Sim
+from .scenes import SCENES, scene
+from .trial import run_trial, summary
+from .world import Box, Circle, Segment, Track, World
+
+__all__ = ["Box", "Circle", "RoverModel", "SCENES", "Segment", "Sim", "Track", "World", "run_trial", "scene", "summary"]
@@ -0,0 +1,47 @@
+# รันภารกิจบนสนามจำลองจากบรรทัดคำสั่ง
+# ตัวอย่าง:
+#   python -m host.sim oval --ms 30000 --map           # Listing 6-1 บนสนามวงรี แสดงเส้นทางที่วิ่ง
+#   python -m host.sim avoid --ms 20000                # Listing 5-3 หลบสิ่งกีดขวาง
+#   python -m host.sim pick --ms 60000 --pgm pick.pgm  # Listing 7-4 บันทึกภาพเส้นทาง
+#   python -m host.sim oval --trials 200               # รันซ้ำหลายครั้ง วัดความเร็วการจำลอง
+import argparse
+import json
+import time
+
+from .scenes import SCENES
+from .trial import run_trial, summary
+from .view import ascii_map, write_pgm
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.sim", description="Run a listing on the simulated 2D arena")
+    ap.add_argument("scene", choices=sorted(SCENES), help="arena to run")
+    ap.add_argument("--listing", help="listing to run instead of the scene's default")
+    ap.add_argument("--ms", type=float, default=30000, help="virtual run time in ms (default 30000)")
+    ap.add_argument("--trials", type=int, default=1, help="repeat the run N times and report throughput")
+    ap.add_argument("--map", action="store_true", help="print the arena and the driven path")
+    ap.add_argument("--pgm", metavar="FILE", help="write the arena and path as a PGM image")
+    ap.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    for _ in range(args.trials):
+        sim, board = run_trial(args.scene, args.listing, args.ms)
+    wall = time.perf_counter() - t0
+    s = summary(sim, board)
+    if args.json:
+        print(json.dumps(s, indent=1))
+    else:
+        for k, v in s.items():
+            print("%-12s: %s" % (k, v))
+    if args.trials > 1:
+        print("trials      : %d in %.2f s (%.1f ms/trial, x%.0f real time)" % (
+            args.trials, wall, wall * 1000 / args.trials, args.trials * args.ms / 1000 / wall))
+    if args.map:
+        print(ascii_map(sim.world, sim))
+    if args.pgm:
+        write_pgm(args.pgm, sim.world, sim)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# แบบจำลองการเคลื่อนที่ของ mikroRover บนโลก 2 มิติ ต่อเข้ากับบอร์ดจำลอง (host/emu)
+# - อ่าน duty ของ PWM ขา 14/13 (ล้อซ้าย เดินหน้า/ถอยหลัง) และ 17/16 (ล้อขวา) แปลงเป็นความเร็วล้อ
+#   (มีช่วงตาย deadband และความหน่วงของมอเตอร์แบบอันดับหนึ่ง) แล้วอินทิเกรตตำแหน่งแบบขับเคลื่อนสองล้อ
+# - เซนเซอร์เส้นขา 10/11 อ่านสีพื้นจาก bitmap ของสนาม ส่งกลับเข้าบอร์ดด้วย Pin.drive() (จึงเกิด IRQ เหมือนของจริง)
+# - เซนเซอร์ระยะ ADC ขา 27 ยิงรังสีหาสิ่งกีดขวาง แล้วแปลงเป็นค่า ADC ด้วยสูตรเดียวกับ Listing (ซม. = ค่า // 640)
+# ตำแหน่งอัปเดตทุกครั้งที่นาฬิกาเสมือนเดิน (แบ่งช่วงยาวเป็นขั้นย่อย) จึงเร็วกว่าเวลาจริงหลายสิบเท่าเหมือนตัวจำลองบอร์ด
+#
+#   board = Board(30000)
+#   sim = Sim(board, world, pose=(300, 200, 0))
+#   run_listing("6-1", board)
+#   sim.x, sim.y, sim.heading, sim.gates["lap"], sim.collisions
+import math
+
+from host.emu.board import MODE_OUT
+
+CM_DIV = 640            # ตรงกับ mikrorover.sonar.CM_DIV
+
+
+class RoverModel:
+    # ค่าทางกายภาพของหุ่น (มม., วินาที) ปรับได้ตามหุ่นจริง
+    def __init__(self, track_mm=130, v_max=700, tau_s=0.06, deadband=0.25,
+                 line_ahead=70, line_gap=40, sonar_ahead=80, sonar_beam_deg=20,
+                 sonar_max_mm=1000, radius=60, lost_mm=60):
+        self.track_mm = track_mm             # ระยะห่างระหว่างล้อซ้าย-ขวา
+        self.v_max = v_max                   # ความเร็วล้อที่ duty 100% (มม./วินาที)
+        self.tau_s = tau_s                   # ค่าคงที่เวลาของมอเตอร์ (ความหน่วงในการเร่ง/ลด)
+        self.deadband = deadband             # duty ต่ำกว่านี้ล้อไม่หมุน (สัดส่วน 0-1)
+        self.line_ahead = line_ahead         # เซนเซอร์เส้นอยู่หน้าแกนล้อ
+        self.line_gap = line_gap             # ระยะห่างเซนเซอร์ซ้าย-ขวา
+        self.sonar_ahead = sonar_ahead
+        self.sonar_beam_deg = sonar_beam_deg # มุมกรวยของคลื่นเสียง (ยิง 3 รังสี ซ้าย/กลาง/ขวา)
+        self.sonar_max_mm = sonar_max_mm     # ไกลกว่านี้อ่านได้ค่าสูงสุด
+        self.radius = radius                 # รัศมีตัวหุ่น (ใช้ตรวจการชน)
+        self.lost_mm = lost_mm               # ไม่มีเส้นดำในระยะนี้รอบเซนเซอร์ = หลุดจากเส้น
+
+    # duty (-1 ถึง 1) -> ความเร็วล้อเป้าหมาย (มม./วินาที)
+    def wheel(self, duty):
+        a = abs(duty)
+        if a <= self.deadband:
+            return 0.0
+        v = (a - self.deadband) / (1 - self.deadband) * self.v_max
+        return v if duty > 0 else -v
+
+
+class Sim:
+    # board = host.emu.Board, world = World, pose = (x มม., y มม., มุมหัน เรเดียน)
+    # step_us = ช่วงอินทิเกรตสูงสุด, left/right = (ขาเดินหน้า, ขาถอยหลัง) ตรงกับ DriveTrain
+    # min_us = ช่วงเวลาสั้นที่สุดที่จะอินทิเกรต (การเรียกฮาร์ดแวร์ทีละไม่กี่ us จะสะสมไว้ก่อน ไม่คำนวณทุกครั้ง)
+    def __init__(self, board, world, pose=(0, 0, 0), model=None, step_us=2000, min_us=500,
+                 line_pins=(10, 11), sonar_gpio=27, left=(14, 13), right=(17, 16), path_us=20000):
+        self.board = board
+        self.world = world
+        self.model = model or RoverModel()
+        self.x, self.y, self.heading = pose
+        self.vl = 0.0                      # ความเร็วล้อจริงตอนนี้ (มม./วินาที)
+        self.vr = 0.0
+        self.odometer = 0.0                # ระยะทางที่วิ่งไปแล้ว (มม.)
+        self.collisions = 0                # จำนวนครั้งที่ชนสิ่งกีดขวาง
+        self.stuck = False                 # กำลังชนอยู่ (หุ่นไม่เคลื่อนที่จนกว่าจะถอยออก)
+        self.losses = 0                    # จำนวนครั้งที่หลุดจากเส้น (ตรวจทุก path_us เมื่อสนามมีเส้น)
+        self.lost_ms = 0.0                 # เวลารวมที่อยู่นอกเส้น
+        self._lost = False
+        self.gates = {name: [] for name in world.gates}   # เวลา (ms) ที่วิ่งผ่านแต่ละ gate
+        self.path = [(0, self.x, self.y)]  # (ms, x, y) ทุก path_us
+        self.step_us = step_us
+        self.min_us = min_us
+        self._path_us = path_us
+        self._next_path = path_us
+        self._left = left
+        self._right = right
+        self._line_pins = line_pins
+        self._t = board.clock.us
+        self._levels = [None, None]
+        self._duties = None
+        self._targets = (0.0, 0.0)
+        board.clock.listeners.append(self._advance)
+        if sonar_gpio is not None:
+            board.set_adc(sonar_gpio, self._sonar_adc)
+        self._sense()
+
+    # --- อินทิเกรตการเคลื่อนที่ตามเวลาเสมือน ---
+    def _duty(self, pins):
+        pwm = self.board.pwm
+        fwd = pwm.get(pins[0])
+        rev = pwm.get(pins[1])
+        return ((fwd.duty_u16 if fwd else 0) - (rev.duty_u16 if rev else 0)) / 65535
+
+    def _advance(self, t0, t1):
+        t = self._t
+        if t1 - t < self.min_us:
+            return
+        step = self.step_us
+        while t < t1:
+            dt = min(step, t1 - t)
+            self._integrate(dt / 1e6)
+            t += dt
+            self._t = t
+            if t >= self._next_path:
+                self.path.append((t / 1000, self.x, self.y))
+                self._next_path += self._path_us
+                self._check_line()
+            self._sense()
+
+    def _integrate(self, dt):
+        m = self.model
+        duties = (self._duty(self._left), self._duty(self._right))
+        if duties != self._duties:           # แปลง duty เป็นความเร็วเฉพาะเมื่อ PWM เปลี่ยน
+            self._duties = duties
+            self._targets = (m.wheel(duties[0]), m.wheel(duties[1]))
+        tl, tr = self._targets
+        k = dt / m.tau_s if m.tau_s > 0 else 1
+        if k > 1:
+            k = 1
+        self.vl += (tl - self.vl) * k
+        self.vr += (tr - self.vr) * k
+        v = (self.vl + self.vr) / 2
+        w = (self.vr - self.vl) / m.track_mm
+        h = self.heading + w * dt / 2
+        nx = self.x + v * dt * math.cos(h)
+        ny = self.y + v * dt * math.sin(h)
+        self.heading = (self.heading + w * dt) % (2 * math.pi)
+        # ชนสิ่งกีดขวาง: หมุนอยู่กับที่ได้ แต่เคลื่อนเข้าหาสิ่งกีดขวางไม่ได้
+        clear = self.world.clearance(nx, ny)
+        if clear < m.radius and clear < self.world.clearance(self.x, self.y):
+            if not self.stuck:
+                self.collisions += 1
+                self.stuck = True
+            return
+        self.stuck = clear < m.radius
+        for name, gate in self.world.gates.items():
+            if _crosses(gate, self.x, self.y, nx, ny):
+                self.gates[name].append(self._t / 1000)
+        self.odometer += math.hypot(nx - self.x, ny - self.y)
+        self.x = nx
+        self.y = ny
+
+    # --- เซนเซอร์ ---
+    # ตำแหน่งจุดที่อยู่หน้าแกนล้อ ahead มม. และเยื้องซ้าย side มม.
+    def _point(self, ahead, side):
+        c = math.cos(self.heading)
+        s = math.sin(self.heading)
+        return self.x + ahead * c - side * s, self.y + ahead * s + side * c
+
+    def line_points(self):
+        m = self.model
+        return self._point(m.line_ahead, m.line_gap / 2), self._point(m.line_ahead, -m.line_gap / 2)
+
+    # อ่านเซนเซอร์เส้น (1 = ขาว, 0 = ดำ) แล้วป้อนเข้าขาเมื่อค่าเปลี่ยน (เรียก IRQ ของ Pin ตามขอบสัญญาณ)
+    def _sense(self):
+        board = self.board
+        for k, (px, py) in enumerate(self.line_points()):
+            level = 0 if self.world.black(px, py) else 1
+            if level != self._levels[k]:
+                self._levels[k] = level
+                pin = board.pin(self._line_pins[k])
+                if pin.mode == MODE_OUT:
+                    continue
+                # ป้อนค่าผ่านคิวเหตุการณ์ของนาฬิกา ให้ IRQ ทำงานนอกการเดินเวลาที่กำลังดำเนินอยู่
+                board.clock.at_us(self._t, lambda p=pin, v=level: p.drive(v))
+
+    def _check_line(self):
+        track = self.world.track
+        if track is None:
+            return
+        m = self.model
+        x, y = self._point(m.line_ahead, 0)
+        lost = not track.near(x, y, m.lost_mm)
+        if lost:
+            if not self._lost:
+                self.losses += 1
+            self.lost_ms += self._path_us / 1000
+        self._lost = lost
+
+    # ระยะที่เซนเซอร์ ZX-SONAR1M เห็น (มม.) None = ไม่มีสิ่งกีดขวางในระยะ
+    def sonar_mm(self):
+        m = self.model
+        x, y = self._point(m.sonar_ahead, 0)
+        half = math.radians(m.sonar_beam_deg) / 2
+        best = None
+        for a in (-half, 0, half):
+            d = self.world.ray(x, y, self.heading + a, m.sonar_max_mm)
+            if d is not None and (best is None or d < best):
+                best = d
+        return best
+
+    def _sonar_adc(self, t_us):
+        d = self.sonar_mm()
+        if d is None:
+            return 65535
+        return int(d / 10) * CM_DIV + CM_DIV // 2
+
+    @property
+    def pose(self):
+        return self.x, self.y, self.heading
+
+
+# ส่วนของเส้นทาง (x0, y0)-(x1, y1) ตัดผ่าน gate (Segment) หรือไม่
+def _crosses(gate, x0, y0, x1, y1):
+    def side(ax, ay, bx, by, px, py):
+        return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+    d0 = side(gate.x0, gate.y0, gate.x1, gate.y1, x0, y0)
+    d1 = side(gate.x0, gate.y0, gate.x1, gate.y1, x1, y1)
+    if d0 == 0 or (d0 > 0) == (d1 > 0):
+        return False
+    e0 = side(x0, y0, x1, y1, gate.x0, gate.y0)
+    e1 = side(x0, y0, x1, y1, gate.x1, gate.y1)
+    return (e0 > 0) != (e1 > 0)
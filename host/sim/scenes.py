@@ -0,0 +1,58 @@
+# สนามทดสอบสำเร็จรูปสำหรับภารกิจในหนังสือ
+# แต่ละ scene คืน (World, ตำแหน่งเริ่มต้น, Listing ที่ใช้ทดสอบ, ฟังก์ชันสัญญาณกระตุ้นของบอร์ด)
+#   oval   สนามวงรีปิดพร้อม gate จับเวลารอบ (Listing 6-1)
+#   avoid  ทางตรงในกำแพงปิด มีสิ่งกีดขวางกลางทาง (Listing 5-3)
+#   slalom เหมือน avoid แต่มีสิ่งกีดขวางตัวที่สองขวางทางหลบของตัวแรก (ต้องตรวจระยะระหว่างหลบด้วย)
+#   pick   เส้นทางหยิบ-วางกระป๋องแบบทางแยกรูปตัว T (Listing 7-4)
+import math
+
+from .world import Box, Circle, Segment, Track, World
+
+_cache = {}
+
+
+def _start(board):
+    board.press(8, 100, 50)               # SW1 เริ่มงาน
+
+
+def oval():
+    track = Track(2000, 1400)
+    track.oval(200, 200, 1600, 1000, 350)
+    gates = {"lap": Segment(1000, 120, 1000, 280)}
+    return World(track, gates=gates), (700, 200, 0.0), "6-1", _start
+
+
+def avoid():
+    obstacles = [Box(0, 0, 3000, 1200), Circle(1500, 600, 35)]
+    gates = {"finish": Segment(2700, 0, 2700, 1200)}
+    return World(None, obstacles, gates), (200, 600, 0.0), "5-3", _start
+
+
+def slalom():
+    obstacles = [Box(0, 0, 3000, 1200), Circle(1200, 600, 35), Circle(1350, 490, 35)]
+    gates = {"finish": Segment(2700, 0, 2700, 1200)}
+    return World(None, obstacles, gates), (200, 600, 0.0), "5-3", _start
+
+
+# เส้นหลักจากจุดวาง (ล่าง) ขึ้นไปถึงทางแยก J แล้วแยกซ้ายไปจุดหยิบ (ปลายซ้าย) ทางแยกเป็นสี่แยกสั้น ๆ
+# ให้เซนเซอร์ทั้งสองตัวเห็นดำพร้อมกัน (เส้นตัด) ทั้งขาไปและขากลับ จุดหยิบ/จุดวางมีแถบขวางเป็นเส้นตัด
+def pick():
+    track = Track(2000, 1400)
+    jx, jy = 1000, 900
+    track.line(jx, 200, jx, jy + 100)            # เส้นหลัก (ยื่นเลยทางแยกขึ้นไป 10 ซม.)
+    track.line(250, jy, jx + 100, jy)            # ทางแยกซ้ายไปจุดหยิบ (ยื่นเลยทางแยกไปทางขวา 10 ซม.)
+    track.rect(230, jy - 60, 250, jy + 60)       # จุดหยิบ
+    track.rect(jx - 60, 240, jx + 60, 260)       # จุดวาง
+    gates = {"pick": Segment(330, jy - 100, 330, jy + 100), "drop": Segment(jx - 100, 330, jx + 100, 330)}
+    return World(track, gates=gates), (jx, 300, math.pi / 2), "7-4", _start
+
+
+SCENES = {"oval": oval, "avoid": avoid, "slalom": slalom, "pick": pick}
+
+
+# สร้าง scene ครั้งเดียวต่อ process (การวาด bitmap ของสนามใช้เวลามากกว่าการรันหนึ่งครั้ง)
+def scene(name):
+    s = _cache.get(name)
+    if s is None:
+        s = _cache[name] = SCENES[name]()
+    return s
@@ -0,0 +1,36 @@
+# รันภารกิจ 1 ครั้งบนสนามจำลอง แล้วสรุปผลเป็น dict (ใช้ซ้ำได้หลายพันครั้งจากสคริปต์ทดสอบ/ปรับค่า)
+#
+#   sim, board = run_trial("oval", ms=30000)
+#   summary(sim, board)["laps_ms"]
+from host.emu.board import Board
+from host.emu.runner import run_listing
+
+from .rover import Sim
+from .scenes import scene
+
+
+# name = ชื่อ scene, listing = Listing ที่จะรัน (None = ตามที่ scene กำหนด)
+# init_globals = ตัวแปรที่ใส่ให้ Listing ก่อนรัน, model = RoverModel (None = ค่าเริ่มต้น)
+def run_trial(name, listing=None, ms=30000, model=None, init_globals=None, max_idle_us=2000):
+    world, pose, key, stimulus = scene(name)
+    board = Board(ms, max_idle_us=max_idle_us)
+    stimulus(board)
+    sim = Sim(board, world, pose, model)
+    run_listing(listing or key, board, None, quiet=True, init_globals=init_globals)
+    return sim, board
+
+
+def summary(sim, board):
+    laps = sim.gates.get("lap", [])
+    return {
+        "outcome": board.outcome,
+        "virtual_ms": round(board.clock.us / 1000, 1),
+        "wall_s": round(board.wall_s, 3),
+        "pose": [round(sim.x, 1), round(sim.y, 1), round(sim.heading, 3)],
+        "odometer_mm": round(sim.odometer, 1),
+        "collisions": sim.collisions,
+        "line_losses": sim.losses,
+        "lost_ms": round(sim.lost_ms, 1),
+        "gates_ms": {name: [round(t, 1) for t in ts] for name, ts in sim.gates.items()},
+        "laps_ms": [round(b - a, 1) for a, b in zip(laps, laps[1:])],
+    }
@@ -0,0 +1,62 @@
+# แสดงสนามและเส้นทางที่หุ่นวิ่ง: แผนที่ตัวอักษรบนเทอร์มินัล หรือไฟล์ภาพ PGM
+#   #  เส้นดำบนพื้น     O  สิ่งกีดขวาง     .  เส้นทางที่วิ่ง     S  จุดเริ่ม     @  ตำแหน่งสุดท้าย
+import math
+
+_SUB = (-1 / 3, 0, 1 / 3)      # จุดสุ่มอ่านสีพื้นในแต่ละช่อง (เส้นแคบกว่าช่องจะได้ไม่หายจากแผนที่)
+
+
+def _grid(world, sim, cols, rows, width, height):
+    sx = width / cols
+    sy = height / rows
+    grid = [[" "] * cols for _ in range(rows)]
+    for r in range(rows):
+        y = height - (r + 0.5) * sy
+        for c in range(cols):
+            x = (c + 0.5) * sx
+            if world.clearance(x, y) < max(sx, sy) / 2:
+                grid[r][c] = "O"
+            elif any(world.black(x + fx * sx, y + fy * sy) for fx in _SUB for fy in _SUB):
+                grid[r][c] = "#"
+
+    def put(x, y, ch):
+        c = int(x / sx)
+        r = int((height - y) / sy)
+        if 0 <= c < cols and 0 <= r < rows:
+            grid[r][c] = ch
+    for _, x, y in sim.path:
+        put(x, y, ".")
+    put(sim.path[0][1], sim.path[0][2], "S")
+    put(sim.x, sim.y, "@")
+    return grid
+
+
+def _extent(world, sim):
+    if world.track is not None:
+        return world.track.width, world.track.height
+    xs = [p[1] for p in sim.path]
+    ys = [p[2] for p in sim.path]
+    w = max(xs) + 200
+    h = max(ys) + 200
+    for ob in world.obstacles:
+        w = max(w, getattr(ob, "x1", 0))
+        h = max(h, getattr(ob, "y1", 0))
+    return w, h
+
+
+def ascii_map(world, sim, cols=100):
+    width, height = _extent(world, sim)
+    rows = max(1, int(cols * height / width / 2))     # ตัวอักษรสูงประมาณ 2 เท่าของความกว้าง
+    return "\n".join("".join(row) for row in _grid(world, sim, cols, rows, width, height))
+
+
+# ภาพสีเทา: พื้นขาว, เส้นดำ, สิ่งกีดขวางเทาเข้ม, เส้นทางเทากลาง
+def write_pgm(path, world, sim, px_mm=5):
+    width, height = _extent(world, sim)
+    cols = int(math.ceil(width / px_mm))
+    rows = int(math.ceil(height / px_mm))
+    shade = {" ": 255, "#": 0, "O": 64, ".": 160, "S": 100, "@": 100}
+    grid = _grid(world, sim, cols, rows, width, height)
+    with open(path, "wb") as f:
+        f.write(b"P5\n%d %d\n255\n" % (cols, rows))
+        for row in grid:
+            f.write(bytes(shade[ch] for ch in row))
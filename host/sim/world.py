@@ -0,0 +1,255 @@
+# โลกจำลอง 2 มิติของหุ่นยนต์: สนามเส้น (bitmap), สิ่งกีดขวาง และเส้นเวลา (gate) สำหรับจับเวลารอบ
+# หน่วยเป็นมิลลิเมตร แกน x ไปทางขวา แกน y ขึ้นบน มุม 0 = หันไปทาง +x (เรเดียน ทวนเข็มนาฬิกา)
+#
+#   track = Track(2000, 1500)              # พื้นขาวขนาด 2 x 1.5 เมตร ความละเอียด 2 มม./พิกเซล
+#   track.line(200, 200, 1800, 200)        # วาดเส้นดำกว้าง 20 มม.
+#   track.arc(1000, 750, 500, 0, math.pi)  # ส่วนโค้ง
+#   world = World(track, [Circle(1000, 900, 60), Box(0, 0, 2000, 1500)])
+#   world.ray(x, y, angle)                 # ระยะถึงสิ่งกีดขวางที่ใกล้ที่สุดตามแนวรังสี (มม.)
+import math
+
+LINE_WIDTH = 20     # ความกว้างเทปดำมาตรฐาน (มม.)
+
+
+class Track:
+    # พื้นสนามเป็น bitmap: 1 = เส้นดำ, 0 = พื้นขาว (ตรงกับเซนเซอร์ ZX-03 ที่อ่านได้ 0 บนเส้นดำ)
+    def __init__(self, width, height, res=2):
+        self.width = width
+        self.height = height
+        self.res = res
+        self.cols = int(math.ceil(width / res))
+        self.rows = int(math.ceil(height / res))
+        self.bits = bytearray(self.cols * self.rows)
+
+    # อ่านสีพื้นที่ตำแหน่ง (x, y): 1 = ดำ (นอกสนามถือเป็นขาว)
+    def black(self, x, y):
+        c = int(x / self.res)
+        r = int(y / self.res)
+        if 0 <= c < self.cols and 0 <= r < self.rows:
+            return self.bits[r * self.cols + c]
+        return 0
+
+    # มีเส้นดำในกรอบสี่เหลี่ยมรอบ (x, y) ระยะ r หรือไม่ (ใช้ตรวจว่าหุ่นหลุดจากเส้น)
+    def near(self, x, y, r):
+        res = self.res
+        c0 = max(0, int((x - r) / res))
+        c1 = min(self.cols, int((x + r) / res) + 1)
+        r0 = max(0, int((y - r) / res))
+        r1 = min(self.rows - 1, int((y + r) / res))
+        if c0 >= c1:
+            return False
+        bits = self.bits
+        for row in range(r0, r1 + 1):
+            base = row * self.cols
+            if 1 in bits[base + c0:base + c1]:
+                return True
+        return False
+
+    # ระบายพิกเซลทุกจุดในกรอบ (x0, y0)-(x1, y1) ที่ inside(x, y) เป็นจริง
+    def _fill(self, x0, y0, x1, y1, inside, value=1):
+        res = self.res
+        c0 = max(0, int(x0 / res))
+        c1 = min(self.cols - 1, int(x1 / res))
+        r0 = max(0, int(y0 / res))
+        r1 = min(self.rows - 1, int(y1 / res))
+        bits = self.bits
+        for r in range(r0, r1 + 1):
+            y = (r + 0.5) * res
+            base = r * self.cols
+            for c in range(c0, c1 + 1):
+                if inside((c + 0.5) * res, y):
+                    bits[base + c] = value
+
+    # เส้นตรงหนา width จาก (x0, y0) ถึง (x1, y1) ปลายมน
+    def line(self, x0, y0, x1, y1, width=LINE_WIDTH):
+        h = width / 2
+        dx = x1 - x0
+        dy = y1 - y0
+        n2 = dx * dx + dy * dy or 1e-9
+
+        def inside(x, y):
+            t = ((x - x0) * dx + (y - y0) * dy) / n2
+            t = 0 if t < 0 else 1 if t > 1 else t
+            ex = x - (x0 + t * dx)
+            ey = y - (y0 + t * dy)
+            return ex * ex + ey * ey <= h * h
+        self._fill(min(x0, x1) - h, min(y0, y1) - h, max(x0, x1) + h, max(y0, y1) + h, inside)
+
+    # เส้นต่อกันผ่านจุด points [(x, y), ...]
+    def polyline(self, points, width=LINE_WIDTH, closed=False):
+        pts = list(points)
+        if closed:
+            pts.append(pts[0])
+        for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+            self.line(x0, y0, x1, y1, width)
+
+    # ส่วนโค้งรัศมี r รอบจุด (cx, cy) จากมุม a0 ถึง a1 (เรเดียน ทวนเข็มนาฬิกา)
+    def arc(self, cx, cy, r, a0, a1, width=LINE_WIDTH):
+        h = width / 2
+        span = (a1 - a0) % (2 * math.pi) or 2 * math.pi
+
+        def inside(x, y):
+            dx = x - cx
+            dy = y - cy
+            d = math.hypot(dx, dy)
+            if abs(d - r) > h:
+                return False
+            return (math.atan2(dy, dx) - a0) % (2 * math.pi) <= span
+        self._fill(cx - r - h, cy - r - h, cx + r + h, cy + r + h, inside)
+
+    # สี่เหลี่ยมทึบ (เช่น จุดจอด/แถบเส้นตัด)
+    def rect(self, x0, y0, x1, y1, value=1):
+        self._fill(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1), lambda x, y: True, value)
+
+    # สนามวงรีปิด (สี่เหลี่ยมมุมโค้ง) ขนาด w x h มุมโค้งรัศมี r วางที่มุมล่างซ้าย (x, y)
+    def oval(self, x, y, w, h, r, width=LINE_WIDTH):
+        self.line(x + r, y, x + w - r, y, width)
+        self.line(x + r, y + h, x + w - r, y + h, width)
+        self.line(x, y + r, x, y + h - r, width)
+        self.line(x + w, y + r, x + w, y + h - r, width)
+        self.arc(x + w - r, y + r, r, -math.pi / 2, 0, width)
+        self.arc(x + w - r, y + h - r, r, 0, math.pi / 2, width)
+        self.arc(x + r, y + h - r, r, math.pi / 2, math.pi, width)
+        self.arc(x + r, y + r, r, math.pi, 3 * math.pi / 2, width)
+
+    # อ่านภาพ PBM (P1 ข้อความ / P4 ไบนารี) 1 พิกเซล = res มม. แถวบนสุดของภาพคือขอบบนของสนาม
+    @classmethod
+    def load_pbm(cls, path, res=2):
+        with open(path, "rb") as f:
+            data = f.read()
+        tokens = []
+        pos = 0
+        while len(tokens) < 3:
+            while data[pos:pos + 1].isspace():
+                pos += 1
+            if data[pos:pos + 1] == b"#":
+                pos = data.index(b"\n", pos)
+                continue
+            end = pos
+            while not data[end:end + 1].isspace():
+                end += 1
+            tokens.append(data[pos:end])
+            pos = end
+        magic, cols, rows = tokens[0], int(tokens[1]), int(tokens[2])
+        track = cls(cols * res, rows * res, res)
+        if magic == b"P4":
+            pos += 1
+            stride = (cols + 7) // 8
+            for r in range(rows):
+                row = data[pos + r * stride:pos + (r + 1) * stride]
+                base = (rows - 1 - r) * track.cols
+                for c in range(cols):
+                    track.bits[base + c] = (row[c >> 3] >> (7 - (c & 7))) & 1
+        elif magic == b"P1":
+            px = [ch - 48 for ch in data[pos:] if ch in b"01"]
+            for r in range(rows):
+                base = (rows - 1 - r) * track.cols
+                track.bits[base:base + cols] = bytes(px[r * cols:(r + 1) * cols])
+        else:
+            raise ValueError("not a PBM file: %r" % magic)
+        return track
+
+
+# --- สิ่งกีดขวาง: ทุกชนิดมี ray(x, y, dx, dy) คืนระยะตามแนวรังสี (None = ไม่ชน) และ dist(x, y) ระยะจากจุดถึงผิว ---
+class Circle:
+    def __init__(self, x, y, r):
+        self.x = x
+        self.y = y
+        self.r = r
+
+    def ray(self, x, y, dx, dy):
+        ox = x - self.x
+        oy = y - self.y
+        b = ox * dx + oy * dy
+        c = ox * ox + oy * oy - self.r * self.r
+        disc = b * b - c
+        if disc < 0:
+            return None
+        s = math.sqrt(disc)
+        t = -b - s
+        if t < 0:
+            t = -b + s
+        return t if t >= 0 else None
+
+    def dist(self, x, y):
+        return math.hypot(x - self.x, y - self.y) - self.r
+
+
+class Segment:
+    def __init__(self, x0, y0, x1, y1):
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+
+    def ray(self, x, y, dx, dy):
+        ex = self.x1 - self.x0
+        ey = self.y1 - self.y0
+        den = dx * ey - dy * ex
+        if den == 0:
+            return None
+        wx = self.x0 - x
+        wy = self.y0 - y
+        t = (wx * ey - wy * ex) / den
+        u = (wx * dy - wy * dx) / den
+        if t >= 0 and 0 <= u <= 1:
+            return t
+        return None
+
+    def dist(self, x, y):
+        ex = self.x1 - self.x0
+        ey = self.y1 - self.y0
+        n2 = ex * ex + ey * ey or 1e-9
+        t = ((x - self.x0) * ex + (y - self.y0) * ey) / n2
+        t = 0 if t < 0 else 1 if t > 1 else t
+        return math.hypot(x - (self.x0 + t * ex), y - (self.y0 + t * ey))
+
+
+class Box:
+    # กล่อง/ผนังสี่เหลี่ยม (x0, y0)-(x1, y1) ใช้เป็นกำแพงรอบสนามได้ (รังสีจากด้านในชนผนังด้านใน)
+    def __init__(self, x0, y0, x1, y1):
+        self.x0, self.x1 = min(x0, x1), max(x0, x1)
+        self.y0, self.y1 = min(y0, y1), max(y0, y1)
+        self.sides = (
+            Segment(self.x0, self.y0, self.x1, self.y0), Segment(self.x1, self.y0, self.x1, self.y1),
+            Segment(self.x1, self.y1, self.x0, self.y1), Segment(self.x0, self.y1, self.x0, self.y0),
+        )
+
+    def ray(self, x, y, dx, dy):
+        best = None
+        for s in self.sides:
+            t = s.ray(x, y, dx, dy)
+            if t is not None and (best is None or t < best):
+                best = t
+        return best
+
+    def dist(self, x, y):
+        return min(s.dist(x, y) for s in self.sides)
+
+
+class World:
+    # track = Track (None = พื้นขาวทั้งหมด), obstacles = สิ่งกีดขวาง, gates = {ชื่อ: Segment} สำหรับจับเวลาเมื่อหุ่นวิ่งผ่าน
+    def __init__(self, track=None, obstacles=(), gates=None):
+        self.track = track
+        self.obstacles = list(obstacles)
+        self.gates = dict(gates or {})
+
+    def black(self, x, y):
+        return self.track.black(x, y) if self.track is not None else 0
+
+    # ระยะถึงสิ่งกีดขวางที่ใกล้ที่สุดตามรังสีจาก (x, y) ทิศ angle (None = ไม่ชนภายในระยะ max_mm)
+    def ray(self, x, y, angle, max_mm=None):
+        dx = math.cos(angle)
+        dy = math.sin(angle)
+        best = max_mm
+        for ob in self.obstacles:
+            t = ob.ray(x, y, dx, dy)
+            if t is not None and (best is None or t < best):
+                best = t
+        return best if best != max_mm else None
+
+    # ระยะจากจุดถึงผิวสิ่งกีดขวางที่ใกล้ที่สุด (ใช้ตรวจการชน)
+    def clearance(self, x, y):
+        if not self.obstacles:
+            return float("inf")
+        return min(ob.dist(x, y) for ob in self.obstacles)
@@ -0,0 +1,220 @@
+# ปรับค่าคงที่ของภารกิจอัตโนมัติบนสนามจำลอง (host/sim) ด้วยการรันซ้ำหลายครั้งแบบขนานบนทุกคอร์
+# ค่าคงที่ที่ปรับได้คือตัวแปรตัวพิมพ์ใหญ่ระดับบนสุดของ Listing (เช่น SPEED = 50, KP = 20)
+# แต่ละการรันแก้ค่าในซอร์สด้วย ast (ไม่แตะไฟล์ต้นฉบับ) แล้วให้คะแนนตามเวลาที่ทำภารกิจสำเร็จ
+# บวกค่าปรับเมื่อชนสิ่งกีดขวางหรือหลุดจากเส้น (คะแนนต่ำ = ดี, ภารกิจไม่สำเร็จ = FAIL)
+#
+#   python -m host.tune oval -p BASE_SPEED=60:90:10 -p KP=10,15,20,30 -p KD=0:0.3:0.1      # ค้นหาแบบตาราง (grid)
+#   python -m host.tune avoid -p SPEED=30:80 -p STOP_CM=10:30 -p TURN_MS=200:600 --random 300
+#   python -m host.tune pick -p NUDGE_MS=50:300:50 -p TURN_MS=300:700:100 --jobs 4 --out tune.json
+import argparse
+import ast
+import itertools
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .emu.runner import find_listing
+from .sim.scenes import scene
+from .sim.trial import run_trial, summary
+
+COLLISION_PENALTY_MS = 5000     # ค่าปรับต่อการชน 1 ครั้ง
+LOSS_PENALTY_MS = 2000          # ค่าปรับต่อการหลุดจากเส้น 1 ครั้ง
+FAIL = float("inf")
+
+# เวลาจำลองของแต่ละ scene (ms) เมื่อไม่ได้กำหนด --ms
+DEFAULT_MS = {"oval": 40000, "avoid": 30000, "slalom": 30000, "pick": 40000}
+
+
+# --- เวลาที่ภารกิจสำเร็จของแต่ละ scene (None = ไม่สำเร็จ) ---
+def _done_oval(sim, board):
+    laps = sim.gates.get("lap", [])
+    return laps[2] if len(laps) >= 3 else None           # ครบ 2 รอบเต็ม
+
+
+def _done_avoid(sim, board):
+    finish = sim.gates.get("finish", [])
+    return finish[0] if finish else None
+
+
+def _done_pick(sim, board):
+    pick = sim.gates.get("pick", [])
+    drop = [t for t in sim.gates.get("drop", []) if pick and t > pick[0]]
+    if board.outcome != "finished" or not drop:
+        return None
+    return board.clock.us / 1000
+
+
+DONE = {"oval": _done_oval, "avoid": _done_avoid, "slalom": _done_avoid, "pick": _done_pick}
+
+
+def score(name, sim, board):
+    t = DONE[name](sim, board)
+    if t is None:
+        return FAIL
+    return t + COLLISION_PENALTY_MS * sim.collisions + LOSS_PENALTY_MS * sim.losses
+
+
+# --- แก้ค่าคงที่ในซอร์ส ---
+# แทนค่าของ NAME = ... ระดับบนสุดของโมดูลทุกที่ที่ชื่ออยู่ใน params ชื่อที่ไม่มีใน Listing ถือเป็นข้อผิดพลาด
+def rewrite(source, params, filename="<listing>"):
+    tree = ast.parse(source, filename)
+    found = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in params:
+                node.value = ast.copy_location(ast.Constant(params[name]), node.value)
+                found.add(name)
+    missing = set(params) - found
+    if missing:
+        raise KeyError("%s: no top-level assignment to %s" % (filename, ", ".join(sorted(missing))))
+    return ast.unparse(tree)
+
+
+# ค่าคงที่ตัวพิมพ์ใหญ่ระดับบนสุดที่เป็นตัวเลข {ชื่อ: ค่า}
+def constants(source):
+    out = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name.isupper() and isinstance(node.value, ast.Constant) and isinstance(node.value.value, (int, float)) \
+                    and not isinstance(node.value.value, bool):
+                out[name] = node.value.value
+    return out
+
+
+# --- รัน 1 ครั้ง (ทำงานใน process ลูก) ---
+def trial(job):
+    name, path, params, ms = job
+    with open(path, encoding="utf-8") as f:
+        src = rewrite(f.read(), params, path)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = os.path.join(tmp, os.path.basename(path))
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(src)
+        cwd = os.getcwd()
+        os.chdir(tmp)                      # ไฟล์ที่ Listing เขียน (เช่น prof.bin) ไม่ปนกับโฟลเดอร์งาน
+        try:
+            sim, board = run_trial(name, tmp_path, ms)
+        finally:
+            os.chdir(cwd)
+    result = summary(sim, board)
+    result["params"] = params
+    result["score"] = score(name, sim, board)
+    return result
+
+
+# --- ช่วงค่าที่จะค้นหา ---
+def _number(text):
+    v = float(text)
+    return int(v) if v.is_integer() and "." not in text else v
+
+
+# "NAME=a,b,c" (รายการ) หรือ "NAME=lo:hi[:step]" (ช่วง ถ้าไม่กำหนด step: จำนวนเต็มทีละ 1 หรือทศนิยม 5 ค่า)
+def parse_param(spec):
+    name, _, rng = spec.partition("=")
+    if not name or not rng:
+        raise ValueError("bad parameter spec %r (want NAME=a,b,c or NAME=lo:hi[:step])" % spec)
+    if ":" not in rng:
+        return name, [_number(v) for v in rng.split(",")]
+    parts = [_number(v) for v in rng.split(":")]
+    lo, hi = parts[0], parts[1]
+    if len(parts) > 2:
+        step = parts[2]
+    elif isinstance(lo, int) and isinstance(hi, int):
+        step = 1
+    else:
+        step = (hi - lo) / 4
+    values = []
+    k = 0
+    while lo + k * step <= hi + 1e-9:
+        v = lo + k * step
+        values.append(round(v, 6) if isinstance(v, float) else v)
+        k += 1
+    return name, values
+
+
+def grid(space):
+    names = list(space)
+    for combo in itertools.product(*(space[n] for n in names)):
+        yield dict(zip(names, combo))
+
+
+def sample(space, n, seed=1):
+    rnd = random.Random(seed)
+    seen = set()
+    size = 1
+    for values in space.values():
+        size *= len(values)
+    n = min(n, size)
+    while len(seen) < n:
+        p = tuple((k, rnd.choice(v)) for k, v in space.items())
+        if p not in seen:
+            seen.add(p)
+            yield dict(p)
+
+
+def _fmt(r):
+    s = r["score"]
+    return "%9s  col=%-2d lost=%-2d  %s" % (
+        "FAIL" if s == FAIL else "%.0f" % s, r["collisions"], r["line_losses"],
+        " ".join("%s=%s" % kv for kv in r["params"].items()))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m host.tune", description="Tune listing constants on the simulated arena")
+    ap.add_argument("scene", choices=sorted(DONE), help="arena (and its default listing)")
+    ap.add_argument("-p", "--param", action="append", default=[], metavar="NAME=SPEC",
+                    help="constant to search: NAME=a,b,c or NAME=lo:hi[:step]")
+    ap.add_argument("--listing", help="listing to tune instead of the scene's default")
+    ap.add_argument("--random", type=int, metavar="N", help="random search of N points instead of the full grid")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--ms", type=float, help="virtual run time per trial")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    ap.add_argument("--top", type=int, default=5, help="how many best parameter sets to print")
+    ap.add_argument("--out", metavar="FILE", help="write every result as JSON")
+    args = ap.parse_args(argv)
+
+    path = find_listing(args.listing or scene(args.scene)[2])
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+    space = dict(parse_param(p) for p in args.param)
+    if not space:
+        print("tunable constants in %s:" % os.path.basename(path))
+        for k, v in constants(src).items():
+            print("  %s = %s" % (k, v))
+        return
+    rewrite(src, {k: v[0] for k, v in space.items()}, path)    # ตรวจชื่อก่อนเริ่ม
+    points = list(sample(space, args.random, args.seed) if args.random else grid(space))
+    ms = args.ms or DEFAULT_MS[args.scene]
+    jobs = [(args.scene, path, p, ms) for p in points]
+    base = constants(src)
+    jobs.insert(0, (args.scene, path, {k: base[k] for k in space if k in base}, ms))   # ค่าเดิมใน Listing
+
+    print("%d trials on %d workers (%s, %.0f ms each)" % (len(jobs), args.jobs, args.scene, ms))
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(trial, jobs, chunksize=max(1, len(jobs) // (args.jobs * 4))))
+    baseline = results[0]
+    ranked = sorted(results[1:], key=lambda r: r["score"])
+
+    print("baseline  %s" % _fmt(baseline))
+    print("best:")
+    for r in ranked[:args.top]:
+        print("          %s" % _fmt(r))
+    ok = sum(1 for r in ranked if r["score"] != FAIL)
+    print("%d/%d trials completed the mission" % (ok, len(ranked)))
+    if ranked and ranked[0]["score"] != FAIL:
+        # ค่าที่แนะนำเท่านั้น ไม่แก้ไฟล์ Listing (ค่าจากสนามจำลองควรลองบนหุ่นจริงก่อนคัดลอกไปใช้)
+        print("\n# suggested values for %s (not written to the listing)" % os.path.basename(path))
+        for k, v in ranked[0]["params"].items():
+            print("%s = %s" % (k, v))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"scene": args.scene, "listing": path, "ms": ms, "baseline": baseline, "results": ranked},
+                      f, indent=1, default=lambda x: None)
+
+
+if __name__ == "__main__":
+    main()
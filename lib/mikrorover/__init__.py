@@ -0,0 +1,2 @@
+# ไลบรารีกลางของหุ่นยนต์ mikroRover (KidMotor V4i / RP2040)
+# คัดลอกโฟลเดอร์ lib/mikrorover ไปไว้ที่ /lib/mikrorover บนบอร์ด แล้วเรียกใช้ด้วย from mikrorover.xxx import ...
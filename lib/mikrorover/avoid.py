@@ -0,0 +1,161 @@
+# หลบสิ่งกีดขวางแบบไม่บล็อก (state machine) แทนลำดับ sr/fd/sl + time.sleep_ms ที่หยุดอ่านเซนเซอร์ระหว่างหลบ
+# step() ถูกเรียกทุกรอบของลูปหลัก (เช่นทุก 5 ms): อ่านระยะทุกครั้ง สลับท่าเมื่อครบเวลา และคืนชื่อท่าปัจจุบัน
+# ระหว่างท่าเดินหน้า (ทั้งตอนวิ่งปกติและระหว่างหลบ) ถ้าเจอสิ่งกีดขวางใหม่จะยกเลิกท่านั้นแล้ววางแผนหลบใหม่จากตำแหน่งปัจจุบัน
+# นับทิศที่หมุนไปแล้ว (ทีละ 90 องศา) ท้ายแผนจึงหมุนกลับทิศเดิมได้เสมอ แม้ถูกยกเลิกกลางทาง
+# บันทึกเวลาตอบสนอง (reaction time) ตั้งแต่ Sonar อ่านค่าที่ใกล้เกินกำหนดจนถึงคำสั่งหยุดมอเตอร์
+#
+#   avoid = Avoider(motors, sonar, speed=50, stop_cm=17)
+#   avoid.start()                       # เริ่มเดินหน้า
+#   while True:
+#       phase = avoid.step()            # "cruise", "stop", "right", "forward", "left"
+#       time.sleep_ms(5)
+#   avoid.report()                      # จำนวนครั้งที่เจอ/วางแผนใหม่ และเวลาตอบสนอง
+import time
+from array import array
+
+# คำสั่งของแต่ละท่า
+STOP = 0
+FWD = 1
+RIGHT = 2
+LEFT = 3
+NAMES = ("stop", "forward", "right", "left")
+
+# ช่วงเดินหน้าของการหลบ: ออกด้านข้าง, ผ่านสิ่งกีดขวาง, กลับเข้าทางหลัก
+OUT = 1
+PASS = 2
+IN = 3
+
+_REACT_N = 16    # จำนวนเวลาตอบสนองล่าสุดที่เก็บไว้
+
+
+class Avoider:
+    # ค่าเวลา (ms) ตรงกับขั้นตอนเดิมใน Listing 5-3: หยุดรอ, หมุน 90 องศา, ออกด้านข้าง, ผ่านสิ่งกีดขวาง, หยุดพักระหว่างท่า
+    # prof = Profiler สำหรับเก็บฮิสโทแกรมเวลาตอบสนอง (ไม่บังคับ)
+    def __init__(self, motors, sonar, speed=50, stop_cm=17, settle_ms=500, turn_ms=400, side_ms=500,
+                 pass_ms=600, pause_ms=200, prof=None):
+        self.motors = motors
+        self.sonar = sonar
+        self.speed = speed
+        self.stop_cm = stop_cm
+        self.settle_ms = settle_ms
+        self.turn_ms = turn_ms
+        self.side_ms = side_ms
+        self.pass_ms = pass_ms
+        self.pause_ms = pause_ms
+        self.prof = prof
+        self._slot = prof.slot("react") if prof is not None else -1
+        self.detections = 0       # เจอสิ่งกีดขวางระหว่างวิ่งปกติ
+        self.replans = 0          # เจอสิ่งกีดขวางใหม่ระหว่างหลบ (ยกเลิกท่าแล้ววางแผนใหม่)
+        self.react = array("L", [0]) * _REACT_N   # เวลาตอบสนองล่าสุด (us) แบบวงแหวน
+        self.react_max = 0
+        self._plan = []           # [(คำสั่ง, ms, ช่วง), ...] ท่าที่เหลือ
+        self._i = 0
+        self._cmd = FWD
+        self._leg = 0             # ช่วงของการหลบที่กำลังเดินหน้าอยู่ (OUT / PASS / IN)
+        self._until = 0
+        self._timed = False       # ท่าปัจจุบันมีกำหนดเวลาจบ (วิ่งปกติไม่มี)
+        self._quarter = 0         # ทิศปัจจุบันเทียบกับทิศเดิม (หน่วย 90 องศา ทวนเข็มนาฬิกา = บวก)
+
+    def phase(self):
+        if not self._timed:
+            return "cruise"
+        return NAMES[self._cmd]
+
+    def avoiding(self):
+        return self._timed
+
+    def start(self):
+        self._plan = []
+        self._i = 0
+        self._quarter = 0
+        self._cruise()
+
+    # ลำดับท่าหลบ (เหมือน Listing 5-3 เดิม): เลี้ยวขวาออก เดินหน้า เลี้ยวซ้ายขนาน ผ่านสิ่งกีดขวาง เลี้ยวซ้ายกลับ เดินหน้า
+    # แล้วตั้งลำกลับทิศเดิมใน _next() (ถ้าเริ่มหลบจากทิศเดิมคือเลี้ยวขวา 1 ครั้งเหมือนเดิม)
+    def _detour(self):
+        t = self.turn_ms
+        return self._moves(((RIGHT, t, 0), (FWD, self.side_ms, OUT), (LEFT, t, 0), (FWD, self.pass_ms, PASS),
+                            (LEFT, t, 0), (FWD, self.side_ms, IN)))
+
+    # เจอสิ่งกีดขวางตอนกำลังกลับเข้าทางหลัก (มักเป็นตัวเดิมที่ยังผ่านไม่พ้น): หันขนานไปต่ออีกช่วงแล้วค่อยกลับเข้า
+    def _extend(self):
+        t = self.turn_ms
+        return self._moves(((RIGHT, t, 0), (FWD, self.pass_ms, PASS), (LEFT, t, 0), (FWD, self.side_ms, IN)))
+
+    def _moves(self, moves):
+        plan = [(STOP, self.settle_ms, 0)]
+        for m in moves:
+            plan.append(m)
+            if self.pause_ms:
+                plan.append((STOP, self.pause_ms, 0))
+        return plan
+
+    def _cruise(self):
+        self._cmd = FWD
+        self._leg = 0
+        self._timed = False
+        self.motors.fd(self.speed)
+
+    def _apply(self, cmd, ms, leg, now):
+        m = self.motors
+        if cmd == STOP:
+            m.ao()
+        elif cmd == FWD:
+            m.fd(self.speed)
+        elif cmd == RIGHT:
+            m.sr(self.speed)
+            self._quarter -= 1
+        else:
+            m.sl(self.speed)
+            self._quarter += 1
+        self._cmd = cmd
+        self._leg = leg
+        self._timed = True
+        self._until = time.ticks_add(now, ms)
+
+    # เริ่มท่าถัดไปในแผน หมดแผนแล้วหมุนกลับทิศเดิม (ถ้ายังเอียงอยู่) ก่อนกลับไปวิ่งปกติ
+    def _next(self, now):
+        if self._i >= len(self._plan) and self._quarter:
+            turn = LEFT if self._quarter < 0 else RIGHT
+            self._plan = []
+            for _ in range(abs(self._quarter)):
+                self._plan.append((turn, self.turn_ms, 0))
+                if self.pause_ms:
+                    self._plan.append((STOP, self.pause_ms, 0))
+            self._i = 0
+        if self._i >= len(self._plan):
+            self._cruise()
+            return
+        cmd, ms, leg = self._plan[self._i]
+        self._i += 1
+        self._apply(cmd, ms, leg, now)
+
+    def _log(self, us):
+        self.react[(self.detections + self.replans) % _REACT_N] = us
+        if us > self.react_max:
+            self.react_max = us
+        if self._slot >= 0:
+            self.prof.record(self._slot, us)
+
+    def step(self):
+        sonar = self.sonar
+        now = time.ticks_ms()
+        if self._cmd == FWD and sonar.samples and sonar.cm < self.stop_cm:
+            self.motors.ao()
+            self._log(time.ticks_diff(time.ticks_us(), sonar.t_us))
+            if self._timed:
+                self.replans += 1
+            else:
+                self.detections += 1
+            self._plan = self._extend() if self._leg == IN else self._detour()
+            self._i = 0
+            self._next(now)
+        elif self._timed and time.ticks_diff(now, self._until) >= 0:
+            self._next(now)
+        return self.phase()
+
+    def report(self):
+        n = min(self.detections + self.replans, _REACT_N)
+        avg = sum(self.react[k] for k in range(n)) // n if n else 0
+        print("avoid: detections=%d replans=%d react avg=%d max=%d us" % (
+            self.detections, self.replans, avg, self.react_max))
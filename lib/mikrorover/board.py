@@ -0,0 +1,62 @@
+# ขาและค่าคงที่ของบอร์ด KidMotor V4i (RP2040) ที่ทุกโมดูลและทุก Listing ใช้ร่วมกัน (แก้ที่นี่ที่เดียว)
+# พร้อมตัวช่วยตั้งค่าที่เคยเขียนซ้ำในทุก Listing: จอ OLED, ปุ่ม SW1/SW2, รอกดปุ่มเริ่มงาน
+# ready() พิมพ์เวลาตั้งแต่บอร์ดเริ่มทำงานจนโปรแกรมพร้อม และหน่วยความจำที่เหลือหลัง import ทั้งหมด
+# ใช้เทียบผลของการติดตั้งไลบรารีเป็น bytecode (.mpy หรือ frozen ในเฟิร์มแวร์) กับการคอมไพล์ .py บนบอร์ดทุกครั้งที่บูต
+#
+#   from mikrorover.board import SW1, oled, button, wait_press, ready
+#   display = oled()
+#   start = button(SW1)
+#   ready("Object detection")       # Ready! Object detection (boot 412 ms, free 151232 bytes)
+#   wait_press(start)
+import gc
+import time
+from machine import I2C, Pin
+from micropython import const
+
+# --- จอ OLED (I2C0) ---
+SDA = const(4)
+SCL = const(5)
+I2C_FREQ = const(400000)
+OLED_ADDR = const(0x3C)
+
+# --- ปุ่มกด (Pull-up: กด = 0) ---
+SW1 = const(8)
+SW2 = const(9)
+
+# --- เซนเซอร์ ---
+LINE_L = const(10)
+LINE_R = const(11)
+SONAR = const(27)          # ZX-SONAR1M ที่ ADC แชนเนล 1
+
+# --- ตัวรับจอย Wireless-X14 (D3) ---
+X14_RX = const(12)
+X14_BAUD = const(9600)
+
+# --- มอเตอร์ (ขาเดินหน้า, ขาถอยหลัง) และเซอร์โว ---
+MOTOR_L = (14, 13)
+MOTOR_R = (17, 16)
+MOTOR_HZ = const(1000)
+SERVO1 = const(18)
+SERVO2 = const(19)
+SERVO_HZ = const(50)
+
+
+def oled():
+    from mikrorover.oled import OLED
+    return OLED(128, 64, I2C(0, sda=Pin(SDA), scl=Pin(SCL), freq=I2C_FREQ), addr=OLED_ADDR)
+
+
+def button(pin=SW1):
+    return Pin(pin, Pin.IN, Pin.PULL_UP)
+
+
+# รอจนกว่าจะกดปุ่ม (ค่าเป็น 0)
+def wait_press(btn, poll_ms=10):
+    while btn.value() == 1:
+        time.sleep_ms(poll_ms)
+
+
+# พิมพ์ข้อความพร้อมทำงาน เวลาตั้งแต่บูต (ticks_ms เริ่มนับที่ 0 ตอนบูต) และหน่วยความจำว่างหลังเก็บขยะ
+def ready(name=""):
+    gc.collect()
+    print("Ready! %s (boot %d ms, free %d bytes)" % (name, time.ticks_ms(), gc.mem_free()))
@@ -0,0 +1,153 @@
+# หน้าจอแสดงข้อมูล (Telemetry dashboard) ที่แยกออกจากลูปควบคุม
+# ลูปควบคุมแค่ post() ค่าใหม่ แล้วเรียก service() ทุกรอบ
+# service() วาดใหม่เฉพาะแถวที่ค่าเปลี่ยน ไม่เกิน max_fps ครั้งต่อวินาที และส่งภาพทีละ page ต่อการเรียก 1 ครั้ง
+# ทำให้การตรวจเซนเซอร์ไม่ต้องรอการส่งภาพทั้งจอ
+# รูปแบบที่มี "%d" หรือ "%s" ตัวเดียวถูกแยกเป็นป้าย (sprite) ข้อความหน้า/หลังครั้งแรกที่ใช้ แล้ววาดทีละส่วน:
+# ป้ายและข้อความ str ที่เคยแสดงแล้วคัดลอกจากแคช ตัวเลขประกอบจากแคชตัวเลข (mikrorover.sprites)
+# การวาดแถวจึงไม่สร้าง str ใหม่และไม่วาดฟอนต์ซ้ำ (รูปแบบอื่นใช้ fmt % value กับ text() ตามเดิม)
+#
+#   dash = Dashboard(display, max_fps=10)
+#   status = dash.row(10)                   # แถวข้อความที่ y=10
+#   dist = dash.row(25, "Dist: %d cm")      # แถวตัวเลขที่ y=25
+#   dash.post(dist, distance)               # ในลูป: ส่งค่า (ยังไม่วาด)
+#   dash.service()                          # ในลูป: วาด/ส่งภาพเมื่อถึงเวลา
+import time
+
+from mikrorover.sprites import digits, label
+from mikrorover.textbuf import CHARS, TextBuf
+
+_ROW_H = 8   # ความสูงตัวอักษร (พิกเซล)
+
+
+class Dashboard:
+    def __init__(self, display, max_fps=10, x=0):
+        self.display = display
+        self.x = x
+        self.period_ms = 1000 // max_fps
+        self.frames = 0                          # จำนวนเฟรมที่วาดไปแล้ว
+        self._ys = []
+        self._fmt = []
+        self._value = []
+        self._shown = []                         # ค่าและรูปแบบที่วาดอยู่บนจอตอนนี้
+        self._shown_fmt = []
+        self._parts = {}                         # รูปแบบ -> (ป้ายหน้า, ชนิด "d"/"s", ป้ายหลัง)
+        self._labels = {}                        # ข้อความ str -> ป้าย (sprite)
+        self._num = TextBuf(12)
+        self._glyphs = digits()
+        self._pages = 0                          # บิต page ที่วาดแล้วแต่ยังไม่ได้ส่งไปจอ
+        self._fresh = True                       # เฟรมแรกล้างทั้งจอ
+        self._last = time.ticks_add(time.ticks_ms(), -self.period_ms)
+        self._per_page = hasattr(display, "show_page")
+
+    # เพิ่มแถวที่ตำแหน่ง y คืนค่าหมายเลขแถวไว้ใช้กับ post()
+    def row(self, y, fmt="%s"):
+        self._ys.append(y)
+        self._fmt.append(fmt)
+        self._value.append(None)
+        self._shown.append(None)
+        self._shown_fmt.append(None)
+        return len(self._ys) - 1
+
+    # ส่งค่าใหม่ให้แถว (เปลี่ยนรูปแบบได้ด้วย fmt) ค่าจะถูกจัดรูปแบบตอนวาดเท่านั้น
+    def post(self, row, value, fmt=None):
+        self._value[row] = value
+        if fmt is not None:
+            self._fmt[row] = fmt
+
+    # เรียกทุกรอบของลูปควบคุม ใช้เวลาไม่เกินการส่งภาพ 1 page ต่อครั้ง
+    def service(self):
+        if self._pages:
+            self._flush_one()
+            return
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._last) < self.period_ms:
+            return
+        if self._draw():
+            self._last = now
+            self.frames += 1
+            self._flush_one()
+
+    # วาดและส่งภาพที่ค้างอยู่ทั้งหมดทันที (ใช้ตอนหุ่นยนต์หยุดแล้ว เช่นแสดงข้อความเตือน)
+    def flush(self):
+        self._draw()
+        while self._pages:
+            self._flush_one()
+
+    def _draw(self):
+        d = self.display
+        if self._fresh:
+            d.fill(0)
+            self._pages = (1 << (d.height // 8)) - 1
+            self._fresh = False
+        for i in range(len(self._ys)):
+            v = self._value[i]
+            if v is None:
+                continue
+            f = self._fmt[i]
+            if self._shown_fmt[i] == f and self._shown[i] == v:
+                continue
+            y = self._ys[i]
+            x = self._text(f, v, y)
+            if x < d.width:
+                d.fill_rect(x, y, d.width - x, _ROW_H, 0)   # ล้างส่วนที่เหลือของแถว (ป้ายวาดทับพื้นหลังเองแล้ว)
+            self._shown[i] = v
+            self._shown_fmt[i] = f
+            self._pages |= (1 << (y // 8)) | (1 << ((y + _ROW_H - 1) // 8))
+        return self._pages != 0
+
+    # วาดค่าของแถว คืนค่าตำแหน่ง x ที่วาดถึง
+    def _text(self, f, v, y):
+        d = self.display
+        parts = self._parts.get(f)
+        if parts is None:
+            parts = self._parts[f] = _split(f)
+        pre, kind, post = parts
+        x = self.x
+        if kind is None or not isinstance(v, str if kind == "s" else int):
+            d.fill_rect(0, y, d.width, _ROW_H, 0)
+            d.text(f % v, x, y, 1)
+            return d.width
+        if pre is not None:
+            x += pre.draw(d, x, y)
+        if kind == "s":
+            sp = self._labels.get(v)
+            if sp is None:
+                sp = self._labels[v] = label(v)
+            x += sp.draw(d, x, y)
+        else:
+            t = self._num
+            t.clear()
+            t.num(v)
+            for k in range(t.n):
+                b = t.buf[k]
+                if not self._glyphs.draw(d, b, x, y):
+                    d.fill_rect(x, y, 8, _ROW_H, 0)
+                    d.text(CHARS[b - 32], x, y, 1)
+                x += 8
+        if post is not None:
+            x += post.draw(d, x, y)
+        return x
+
+    def _flush_one(self):
+        if not self._per_page:
+            self.display.show()
+            self._pages = 0
+            return
+        p = self._pages
+        page = 0
+        while not p & 1:
+            p >>= 1
+            page += 1
+        self._pages &= ~(1 << page)
+        self.display.show_page(page)
+
+
+# แยกรูปแบบที่มี %d หรือ %s ตัวเดียว (ไม่มี % อื่น) เป็น (ป้ายหน้า, ชนิด, ป้ายหลัง) ข้อความว่างได้ป้าย None
+def _split(fmt):
+    for kind in ("d", "s"):
+        k = fmt.find("%" + kind)
+        if k >= 0 and fmt.count("%") == 1:
+            pre = fmt[:k]
+            post = fmt[k + 2:]
+            return label(pre) if pre else None, kind, label(post) if post else None
+    return None, None, None
@@ -0,0 +1,95 @@
+# ชุดขับเคลื่อนล้อ (DriveTrain) ที่ใช้ร่วมกันทุก Listing
+# - แปลงความเร็ว 0-100% เป็น duty_u16 ด้วยตารางที่คำนวณไว้ล่วงหน้า (ไม่มีการหารทศนิยมตอนสั่งงาน)
+# - กำหนดขั้วของแต่ละล้อได้ด้วยลำดับขา (ขาเดินหน้า, ขาถอยหลัง)
+# - จำค่า duty ล่าสุดของแต่ละขา ถ้าสั่งค่าเดิมซ้ำจะไม่เขียนรีจิสเตอร์ PWM อีก
+#
+#   motors = DriveTrain()
+#   motors.fd(50)            # เดินหน้า 50%
+#   motors.drive(40, -40)    # กำหนดความเร็วล้อซ้าย/ขวาแบบมีเครื่องหมาย (ลบ = ถอยหลัง)
+from machine import Pin, PWM
+from mikrorover.board import MOTOR_L, MOTOR_R, MOTOR_HZ
+
+# ตาราง 0-100% -> duty_u16 (0-65535)
+_DUTY = tuple(s * 65535 // 100 for s in range(101))
+
+# ขาของ KidMotor V4i: เดินหน้า = PWM ที่ขา 14 (ซ้าย) และ 17 (ขวา), ถอยหลัง = 13 และ 16 (mikrorover.board)
+LEFT = MOTOR_L
+RIGHT = MOTOR_R
+
+
+# ความเร็ว 0-100 -> duty_u16 (ค่านอกช่วงถูกจำกัดไว้ที่ 0 หรือ 100)
+def duty(speed):
+    if speed <= 0:
+        return 0
+    if speed >= 100:
+        return 65535
+    return _DUTY[int(speed)]
+
+
+# ความเร็วของคำสั่งทิศทาง: ค่าติดลบเป็น 0
+def _fwd(speed):
+    return speed if speed > 0 else 0
+
+
+class DriveTrain:
+    # left/right = (ขาเดินหน้า, ขาถอยหลัง) ถ้าล้อหมุนกลับทิศ ให้สลับลำดับขาของล้อนั้น
+    def __init__(self, left=LEFT, right=RIGHT, freq=MOTOR_HZ):
+        self._pwm = []
+        for pin in left + right:
+            pwm = PWM(Pin(pin))
+            pwm.freq(freq)
+            pwm.duty_u16(0)
+            self._pwm.append(pwm)
+        self._last = [0, 0, 0, 0]   # duty ล่าสุดของ [ซ้ายหน้า, ซ้ายหลัง, ขวาหน้า, ขวาหลัง]
+
+    def _set(self, i, d):
+        if self._last[i] != d:
+            self._pwm[i].duty_u16(d)
+            self._last[i] = d
+
+    # ล้อเดียว: speed บวก = เดินหน้า, ลบ = ถอยหลัง (ปิดขาฝั่งตรงข้ามก่อนเสมอ)
+    def _wheel(self, i, speed):
+        if speed >= 0:
+            self._set(i + 1, 0)
+            self._set(i, duty(speed))
+        else:
+            self._set(i, 0)
+            self._set(i + 1, duty(-speed))
+
+    # กำหนดความเร็วล้อซ้ายและขวาแบบมีเครื่องหมาย (-100 ถึง 100)
+    def drive(self, left, right):
+        self._wheel(0, left)
+        self._wheel(2, right)
+
+    # --- กลุ่มคำสั่งทิศทาง (ชื่อเดียวกับใน Listing) ---
+    # ความเร็วติดลบถือเป็น 0 เหมือน Listing เดิม (ทิศทางมาจากชื่อคำสั่ง) ถ้าต้องการถอยหลังด้วยค่าลบให้ใช้ drive()
+    def fd(self, speed):         # เดินหน้า
+        s = _fwd(speed)
+        self.drive(s, s)
+
+    def bk(self, speed):         # ถอยหลัง
+        s = _fwd(speed)
+        self.drive(-s, -s)
+
+    def sl(self, speed):         # หมุนซ้ายอยู่กับที่
+        s = _fwd(speed)
+        self.drive(-s, s)
+
+    def sr(self, speed):         # หมุนขวาอยู่กับที่
+        s = _fwd(speed)
+        self.drive(s, -s)
+
+    def tl(self, speed):         # เลี้ยวซ้าย (ล้อซ้ายหยุด)
+        self.drive(0, _fwd(speed))
+
+    def tr(self, speed):         # เลี้ยวขวา (ล้อขวาหยุด)
+        self.drive(_fwd(speed), 0)
+
+    def fd2(self, speed1, speed2):   # เดินหน้าแยกความเร็วล้อซ้าย-ขวา
+        self.drive(_fwd(speed1), _fwd(speed2))
+
+    def bk2(self, speed1, speed2):   # ถอยหลังแยกความเร็วล้อซ้าย-ขวา
+        self.drive(-_fwd(speed1), -_fwd(speed2))
+
+    def ao(self):                # หยุดจ่ายไฟมอเตอร์ทั้งหมด
+        self.drive(0, 0)
@@ -0,0 +1,194 @@
+# ใช้ทั้งสองคอร์ของ RP2040: ลูปควบคุม (อ่านเซนเซอร์ + สั่งมอเตอร์) บนคอร์ 1 ด้วยอัตราคงที่
+# ส่วนงานช้าอย่างการส่งภาพขึ้นจอทาง I2C และการบันทึกข้อมูลอยู่บนคอร์ 0 จึงไม่ขวางการตรวจสิ่งกีดขวางอีกต่อไป
+# ส่งข้อมูลข้ามคอร์โดยไม่ใช้ล็อก:
+#   Shared  บล็อกสถานะล่าสุด (seqlock) คอร์ควบคุมเขียน คอร์จออ่านสำเนาที่สมบูรณ์เสมอ
+#   Ring    คิววงแหวนผู้เขียนหนึ่ง/ผู้อ่านหนึ่ง (SPSC) สำหรับข้อมูลทุกรอบ เช่น log
+# ControlLoop วัดความคลาดเวลาของแต่ละรอบ (jitter = เวลาเริ่มจริง - เวลาที่กำหนด) เทียบได้ทั้งโหมดคอร์เดียวและสองคอร์
+#
+#   state = Shared(2)
+#   out = array("l", [0, 0])
+#   def control():                       # ทุก 5 ms บนคอร์ 1 คืนค่า True เพื่อหยุดลูป
+#       out[0] = sonar.cm
+#       state.publish(out)
+#   def ui():                            # ทุก 100 ms บนคอร์ 0
+#       state.snapshot(view)
+#       ...
+#   loop = ControlLoop(control, period_us=5000)
+#   run(loop, ui, ui_ms=100, dual=True)  # dual=False: ทำทั้งสองงานบนคอร์เดียว (ไว้เทียบ jitter)
+#   loop.report()
+import _thread
+import time
+from array import array
+
+
+class Shared:
+    # บล็อกค่าจำนวนเต็ม n ค่า: seq เป็นเลขคี่ระหว่างเขียน ผู้อ่านลองใหม่ถ้า seq เปลี่ยนระหว่างคัดลอก
+    def __init__(self, n):
+        self.data = array("l", [0]) * n
+        self.seq = 0
+
+    # (ผู้เขียนเท่านั้น) เขียนค่าใหม่ทั้งชุด
+    def publish(self, values):
+        self.seq += 1
+        d = self.data
+        for i in range(len(values)):
+            d[i] = values[i]
+        self.seq += 1
+
+    # (ผู้อ่าน) คัดลอกค่าชุดล่าสุดลง out คืน seq ของชุดนั้น (seq เท่าเดิม = ยังไม่มีค่าใหม่)
+    def snapshot(self, out):
+        d = self.data
+        while True:
+            s = self.seq
+            if s & 1:
+                continue
+            for i in range(len(out)):
+                out[i] = d[i]
+            if self.seq == s:
+                return s
+
+
+class Ring:
+    # size ช่อง (ยกกำลังสอง) ช่องละ width ค่า head เขียนโดยผู้ผลิตเท่านั้น tail เขียนโดยผู้อ่านเท่านั้น
+    def __init__(self, size=64, width=1):
+        if size & (size - 1):
+            raise ValueError("size must be a power of two")
+        self.buf = array("l", [0]) * (size * width)
+        self.size = size
+        self.width = width
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0      # จำนวนรายการที่ทิ้งเพราะคิวเต็ม (ผู้อ่านตามไม่ทัน)
+
+    def __len__(self):
+        return self.head - self.tail
+
+    # (ผู้ผลิต) ดัชนีเริ่มของช่องว่างถัดไปใน buf (-1 = เต็ม) เขียนค่าแล้วเรียก commit()
+    def claim(self):
+        if self.head - self.tail >= self.size:
+            self.dropped += 1
+            return -1
+        return (self.head & (self.size - 1)) * self.width
+
+    def commit(self):
+        self.head += 1
+
+    # (ผู้อ่าน) ดัชนีเริ่มของรายการเก่าที่สุด (-1 = ว่าง) อ่านค่าแล้วเรียก release()
+    def peek(self):
+        if self.head == self.tail:
+            return -1
+        return (self.tail & (self.size - 1)) * self.width
+
+    def release(self):
+        self.tail += 1
+
+    def put(self, values):
+        i = self.claim()
+        if i < 0:
+            return False
+        buf = self.buf
+        for k in range(self.width):
+            buf[i + k] = values[k]
+        self.commit()
+        return True
+
+    def get(self, out):
+        i = self.peek()
+        if i < 0:
+            return False
+        buf = self.buf
+        for k in range(self.width):
+            out[k] = buf[i + k]
+        self.release()
+        return True
+
+
+class ControlLoop:
+    # step() ถูกเรียกทุก period_us (คืนค่า True = หยุดลูป) prof = Profiler สำหรับเก็บฮิสโทแกรม jitter (ไม่บังคับ)
+    def __init__(self, step, period_us=5000, prof=None):
+        self.step = step
+        self.period_us = period_us
+        self.prof = prof
+        self._slot = prof.slot("jitter") if prof is not None else -1
+        self.count = 0
+        self.late_total = 0       # ผลรวมความคลาดเวลา (us)
+        self.late_max = 0
+        self.overruns = 0         # จำนวนรอบที่พลาดกำหนด (เริ่มช้ากว่า 1 คาบ)
+        self.running = False
+        self._stop = False
+        self._next = 0
+
+    def stop(self):
+        self._stop = True
+
+    def stopped(self):
+        return self._stop
+
+    def start(self):
+        self._stop = False
+        self._next = time.ticks_add(time.ticks_us(), self.period_us)
+
+    # รอจนถึงเวลาของรอบถัดไป
+    def wait(self):
+        d = time.ticks_diff(self._next, time.ticks_us())
+        if d > 0:
+            time.sleep_us(d)
+
+    # ทำงาน 1 รอบ พร้อมบันทึกความคลาดเวลา ถ้าช้าเกิน 1 คาบให้นับเวลาใหม่จากตอนนี้ (ไม่เร่งทำรอบที่พลาด)
+    def tick(self):
+        now = time.ticks_us()
+        late = time.ticks_diff(now, self._next)
+        if late < 0:
+            late = 0
+        self.count += 1
+        self.late_total += late
+        if late > self.late_max:
+            self.late_max = late
+        if self._slot >= 0:
+            self.prof.record(self._slot, late)
+        self._next = time.ticks_add(self._next, self.period_us)
+        if time.ticks_diff(self._next, now) <= 0:
+            self.overruns += 1
+            self._next = time.ticks_add(now, self.period_us)
+        if self.step():
+            self._stop = True
+
+    # ตัวลูปเต็ม (ใช้เป็นงานของคอร์ 1)
+    def run(self):
+        self.running = True
+        self.start()
+        try:
+            while True:
+                self.wait()
+                self.tick()
+                if self._stop:
+                    break
+        finally:
+            self.running = False
+
+    def report(self):
+        n = self.count
+        print("loop %d us: n=%d jitter avg=%d max=%d us overruns=%d" % (
+            self.period_us, n, self.late_total // n if n else 0, self.late_max, self.overruns))
+
+
+# รันลูปควบคุมคู่กับงานหน้าจอ ui() ทุก ui_ms จนกว่าลูปควบคุมจะหยุด แล้วเรียก ui() อีกครั้งเพื่อแสดงสถานะสุดท้าย
+# dual=True  ลูปควบคุมอยู่บนคอร์ 1, ui() อยู่บนคอร์ 0
+# dual=False ทั้งสองงานอยู่บนคอร์เดียว ui() ที่ใช้เวลานานทำให้รอบควบคุมถัดไปช้าตามไปด้วย
+def run(loop, ui, ui_ms=100, dual=True):
+    if dual:
+        loop.running = True
+        _thread.start_new_thread(loop.run, ())
+        while loop.running:
+            ui()
+            time.sleep_ms(ui_ms)
+    else:
+        loop.start()
+        last = time.ticks_ms()
+        while not loop.stopped():
+            loop.wait()
+            loop.tick()
+            if time.ticks_diff(time.ticks_ms(), last) >= ui_ms:
+                last = time.ticks_ms()
+                ui()
+    ui()
@@ -0,0 +1,123 @@
+# ตัวเดินตามเส้นแบบต่อเนื่อง (PID) ด้วยเซนเซอร์ ZX-03 สองตัว (ขา 10 ซ้าย / 11 ขวา) และ drive() (ความเร็วล้อแบบมีเครื่องหมาย)
+# แทนการสั่ง fd() เต็มความเร็ว หรือหมุนอยู่กับที่ด้วย sl()/sr() ที่ทำให้รถส่ายและต้องวิ่งช้า
+# เซนเซอร์แบบดิจิทัลบอกได้แค่ "เส้นอยู่ใต้ตัวไหน" จึงใช้ประวัติช่วงสั้น ๆ (เวลาจาก IRQ ของ LineEvents) ช่วยประมาณ
+# ค่าคลาดเคลื่อน (error) แบบต่อเนื่อง: บวก = เส้นอยู่ทางขวา (ต้องเลี้ยวขวา), ลบ = เส้นอยู่ทางซ้าย
+#   - เซนเซอร์ข้างเดียวเจอเส้น: error เริ่มที่ 1 แล้วเพิ่มขึ้นจนถึง 2 ภายใน grow_ms ถ้ายังไม่หลุดจากเส้น
+#   - กลับมาขาวทั้งคู่: error ลดจากค่าล่าสุดลงเป็น 0 ภายใน decay_ms (ตัวรถยังเอียงอยู่ช่วงหนึ่ง)
+# แล้วสั่งล้อ ซ้าย = base + u, ขวา = base - u  โดย u = kp*e + ki*∫e + kd*de/dt
+#
+#   follow = LineFollower(DriveTrain(), LineEvents(10, 11), base=70, kp=20, kd=0.1)
+#   follow.run()                  # เดินตามเส้นจนเจอเส้นตัด (ดำทั้งคู่) แล้วหยุด
+#   while True:                   # หรือวนเอง: step() สั่งมอเตอร์ 1 ครั้ง, wait() รอเหตุการณ์/ครบรอบควบคุม
+#       follow.step()
+#       follow.wait()
+#   follow.kp = 25                # ปรับค่า gain ได้ระหว่างทำงาน
+import machine
+import time
+from mikrorover.line import WHITE, LEFT_BLACK, RIGHT_BLACK, CROSS
+
+
+class LineFollower:
+    # motors = DriveTrain, line = LineEvents, base = ความเร็วเมื่อเส้นอยู่ตรงกลาง (%)
+    # floor = ความเร็วต่ำสุดของล้อด้านใน (ลบ = ให้ถอยหลังได้เล็กน้อยตอนเลี้ยวแคบ), period_ms = รอบควบคุม
+    def __init__(self, motors, line, base=60, kp=20, ki=0, kd=0.1, floor=-20,
+                 period_ms=5, grow_ms=150, decay_ms=80, i_max=1.0):
+        self.motors = motors
+        self.line = line
+        self.base = base
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.floor = floor
+        self.period_ms = period_ms
+        self.grow_ms = grow_ms
+        self.decay_ms = decay_ms
+        self.i_max = i_max           # จำกัดค่าสะสมของ ki (ป้องกัน windup) หน่วยเดียวกับ error x วินาที
+        self.left = 0                # ความเร็วล้อที่สั่งล่าสุด
+        self.right = 0
+        self.reset()
+
+    # เริ่มใหม่จากสถานะปัจจุบันของเซนเซอร์ (ทิ้งเหตุการณ์เก่าและค่าสะสม)
+    def reset(self):
+        self.state = self.line.clear()
+        self.error = 0.0
+        self._since = self.line.t_us     # เวลาที่เข้าสู่สถานะปัจจุบัน (ticks_us)
+        self._exit = 0.0                 # error ตอนที่ออกจากเส้นกลับมาขาวทั้งคู่
+        self._i = 0.0
+        self._e = 0.0
+        self._t = time.ticks_us()
+
+    # ค่าคลาดเคลื่อนจากสถานะและเวลาที่อยู่ในสถานะนั้น (age_ms)
+    def _estimate(self, age_ms):
+        s = self.state
+        if s == LEFT_BLACK or s == RIGHT_BLACK:
+            k = age_ms / self.grow_ms
+            e = 1 + (k if k < 1 else 1)
+            return -e if s == LEFT_BLACK else e
+        if s == WHITE:
+            k = age_ms / self.decay_ms
+            return self._exit * (1 - k) if k < 1 else 0.0
+        return 0.0
+
+    # อ่านเหตุการณ์ที่ค้าง คำนวณ PID แล้วสั่งมอเตอร์ 1 ครั้ง คืนค่าสถานะเซนเซอร์
+    def step(self):
+        line = self.line
+        while line.pending():
+            s = line.get()
+            if s == WHITE and self.state != WHITE:
+                self._exit = self.error
+            self.state = s
+            self._since = line.t_us
+        now = time.ticks_us()
+        if self.state == CROSS:             # เส้นตัด: หยุด
+            self._i = 0.0
+            self._e = 0.0
+            self._t = now
+            self.motors.ao()
+            return CROSS
+        e = self._estimate(time.ticks_diff(now, self._since) / 1000)
+        dt = time.ticks_diff(now, self._t) / 1_000_000
+        self._t = now
+        d = 0.0
+        if dt > 0:
+            self._i += e * dt
+            if self._i > self.i_max:
+                self._i = self.i_max
+            elif self._i < -self.i_max:
+                self._i = -self.i_max
+            # อนุพันธ์คิดต่อช่วงอย่างน้อย 1 รอบควบคุม: step() ที่ตื่นเพราะ IRQ อาจห่างจากรอบก่อนแค่ไม่กี่ us
+            d = (e - self._e) * 1000 / max(dt * 1000, self.period_ms)
+        self._e = e
+        self.error = e
+        u = self.kp * e + self.ki * self._i + self.kd * d
+        self.left = self._clamp(self.base + u)
+        self.right = self._clamp(self.base - u)
+        self.motors.drive(self.left, self.right)
+        return self.state
+
+    def _clamp(self, v):
+        if v > 100:
+            return 100
+        if v < self.floor:
+            return self.floor
+        return int(v)
+
+    # รอจนมีเหตุการณ์เซนเซอร์หรือครบรอบควบคุม (พัก CPU ระหว่างรอ)
+    def wait(self):
+        t0 = time.ticks_ms()
+        line = self.line
+        while not line.pending() and time.ticks_diff(time.ticks_ms(), t0) < self.period_ms:
+            machine.idle()
+
+    # เดินตามเส้นจนกว่าเซนเซอร์จะเป็นสถานะ until (ค่าเริ่มต้น = เส้นตัด) แล้วหยุดมอเตอร์
+    # คืนค่า False ถ้าครบ timeout_ms ก่อน
+    def run(self, until=CROSS, timeout_ms=-1):
+        self.reset()
+        t0 = time.ticks_ms()
+        while self.step() != until:
+            if timeout_ms >= 0 and time.ticks_diff(time.ticks_ms(), t0) >= timeout_ms:
+                self.motors.ao()
+                return False
+            self.wait()
+        self.motors.ao()
+        return True
@@ -0,0 +1,92 @@
+# ตรวจการจองหน่วยความจำต่อรอบของลูป (heap churn) และเวลาที่ GC หยุดโปรแกรม
+# lap() เรียกครั้งเดียวต่อรอบ อ่าน gc.mem_alloc() เทียบกับรอบก่อน: เพิ่มขึ้น = รอบนี้จองหน่วยความจำ
+# ลดลง = GC อัตโนมัติทำงานระหว่างรอบ (นับไว้ที่ auto) ลูปที่ไม่จองอะไรเลยจะมี alloc_loops = 0 ตลอด
+# collect_every > 0: ปิด GC อัตโนมัติแล้วเรียก gc.collect() เองทุก N รอบพร้อมจับเวลา (pause_max / pause_total)
+# ยอดที่อ่านได้รวมการจองจาก IRQ / Timer / คอร์อื่นที่เกิดระหว่างรอบด้วย
+# บนตัวจำลองคอมพิวเตอร์ mem_alloc() มาจาก tracemalloc (ถ้าเปิดไว้) ซึ่งนับการจองของ CPython จึงใช้ดูแนวโน้มเท่านั้น
+#
+#   mon = GCMonitor(warmup=100)    # ไม่นับ 100 รอบแรก (จอเฟรมแรก, สร้างตาราง/แคช)
+#   while True:
+#       mon.lap()
+#       ...
+#       if done: mon.report()      # gc: loops=2000 alloc loops=0 churn=0 B ...
+#   mon.reset()                    # เริ่มนับใหม่
+import gc
+import time
+
+
+class GCMonitor:
+    # collect_every = เรียก gc.collect() เองทุกกี่รอบ (0 = ปล่อยให้ GC ทำงานเองตามปกติ)
+    # warmup = จำนวนรอบแรกที่ไม่นับ (ช่วงอุ่นเครื่องที่จองหน่วยความจำครั้งเดียว)
+    def __init__(self, collect_every=0, warmup=0, enabled=True):
+        self.enabled = enabled
+        self.collect_every = collect_every
+        self._warmup = warmup
+        if enabled and collect_every:
+            gc.disable()
+        self.reset()
+
+    def reset(self):
+        self.loops = 0
+        self.alloc_loops = 0      # รอบที่มีการจองหน่วยความจำ
+        self.churn = 0            # ไบต์ที่จองรวมทุกรอบ
+        self.churn_max = 0        # ไบต์ที่จองมากที่สุดในรอบเดียว
+        self.auto = 0             # GC อัตโนมัติที่เกิดระหว่างรอบ
+        self.collects = 0         # gc.collect() ที่เรียกเอง
+        self.pause_total = 0      # เวลารวมของ gc.collect() (us)
+        self.pause_max = 0
+        self._next = self.collect_every
+        self._last = gc.mem_alloc()
+
+    def lap(self):
+        if not self.enabled:
+            return
+        a = gc.mem_alloc()
+        if self._warmup:
+            self._warmup -= 1
+            self._last = a
+            return
+        d = a - self._last
+        if d < 0:
+            self.auto += 1
+        elif d:
+            self.alloc_loops += 1
+            self.churn += d
+            if d > self.churn_max:
+                self.churn_max = d
+        self.loops += 1
+        if self.collect_every:
+            self._next -= 1
+            if self._next <= 0:
+                self._next = self.collect_every
+                self.collect()
+                a = gc.mem_alloc()
+        self._last = a
+
+    # เก็บขยะทันทีพร้อมจับเวลา คืนค่าเวลาที่ใช้ (us)
+    def collect(self):
+        t = time.ticks_us()
+        gc.collect()
+        dt = time.ticks_diff(time.ticks_us(), t)
+        self.collects += 1
+        self.pause_total += dt
+        if dt > self.pause_max:
+            self.pause_max = dt
+        self._last = gc.mem_alloc()
+        return dt
+
+    # True ถ้าตั้งแต่ reset() ยังไม่มีรอบไหนจองหน่วยความจำ
+    def steady(self):
+        return self.alloc_loops == 0 and self.auto == 0
+
+    def close(self):
+        if self.collect_every:
+            gc.enable()
+
+    def report(self):
+        n = self.loops
+        print("gc: loops=%d alloc loops=%d churn=%d B (avg %d max %d B/loop) auto gc=%d free=%d B" % (
+            n, self.alloc_loops, self.churn, self.churn // n if n else 0, self.churn_max, self.auto, gc.mem_free()))
+        if self.collects:
+            print("gc: collect x%d pause avg=%d max=%d us" % (
+                self.collects, self.pause_total // self.collects, self.pause_max))
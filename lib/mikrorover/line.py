@@ -0,0 +1,86 @@
+# เหตุการณ์จากเซนเซอร์เส้น (ขา 10 ซ้าย / 11 ขวา) ด้วยอินเทอร์รัปต์ของขา (Pin IRQ) แทนการวนอ่านค่าตลอดเวลา
+# ทุกครั้งที่เซนเซอร์เปลี่ยนสถานะ IRQ จะบันทึก (เวลา ticks_us, สถานะ) ลงคิวที่จองหน่วยความจำไว้ล่วงหน้า
+# โค้ดหลักรอด้วย wait() (CPU พักด้วย machine.idle()) แล้วสั่งมอเตอร์เฉพาะตอนที่สถานะเปลี่ยน
+#
+# สถานะ = (ซ้าย << 1) | ขวา  โดย 1 = พื้นขาว, 0 = เส้นดำ
+#   WHITE (3)       ทั้งสองตัวอยู่บนพื้นขาว
+#   LEFT_BLACK (1)  ซ้ายเจอเส้น
+#   RIGHT_BLACK (2) ขวาเจอเส้น
+#   CROSS (0)       ดำทั้งคู่ (เส้นตัด / ทางแยก)
+import machine
+import time
+from array import array
+from machine import Pin
+from mikrorover.board import LINE_L, LINE_R
+
+WHITE = 3
+LEFT_BLACK = 1
+RIGHT_BLACK = 2
+CROSS = 0
+
+
+class LineEvents:
+    def __init__(self, left=LINE_L, right=LINE_R, size=32):
+        self._l = Pin(left, Pin.IN)
+        self._r = Pin(right, Pin.IN)
+        self._n = size
+        self._t = array("L", [0]) * size        # เวลาที่เกิดเหตุการณ์ (ticks_us)
+        self._s = bytearray(size)               # สถานะหลังเปลี่ยน
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0                        # จำนวนเหตุการณ์ที่ทิ้งไปเพราะคิวเต็ม
+        self.t_us = time.ticks_us()             # เวลาของเหตุการณ์ล่าสุดที่ get() คืนค่า
+        self.state = (self._l.value() << 1) | self._r.value()
+        trig = Pin.IRQ_RISING | Pin.IRQ_FALLING
+        self._l.irq(self._irq, trig, hard=True)
+        self._r.irq(self._irq, trig, hard=True)
+
+    # ทำงานใน hard IRQ: ห้ามจองหน่วยความจำ ใช้เฉพาะตัวแปรที่เตรียมไว้แล้ว
+    def _irq(self, pin):
+        s = (self._l.value() << 1) | self._r.value()
+        if s == self.state:                     # สัญญาณกระเด้ง (bounce) กลับมาสถานะเดิม
+            return
+        self.state = s
+        h = self._head
+        nxt = (h + 1) % self._n
+        if nxt == self._tail:
+            self.dropped += 1
+            return
+        self._t[h] = time.ticks_us()
+        self._s[h] = s
+        self._head = nxt
+
+    def pending(self):
+        return self._head != self._tail
+
+    # ดึงเหตุการณ์เก่าสุดออกจากคิว คืนค่าสถานะ (หรือ -1 ถ้าคิวว่าง) และเก็บเวลาไว้ที่ t_us
+    def get(self):
+        t = self._tail
+        if t == self._head:
+            return -1
+        self.t_us = self._t[t]
+        s = self._s[t]
+        self._tail = (t + 1) % self._n
+        return s
+
+    # รอจนมีเหตุการณ์ (พัก CPU ระหว่างรอ) คืนค่าสถานะ หรือ -1 เมื่อครบ timeout_ms
+    def wait(self, timeout_ms=-1):
+        t0 = time.ticks_ms()
+        while self._head == self._tail:
+            if timeout_ms >= 0 and time.ticks_diff(time.ticks_ms(), t0) >= timeout_ms:
+                return -1
+            machine.idle()
+        return self.get()
+
+    # เวลาตั้งแต่เกิดเหตุการณ์ล่าสุดที่ get() คืนค่า จนถึงตอนนี้ (ไมโครวินาที)
+    def latency_us(self):
+        return time.ticks_diff(time.ticks_us(), self.t_us)
+
+    # ทิ้งเหตุการณ์เก่าในคิว และอ่านสถานะปัจจุบันใหม่ (นับเป็นเหตุการณ์ ณ เวลานี้)
+    def clear(self):
+        irq = machine.disable_irq()
+        self._tail = self._head
+        self.state = (self._l.value() << 1) | self._r.value()
+        self.t_us = time.ticks_us()
+        machine.enable_irq(irq)
+        return self.state
@@ -0,0 +1,178 @@
+# บันทึกประวัติภารกิจลงแฟลชเป็นระเบียนไบนารีขนาดคงที่ (struct) ในไฟล์ขนาดคงที่ที่ใช้วนซ้ำ (ring buffer)
+# ไฟล์ถูกสร้างเต็มขนาดตั้งแต่แรก การเขียนจึงเป็นการเขียนทับทีละบล็อกของระบบไฟล์ (ไม่ต่อท้าย ไม่จองพื้นที่ใหม่)
+# write() แค่เก็บระเบียนลงบัฟเฟอร์ใน RAM (ไม่แตะแฟลช ไม่จองหน่วยความจำ) เมื่อครบ 1 บล็อกจะสลับไปเติมอีกบัฟเฟอร์
+# service() เขียนบล็อกที่เต็มแล้วลงแฟลชทีละบล็อก ให้เรียกจากงานที่ไม่เร่งด่วน (งานหน้าจอ/คอร์ 0) ลูปควบคุมจึงไม่สะดุด
+# ถ้าบัฟเฟอร์เต็มทั้งสองก่อน service() จะทิ้งระเบียนใหม่และนับไว้ที่ dropped แทนการหยุดรอ
+# เปิดไฟล์เดิมอีกครั้ง (เช่น หลังรีเซ็ต) จะเขียนต่อจากบล็อกล่าสุด ประวัติภารกิจก่อนหน้าจึงไม่หาย
+# อ่านบนคอมพิวเตอร์ด้วย python -m host.logdump mission.log (ได้อาร์เรย์ NumPy ด้วย host.logdump.arrays())
+#
+# ระเบียน (16 ไบต์, little-endian) RECORD = "<IIhbbBBBB"
+#   seq       ลำดับระเบียน (เพิ่มทีละ 1 ต่อเนื่องข้ามการรีเซ็ต ใช้เรียงลำดับตอนอ่าน)
+#   t_ms      เวลาตั้งแต่เปิดไฟล์ (ms) เริ่มนับใหม่ทุกครั้งที่เปิด
+#   cm        ระยะจาก Sonar (ซม., -1 = ไม่มี)
+#   left/right คำสั่งความเร็วล้อซ้าย/ขวา (-100 ถึง 100)
+#   sv1/sv2   มุมเซอร์โว (องศา)
+#   line      เซนเซอร์เส้น (บิต 0 = ซ้าย, บิต 1 = ขวา)
+#   event     รหัสเหตุการณ์ (EV_*)
+# ระเบียนช่องแรกของไฟล์เป็นหัวไฟล์ HEADER = "<4sBBHII": b"MRLG", เวอร์ชัน, ขนาดระเบียน, ขนาดบล็อก, จำนวนบล็อก, 0
+#
+#   log = MissionLog("mission.log", blocks=16)            # 16 บล็อก x 4 KB = 4095 ระเบียน
+#   log.write(EV_NONE, sonar.cm, 50, 50, 90, 90, line)    # ในลูปควบคุม
+#   log.service()                                         # ในงานหน้าจอ / ช่วงว่าง
+#   log.flush()                                           # จบภารกิจ: เขียนส่วนที่ค้างทั้งหมด
+import os
+import struct
+import time
+
+MAGIC = b"MRLG"
+VERSION = 1
+HEADER = "<4sBBHII"
+RECORD = "<IIhbbBBBB"
+RECORD_SIZE = 16
+
+# เหตุการณ์ทั่วไป (Listing กำหนดเพิ่มเองได้ตั้งแต่ 16 ขึ้นไป)
+EV_NONE = 0
+EV_START = 1
+EV_STOP = 2
+EV_OBSTACLE = 3
+EV_KEY = 4
+EV_PICK = 5
+EV_DROP = 6
+EV_MARK = 7
+
+
+# ขนาดบล็อกของระบบไฟล์ที่เก็บ path (RP2040 ใช้ littlefs บล็อกละ 4096 ไบต์)
+def fs_block(path):
+    d = path.rpartition("/")[0] or "/"
+    try:
+        return os.statvfs(d)[0]
+    except (AttributeError, OSError):
+        return 4096
+
+
+class MissionLog:
+    # blocks = จำนวนบล็อกในไฟล์, block = ขนาดบล็อก (ไบต์, ค่าเริ่มต้นตามระบบไฟล์) จอง RAM 2 บล็อก
+    def __init__(self, path, blocks=16, block=None):
+        if block is None:
+            block = fs_block(path)
+        self.path = path
+        self.block = block
+        self.blocks = blocks
+        self.per_block = block // RECORD_SIZE
+        self._header = struct.pack(HEADER, MAGIC, VERSION, RECORD_SIZE, block, blocks, 0)
+        self._bufs = (bytearray(block), bytearray(block))
+        self._mv = (memoryview(self._bufs[0]), memoryview(self._bufs[1]))
+        self._cur = 0             # บัฟเฟอร์ที่กำลังเติม
+        self._blk = 0             # บล็อกในไฟล์ของบัฟเฟอร์ที่กำลังเติม
+        self._n = 0               # จำนวนช่องที่เติมแล้ว
+        self._full = -1           # บัฟเฟอร์ที่เต็มแล้วรอ service() (-1 = ไม่มี)
+        self._full_blk = 0
+        self.seq = 0
+        self.dropped = 0          # ระเบียนที่ทิ้งเพราะ service() ไม่ทัน
+        self.writes = 0           # จำนวนบล็อกที่เขียนลงแฟลช
+        self.write_us_max = 0     # เวลาเขียน 1 บล็อกที่นานที่สุด
+        self._f = self._open()
+        self._start()
+        self._t0 = time.ticks_ms()
+
+    def _open(self):
+        size = self.block * self.blocks
+        try:
+            f = open(self.path, "r+b")
+            head = f.read(len(self._header))
+            if head == self._header and f.seek(0, 2) == size:
+                self._resume(f)
+                return f
+            f.close()
+        except OSError:
+            pass
+        f = open(self.path, "wb")
+        buf = self._bufs[0]
+        n = len(self._header)
+        buf[:n] = self._header
+        f.write(buf)
+        buf[:n] = bytes(n)
+        for _ in range(self.blocks - 1):
+            f.write(buf)
+        f.close()
+        return open(self.path, "r+b")
+
+    # หาบล็อกล่าสุดจากค่า seq ของระเบียนแรกในแต่ละบล็อก แล้วเขียนต่อที่บล็อกถัดไป
+    def _resume(self, f):
+        mv = self._mv[0]
+        best = -1
+        top = 0
+        for b in range(self.blocks):
+            f.seek(b * self.block + (RECORD_SIZE if b == 0 else 0))
+            f.readinto(mv[:4])
+            s = struct.unpack_from("<I", mv, 0)[0]
+            if s > top:
+                best, top = b, s
+        if best < 0:
+            return
+        f.seek(best * self.block)
+        f.readinto(mv)
+        for i in range(1 if best == 0 else 0, self.per_block):
+            s = struct.unpack_from("<I", mv, i * RECORD_SIZE)[0]
+            if s > top:
+                top = s
+        self.seq = top
+        self._blk = (best + 1) % self.blocks
+
+    # เริ่มเติมบล็อก _blk ในบัฟเฟอร์ _cur (บล็อก 0 มีหัวไฟล์อยู่ช่องแรก)
+    def _start(self):
+        if self._blk == 0:
+            self._bufs[self._cur][:RECORD_SIZE] = self._header
+            self._n = 1
+        else:
+            self._n = 0
+
+    # (ลูปควบคุม) เพิ่มระเบียน 1 รายการ คืนค่า False ถ้าต้องทิ้งเพราะบัฟเฟอร์เต็มทั้งสอง
+    def write(self, event, cm=-1, left=0, right=0, sv1=0, sv2=0, line=0):
+        if self._n >= self.per_block:
+            if self._full >= 0:
+                self.dropped += 1
+                return False
+            self._full = self._cur
+            self._full_blk = self._blk
+            self._cur ^= 1
+            self._blk = (self._blk + 1) % self.blocks
+            self._start()
+        self.seq += 1
+        struct.pack_into(RECORD, self._bufs[self._cur], self._n * RECORD_SIZE, self.seq,
+                         time.ticks_diff(time.ticks_ms(), self._t0), cm, left, right, sv1, sv2, line, event)
+        self._n += 1
+        return True
+
+    # (งานที่ไม่เร่งด่วน) เขียนบล็อกที่เต็มแล้วลงแฟลช คืนค่า True ถ้ามีการเขียน
+    def service(self):
+        if self._full < 0:
+            return False
+        t = time.ticks_us()
+        f = self._f
+        f.seek(self._full_blk * self.block)
+        f.write(self._bufs[self._full])
+        f.flush()
+        self._full = -1
+        self.writes += 1
+        dt = time.ticks_diff(time.ticks_us(), t)
+        if dt > self.write_us_max:
+            self.write_us_max = dt
+        return True
+
+    # เขียนทุกอย่างที่ค้าง รวมบล็อกที่ยังไม่เต็ม (เฉพาะส่วนที่มีข้อมูล ส่วนที่เหลือของบล็อกยังเป็นประวัติรอบก่อน)
+    def flush(self):
+        self.service()
+        if self._n:
+            f = self._f
+            f.seek(self._blk * self.block)
+            f.write(self._mv[self._cur][:self._n * RECORD_SIZE])
+            f.flush()
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+    def report(self):
+        print("log %s: records=%d blocks written=%d dropped=%d write max=%d us" % (
+            self.path, self.seq, self.writes, self.dropped, self.write_us_max))
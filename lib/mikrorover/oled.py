@@ -0,0 +1,131 @@
+# จอ OLED SSD1306 แบบส่งเฉพาะส่วนที่เปลี่ยน (Partial flush)
+# เก็บสำเนาภาพที่ส่งไปแล้วครั้งล่าสุด (shadow) ไว้เปรียบเทียบ แล้วส่งเฉพาะช่วงคอลัมน์ที่ต่างกันในแต่ละ page
+# ใช้แทน SSD1306_I2C ได้ทันที: display = OLED(128, 64, i2c, addr=0x3C)
+# มีคำสั่งเลื่อนภาพด้วยฮาร์ดแวร์ของจอ (hardware scroll / display offset) ที่ไม่ต้องส่งภาพซ้ำทุกเฟรม
+import micropython
+from micropython import const
+from ssd1306 import SSD1306_I2C
+
+_SET_COL_ADDR = const(0x21)
+_SET_PAGE_ADDR = const(0x22)
+_GAP = const(12)      # ถ้าช่องว่างที่ไม่เปลี่ยนยาวกว่านี้ (ไบต์) ให้แยกส่งเป็น 2 ช่วง คุ้มกว่าส่งข้าม
+_FRAME_HZ = const(88) # อัตรารีเฟรชโดยประมาณของจอ (ออสซิลเลเตอร์ภายใน ขึ้นกับจอแต่ละตัว)
+
+# จำนวนเฟรมต่อการเลื่อน 1 คอลัมน์ -> รหัสความเร็วในคำสั่ง scroll ของ SSD1306
+_INTERVAL = {2: 7, 3: 4, 4: 5, 5: 0, 25: 6, 64: 1, 128: 2, 256: 3}
+
+
+class OLED(SSD1306_I2C):
+    def __init__(self, width=128, height=64, i2c=None, addr=0x3C, external_vcc=False):
+        self._shadow = bytearray(width * height // 8)  # ภาพที่อยู่บนจอจริงตอนนี้
+        self._synced = False
+        self._cmd = bytearray(7)                        # คำสั่งกำหนดหน้าต่าง (ส่งรวดเดียว)
+        self._scroll = bytearray(10)                    # คำสั่งตั้งค่า hardware scroll (ส่งรวดเดียว)
+        self._col0 = (128 - width) // 2                 # จอแคบใช้คอลัมน์ตรงกลางของ 128 คอลัมน์
+        self.bytes_sent = 0                             # จำนวนไบต์ภาพที่ส่งในการ show() ครั้งล่าสุด
+        super().__init__(width, height, i2c, addr, external_vcc)
+        self._mv = memoryview(self.buffer)
+
+    # ส่งภาพทั้งจอ (ใช้ครั้งแรก หรือเมื่อไม่แน่ใจว่าภาพบนจอตรงกับ shadow)
+    def show_full(self):
+        super().show()
+        self._shadow[:] = self.buffer
+        self._synced = True
+        self.bytes_sent = len(self.buffer)
+
+    # บังคับให้ show() ครั้งถัดไปส่งทั้งจอ
+    def invalidate(self):
+        self._synced = False
+
+    def show(self):
+        if not self._synced:
+            self.show_full()
+            return
+        sent = 0
+        for page in range(self.pages):
+            sent += self._flush(page)
+        self.bytes_sent = sent
+
+    # ส่งเฉพาะ page เดียว (ให้งานที่ต้องการแบ่งการส่งภาพเป็นช่วงสั้น ๆ ไม่ให้บล็อกนาน)
+    def show_page(self, page):
+        if not self._synced:
+            self.show_full()
+            return
+        self.bytes_sent = self._flush(page)
+
+    @micropython.native
+    def _flush(self, page):
+        buf = self.buffer
+        sh = self._shadow
+        w = self.width
+        sent = 0
+        i = page * w
+        end = i + w
+        while i < end:
+            if buf[i] == sh[i]:
+                i += 1
+                continue
+            # เจอไบต์ที่เปลี่ยน: ขยายช่วงไปจนเจอช่องว่างที่ไม่เปลี่ยนยาวเกิน _GAP
+            last = i
+            j = i + 1
+            while j < end and j - last <= _GAP:
+                if buf[j] != sh[j]:
+                    last = j
+                j += 1
+            self._window(page, i - page * w, last - page * w)
+            self.write_data(self._mv[i:last + 1])
+            sh[i:last + 1] = self._mv[i:last + 1]
+            sent += last + 1 - i
+            i = last + 1
+        return sent
+
+    # กำหนดหน้าต่างเขียน (คอลัมน์ x0-x1 ของ page เดียว) ด้วย command stream ครั้งเดียว
+    def _window(self, page, x0, x1):
+        c = self._cmd
+        c[0] = 0x00                  # Co=0, D/C#=0: ไบต์ที่ตามมาเป็นคำสั่งทั้งหมด
+        c[1] = _SET_COL_ADDR
+        c[2] = self._col0 + x0
+        c[3] = self._col0 + x1
+        c[4] = _SET_PAGE_ADDR
+        c[5] = page
+        c[6] = page
+        self.i2c.writeto(self.addr, c)
+
+    # --- Hardware scroll ---
+    # เลื่อนภาพใน page first_page ถึง last_page ไปทางขวา (direction > 0) หรือซ้าย (direction < 0)
+    # ทีละ 1 คอลัมน์ทุก ๆ frames เฟรม ตัวจอเลื่อนเองโดยไม่มีข้อมูลวิ่งบนบัสอีก จนกว่าจะสั่ง scroll_stop()
+    def hscroll(self, direction, first_page=0, last_page=None, frames=2):
+        if frames not in _INTERVAL:
+            raise ValueError("frames must be one of %s" % sorted(_INTERVAL))
+        if last_page is None:
+            last_page = self.pages - 1
+        c = self._scroll
+        c[0] = 0x00
+        c[1] = 0x2E                                  # หยุดการเลื่อนเดิมก่อนตั้งค่าใหม่
+        c[2] = 0x26 if direction > 0 else 0x27
+        c[3] = 0x00
+        c[4] = first_page
+        c[5] = _INTERVAL[frames]
+        c[6] = last_page
+        c[7] = 0x00
+        c[8] = 0xFF
+        c[9] = 0x2F                                  # เริ่มเลื่อน
+        self.i2c.writeto(self.addr, c)
+        # ระหว่างเลื่อน จอจะหมุนข้อมูลใน GDDRAM เอง ภาพบนจอจึงไม่ตรงกับ shadow อีกต่อไป
+        self._synced = False
+
+    def scroll_stop(self):
+        self.write_cmd(0x2E)
+        self._synced = False
+
+    # เวลาโดยประมาณ (ms) ที่ใช้เลื่อนภาพ columns คอลัมน์ ด้วยความเร็ว frames เฟรมต่อคอลัมน์
+    def scroll_ms(self, columns, frames=2):
+        return columns * frames * 1000 // _FRAME_HZ
+
+    # --- เลื่อนภาพแนวตั้ง (ส่งคำสั่งเดียว ไม่ต้องส่งภาพใหม่) ---
+    def set_start_line(self, line):
+        self.write_cmd(0x40 | (line & 0x3F))
+
+    def set_offset(self, rows):
+        self.write_cmd(0xD3)
+        self.write_cmd(rows & 0x3F)
@@ -0,0 +1,132 @@
+# ตัวจับเวลาโค้ดบนบอร์ด (profiler) ด้วย ticks_us แบบเบา ๆ
+# แต่ละจุดวัด (slot) เก็บจำนวนครั้ง, เวลารวม, เวลาสูงสุด และฮิสโทแกรมของเวลาที่ใช้ (ไมโครวินาที)
+# ลงอาร์เรย์ที่จองไว้ล่วงหน้า การบันทึกแต่ละครั้งจึงไม่จองหน่วยความจำใหม่
+# ฮิสโทแกรมแบ่งช่องแบบลอการิทึม 4 ช่องต่อช่วงเท่าตัว (ความละเอียดประมาณ 12-25%) ครอบคลุม 0 us ถึงหลายสิบวินาที
+#
+#   prof = Profiler()
+#   fd = prof.wrap("fd", fd)          # ห่อฟังก์ชัน: จับเวลาทุกครั้งที่เรียก
+#   @prof.probe("track")              # หรือใช้เป็น decorator
+#   def track(): ...
+#   loop = prof.slot("loop")
+#   while True:
+#       prof.lap(loop)                # เวลาระหว่างรอบ (ดู jitter ของลูป)
+#   prof.dump("prof.bin")             # บันทึกเป็นไฟล์ไบนารี แล้วอ่านบนคอมพิวเตอร์ด้วย python -m host.profdump prof.bin
+import micropython
+import struct
+import time
+from array import array
+
+MAGIC = b"MRPF"
+VERSION = 1
+BUCKETS = 96       # ช่อง 0-3 = 0-3 us, จากนั้น 4 ช่องต่อช่วง [2^e, 2^(e+1)) สูงสุดประมาณ 2^24 us
+
+
+# ช่องฮิสโทแกรมของเวลา dt (ไมโครวินาที)
+@micropython.native
+def bucket(dt):
+    if dt < 4:
+        return dt if dt > 0 else 0
+    e = 0
+    x = dt
+    while x > 1:
+        x >>= 1
+        e += 1
+    b = (e - 1) * 4 + ((dt >> (e - 2)) & 3)
+    return b if b < BUCKETS else BUCKETS - 1
+
+
+# เวลาต่ำสุดของช่อง b (ใช้แปลงฮิสโทแกรมกลับเป็นเวลา)
+def bucket_floor(b):
+    if b < 4:
+        return b
+    e = b // 4 + 1
+    return (4 + b % 4) << (e - 2)
+
+
+class Profiler:
+    # slots = จำนวนจุดวัดสูงสุด, enabled=False: wrap() คืนฟังก์ชันเดิมโดยไม่ห่อ (ไม่มีค่าใช้จ่ายเลย)
+    def __init__(self, slots=8, enabled=True):
+        self.enabled = enabled
+        self.names = []
+        self._max = slots
+        self.count = array("L", [0]) * slots
+        self.total = array("L", [0]) * slots     # เวลารวม (us)
+        self.peak = array("L", [0]) * slots      # เวลาสูงสุด (us)
+        self.hist = array("L", [0]) * (slots * BUCKETS)
+        self._last = array("L", [0]) * slots     # เวลาของ lap() ครั้งก่อน
+        self._lapped = bytearray(slots)
+
+    # หมายเลขจุดวัดของชื่อนี้ (สร้างใหม่ถ้ายังไม่มี)
+    def slot(self, name):
+        if name in self.names:
+            return self.names.index(name)
+        if len(self.names) >= self._max:
+            raise ValueError("profiler slots full")
+        self.names.append(name)
+        return len(self.names) - 1
+
+    # บันทึกเวลา dt (us) ให้จุดวัด i
+    @micropython.native
+    def record(self, i, dt):
+        self.count[i] += 1
+        self.total[i] += dt
+        if dt > self.peak[i]:
+            self.peak[i] = dt
+        self.hist[i * BUCKETS + bucket(dt)] += 1
+
+    # จับเวลาระหว่างการเรียก lap() แต่ละครั้ง (ครั้งแรกแค่เริ่มนับ)
+    def lap(self, i):
+        now = time.ticks_us()
+        if self._lapped[i]:
+            self.record(i, time.ticks_diff(now, self._last[i]))
+        self._lapped[i] = 1
+        self._last[i] = now
+
+    def wrap(self, name, fn):
+        if not self.enabled:
+            return fn
+        i = self.slot(name)
+        record = self.record
+        ticks_us = time.ticks_us
+        ticks_diff = time.ticks_diff
+
+        def timed(*args):
+            t0 = ticks_us()
+            r = fn(*args)
+            record(i, ticks_diff(ticks_us(), t0))
+            return r
+        return timed
+
+    def probe(self, name):
+        return lambda fn: self.wrap(name, fn)
+
+    def reset(self):
+        for a in (self.count, self.total, self.peak, self.hist):
+            for k in range(len(a)):
+                a[k] = 0
+        for k in range(self._max):
+            self._lapped[k] = 0
+
+    # ข้อมูลทั้งหมดเป็นไบนารี (little-endian):
+    #   "MRPF", version, จำนวน slot, จำนวนช่อง (B B B) แล้วต่อด้วยแต่ละ slot:
+    #   ความยาวชื่อ (B), ชื่อ, count, total_us, peak_us (<III), ฮิสโทแกรม (<I x จำนวนช่อง)
+    def dumps(self):
+        parts = [MAGIC, struct.pack("<BBB", VERSION, len(self.names), BUCKETS)]
+        for i, name in enumerate(self.names):
+            n = name.encode()
+            parts.append(struct.pack("<B", len(n)))
+            parts.append(n)
+            parts.append(struct.pack("<III", self.count[i], self.total[i], self.peak[i]))
+            h = self.hist[i * BUCKETS:(i + 1) * BUCKETS]
+            parts.append(struct.pack("<%dI" % BUCKETS, *h))
+        return b"".join(parts)
+
+    def dump(self, path="prof.bin"):
+        with open(path, "wb") as f:
+            f.write(self.dumps())
+
+    # สรุปสั้น ๆ ทาง REPL (รายละเอียด/เปอร์เซ็นไทล์ใช้ host/profdump.py)
+    def report(self):
+        for i, name in enumerate(self.names):
+            n = self.count[i]
+            print("%-12s n=%-6d avg=%-7d max=%d us" % (name, n, self.total[i] // n if n else 0, self.peak[i]))
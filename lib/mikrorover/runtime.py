@@ -0,0 +1,132 @@
+# รันไทม์แบบหลายงาน (cooperative tasks) ด้วย asyncio ของ MicroPython
+# แยกลูปใหญ่ของหุ่นยนต์ออกเป็น task ย่อย: รับจอย, watchdog หยุดรถ, เขียนมอเตอร์, ขยับแขนจับ และหน้าจอ
+# ทุก task รอด้วย await asyncio.sleep_ms() แทน time.sleep_ms() จึงไม่มีงานไหนบล็อกงานอื่นได้
+# watchdog สั่งหยุดมอเตอร์เองโดยตรง (ไม่ต้องรอ task อื่น) ภายใน period_ms หลังหมดเวลา
+#
+#   rover = Rover(DriveTrain(), timeout_ms=150)
+#   arm = Gripper((18, 19), (90, 90))
+#   keys.bind(LU, rover.fd, 50)                          # ปุ่มสั่งแค่ "คำสั่ง" ความเร็ว
+#   async def main():
+#       asyncio.create_task(rover.watchdog_task())
+#       asyncio.create_task(rover.drive_task())
+#       asyncio.create_task(every(50, dash.service))     # หน้าจอ
+#       await rover.remote_task(remote, keys)            # remote = X14(on_code=rover.on_code) ตื่นจาก IRQ ทันทีที่ได้เฟรม
+#   asyncio.run(main())
+#
+#   await arm.run(((0, 90), (1, 100)))                   # ลำดับท่าแขนจับ จบเมื่อเซอร์โวถึงมุมจริง โดยไม่บล็อก
+import asyncio
+import time
+from mikrorover.dualcore import Ring
+from mikrorover.servo import ServoPlanner
+
+
+# เรียก fn() ทุก period_ms (เช่น dash.service หรือการบันทึกข้อมูล)
+async def every(period_ms, fn):
+    while True:
+        fn()
+        await asyncio.sleep_ms(period_ms)
+
+
+class Rover:
+    # motors = DriveTrain, timeout_ms = เวลาที่ไม่มีคำสั่งใหม่ก่อน watchdog สั่งหยุด
+    def __init__(self, motors, timeout_ms=150, on_stop=None):
+        self.motors = motors
+        self.timeout_ms = timeout_ms
+        self.on_stop = on_stop           # ฟังก์ชันที่เรียกหลัง watchdog สั่งหยุด
+        self.left = 0                    # คำสั่งความเร็วล้อซ้าย/ขวาล่าสุด (-100 ถึง 100)
+        self.right = 0
+        self.active = False              # มีคำสั่งเคลื่อนที่ค้างอยู่ (ต้องต่ออายุเรื่อย ๆ)
+        self.last_ms = time.ticks_ms()   # เวลาที่ได้รับคำสั่งล่าสุด
+        self.stops = 0                   # จำนวนครั้งที่ watchdog สั่งหยุด
+        self.codes = Ring(16)            # รหัสปุ่มจาก IRQ ของ X14 ที่รอ remote_task
+        self._changed = asyncio.ThreadSafeFlag()
+        self._code = asyncio.ThreadSafeFlag()
+
+    # --- คำสั่งความเร็ว: บันทึกเป้าหมายแล้วให้ drive_task เขียน PWM ---
+    def drive(self, left, right):
+        self.left = left
+        self.right = right
+        self.active = True
+        self.last_ms = time.ticks_ms()
+        self._changed.set()
+
+    def fd(self, speed):
+        self.drive(speed, speed)
+
+    def bk(self, speed):
+        self.drive(-speed, -speed)
+
+    def sl(self, speed):
+        self.drive(-speed, speed)
+
+    def sr(self, speed):
+        self.drive(speed, -speed)
+
+    # ต่ออายุ watchdog โดยไม่เปลี่ยนคำสั่ง (เช่น กดปุ่มแขนจับขณะรถยังวิ่ง)
+    def alive(self):
+        self.last_ms = time.ticks_ms()
+
+    # หยุดทันที เขียนมอเตอร์โดยตรง ไม่รอ task ใด
+    def stop(self):
+        self.left = 0
+        self.right = 0
+        self.active = False
+        self.motors.ao()
+
+    # --- task ---
+    async def drive_task(self):
+        while True:
+            await self._changed.wait()
+            if self.active:
+                self.motors.drive(self.left, self.right)
+
+    async def watchdog_task(self, period_ms=10):
+        while True:
+            await asyncio.sleep_ms(period_ms)
+            if self.active and time.ticks_diff(time.ticks_ms(), self.last_ms) > self.timeout_ms:
+                self.stop()
+                self.stops += 1
+                if self.on_stop is not None:
+                    self.on_stop()
+
+    # ส่งให้ X14(on_code=rover.on_code): เรียกจาก IRQ ของ PIO ทุกเฟรม เก็บรหัสลงคิวแล้วปลุก remote_task
+    def on_code(self, code):
+        ring = self.codes
+        i = ring.claim()
+        if i >= 0:
+            ring.buf[i] = code
+            ring.commit()
+        self._code.set()
+
+    # อ่านรหัสปุ่มจาก X14 แล้วส่งให้ Bindings
+    # X14 ที่สร้างด้วย on_code=self.on_code: รอ IRQ ของ PIO (ไม่วนถาม FIFO) ไม่เช่นนั้นอ่าน FIFO ทุก period_ms
+    # เฉพาะปุ่มขับ (fd/bk/sl/sr/drive) ที่ต่ออายุ watchdog ผ่าน drive() ปุ่มแขนจับที่กดค้างจึงไม่ทำให้รถวิ่งต่อเกิน timeout_ms
+    # คืนคิวให้ task อื่นหลังทุกรหัส รหัสที่เข้ามาติด ๆ กันจึงไม่กัน watchdog / drive_task
+    async def remote_task(self, remote, keys, period_ms=5):
+        if remote.on_code == self.on_code:
+            ring = self.codes
+            while True:
+                await self._code.wait()
+                i = ring.peek()
+                while i >= 0:
+                    code = ring.buf[i]
+                    ring.release()
+                    keys.dispatch(code)
+                    await asyncio.sleep_ms(0)
+                    i = ring.peek()
+        while True:
+            code = remote.read()
+            if code < 0:
+                await asyncio.sleep_ms(period_ms)
+            else:
+                keys.dispatch(code)
+                await asyncio.sleep_ms(0)
+
+
+# แขนจับที่ใช้ตัววางแผนการเคลื่อนที่ (ServoPlanner) และรอด้วย await ได้
+class Gripper(ServoPlanner):
+    # เล่นลำดับท่า ((servo, มุม), ...) แล้วรอจนจบ ระหว่างรอ task อื่นยังทำงานต่อ
+    async def run(self, steps):
+        self.play(steps)
+        while self.busy():
+            await asyncio.sleep_ms(self.period_ms)
@@ -0,0 +1,212 @@
+# เซอร์โวของแขน Gripper-X (ขา 18 ยกแขน / 19 คีบ): แปลงมุมเป็นความกว้างพัลส์ (duty_ns) ด้วยตารางที่คำนวณไว้ล่วงหน้า
+# ตารางของแต่ละตัวสร้างจากค่าปรับเทียบ (calibration) ของตัวนั้น: (ns ที่ 0 องศา, ns ที่ 180 องศา, trim องศา)
+# การสั่งมุมจึงเหลือแค่อ่านตาราง 1 ครั้งแล้วเขียน PWM 1 ครั้ง ไม่มีการคูณ/หารระหว่างทำงาน
+#
+#   servos = Servos((18, 19))          # อ่านค่าปรับเทียบจาก servo_cal.json (ถ้าไม่มีใช้ค่ามาตรฐาน)
+#   servos.write(0, 90)                # เซอร์โวตัวแรกไปที่ 90 องศา
+#   servos.write_all(5, 30)            # สั่งทุกตัวพร้อมกันในครั้งเดียว
+#
+# ตัววางแผนการเคลื่อนที่ (ServoPlanner) สำหรับลำดับท่าของแขน
+# แทนที่จะสั่งมุมปลายทางทันทีแล้ว sleep เผื่อเวลา ตัววางแผนจะค่อย ๆ เลื่อน duty_ns ไปหาเป้าหมาย
+# ไม่เกินความเร็วที่กำหนดของเซอร์โวแต่ละตัว (องศา/วินาที) ทุกครั้งที่ tick() ถูกเรียกจาก Timer หรือตัวจัดคิว
+# จึงรู้แน่นอนว่าแขนถึงตำแหน่งเมื่อไร (done()) และโค้ดหลักขับรถต่อได้ระหว่างที่แขนกำลังขยับ
+#
+#   arm = ServoPlanner((18, 19), (5, 30), speed=300)   # เริ่มที่ 5 / 30 องศา, เร็วสุด 300 องศา/วินาที
+#   arm.move(0, 90)                                    # สั่งเป้าหมาย (ไม่รอ)
+#   arm.play(((0, 90), (1, 100), (0, 5)))              # ลำดับท่า: ทำขั้นถัดไปเมื่อขั้นก่อนถึงเป้าหมาย
+#   arm.busy()                                         # ยังขยับ/ยังเล่นลำดับท่าไม่จบ
+#   arm.wait()                                         # รอจนจบ (พัก CPU ระหว่างรอ)
+import json
+import machine
+import micropython
+import time
+from array import array
+from machine import Pin, PWM, Timer
+from mikrorover.board import SERVO1, SERVO2, SERVO_HZ
+
+NS_MIN = 500_000      # 0 องศา = พัลส์ 0.5 ms
+NS_MAX = 2_500_000    # 180 องศา = พัลส์ 2.5 ms
+CAL_FILE = "servo_cal.json"
+
+# ค่าปรับเทียบเริ่มต้น: ขา -> (ns ที่ 0 องศา, ns ที่ 180 องศา, trim องศา)
+CALIBRATION = {
+    SERVO1: (NS_MIN, NS_MAX, 0),
+    SERVO2: (NS_MIN, NS_MAX, 0),
+}
+
+
+# อ่านค่าปรับเทียบที่บันทึกไว้บนบอร์ด {"18": [min_ns, max_ns, trim], ...} ทับค่าเริ่มต้น
+def load_cal(path=CAL_FILE):
+    cal = dict(CALIBRATION)
+    try:
+        with open(path) as f:
+            for pin, v in json.load(f).items():
+                cal[int(pin)] = tuple(v)
+    except (OSError, ValueError):
+        pass
+    return cal
+
+
+def save_cal(cal, path=CAL_FILE):
+    with open(path, "w") as f:
+        json.dump({str(pin): list(v) for pin, v in cal.items()}, f)
+
+
+# ตาราง duty_ns ของมุม 0-180 (res ช่องต่อองศา) มุมที่เลื่อนด้วย trim แล้วเกินช่วงถูกจำกัดไว้ที่ปลายทั้งสองด้าน
+def table(min_ns=NS_MIN, max_ns=NS_MAX, trim=0, res=1):
+    n = 180 * res
+    t = array("l", [0]) * (n + 1)
+    for k in range(n + 1):
+        a = k + trim * res
+        if a < 0: a = 0
+        if a > n: a = n
+        t[k] = min_ns + a * (max_ns - min_ns) // n
+    return t
+
+
+class Servos:
+    # pins = ขาเซอร์โว (50Hz), cal = ค่าปรับเทียบ (None = อ่านจาก CAL_FILE), res = ช่องต่อองศา (2 = ละเอียดครึ่งองศา)
+    def __init__(self, pins=(SERVO1, SERVO2), cal=None, res=1):
+        if cal is None:
+            cal = load_cal()
+        self._n = len(pins)
+        self._res = res
+        self._top = 180 * res
+        self._pwm = []
+        self._tab = []
+        for pin in pins:
+            pwm = PWM(Pin(pin))
+            pwm.freq(SERVO_HZ)
+            self._pwm.append(pwm)
+            self._tab.append(table(*cal.get(pin, (NS_MIN, NS_MAX, 0)), res=res))
+
+    # มุม -> duty_ns ของเซอร์โว i (angle เป็นองศา ถ้า res > 1 ใช้ทศนิยมได้)
+    def ns(self, i, angle):
+        k = int(angle * self._res)
+        if k < 0: k = 0
+        if k > self._top: k = self._top
+        return self._tab[i][k]
+
+    def write(self, i, angle):
+        self._pwm[i].duty_ns(self.ns(i, angle))
+
+    # สั่งทุกตัวในครั้งเดียว (ขา 18/19 อยู่ใน PWM slice เดียวกัน ค่าใหม่จึงเริ่มใช้ในรอบพัลส์ 20 ms เดียวกัน)
+    def write_all(self, *angles):
+        for i in range(self._n):
+            self._pwm[i].duty_ns(self.ns(i, angles[i]))
+
+    def write_ns(self, i, ns):
+        self._pwm[i].duty_ns(ns)
+
+
+class ServoPlanner(Servos):
+    # speed = องศา/วินาที (ตัวเลขเดียวหรือแยกรายตัว), rate_hz = อัตรา tick (เท่ากับความถี่ PWM 50Hz ก็พอ)
+    # timer=False ถ้าจะเรียก tick() เองจากตัวจัดคิว
+    def __init__(self, pins=(SERVO1, SERVO2), angles=(90, 90), speed=300, rate_hz=50, timer=True, cal=None):
+        super().__init__(pins, cal)
+        n = self._n
+        self._rate = rate_hz
+        self.period_ms = 1000 // rate_hz
+        self._cur = array("l", [0] * n)     # duty_ns ที่สั่งอยู่ตอนนี้
+        self._tgt = array("l", [0] * n)     # duty_ns เป้าหมาย
+        self._step = array("l", [0] * n)    # duty_ns สูงสุดที่เลื่อนได้ต่อ tick
+        self.angle = list(angles)           # มุมเป้าหมายล่าสุด (องศา)
+        self._seq = None                    # ลำดับท่าที่กำลังเล่น
+        self._pos = 0
+        for i in range(n):
+            self.speed(i, speed[i] if isinstance(speed, (tuple, list)) else speed)
+            self.set(i, angles[i])
+        self._timer = Timer(-1) if timer else None
+        self.start()
+
+    def start(self):
+        if self._timer is not None:
+            self._timer.init(mode=Timer.PERIODIC, freq=self._rate, callback=self._irq)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.deinit()
+
+    # ความเร็วสูงสุดของเซอร์โว i (องศา/วินาที)
+    def speed(self, i, deg_s):
+        tab = self._tab[i]
+        self._step[i] = max(1, int(deg_s * abs(tab[self._top] - tab[0])) // 180 // self._rate)
+
+    # ไปที่มุมทันที (ไม่จำกัดความเร็ว) ใช้ตอนเริ่มโปรแกรม
+    def set(self, i, angle):
+        ns = self.ns(i, angle)
+        self.angle[i] = angle
+        self._cur[i] = ns
+        self._tgt[i] = ns
+        self._pwm[i].duty_ns(ns)
+
+    # ตั้งมุมเป้าหมาย แล้วให้ tick() เลื่อนไปหาตามความเร็วที่กำหนด
+    def move(self, i, angle):
+        self.angle[i] = angle
+        self._tgt[i] = self.ns(i, angle)
+
+    def nudge(self, i, delta):
+        self.move(i, min(180, max(0, self.angle[i] + delta)))
+
+    # เล่นลำดับท่า ((servo, มุม), ...) แต่ละขั้นเริ่มเมื่อเซอร์โวทุกตัวถึงเป้าหมายของขั้นก่อน
+    # ปิด IRQ ระหว่างเปลี่ยนลำดับ ไม่ให้ tick() จาก Timer เห็นลำดับใหม่คู่กับ _pos ของลำดับเดิม
+    def play(self, steps):
+        irq = machine.disable_irq()
+        self._pos = 0
+        self._seq = steps
+        self._next()
+        machine.enable_irq(irq)
+
+    def _next(self):
+        seq = self._seq
+        if self._pos >= len(seq):
+            self._seq = None
+            return
+        i, angle = seq[self._pos]
+        self._pos += 1
+        self.move(i, angle)
+
+    # เซอร์โว i (หรือทุกตัวเมื่อ i = -1) ถึงเป้าหมายแล้ว
+    def done(self, i=-1):
+        if i >= 0:
+            return self._cur[i] == self._tgt[i]
+        for k in range(self._n):
+            if self._cur[k] != self._tgt[k]:
+                return False
+        return True
+
+    def busy(self):
+        return self._seq is not None or not self.done()
+
+    # รอจนแขนหยุดและลำดับท่าจบ (พัก CPU ระหว่างรอ) คืนค่า False ถ้าครบ timeout_ms ก่อน
+    def wait(self, timeout_ms=-1):
+        t0 = time.ticks_ms()
+        while self.busy():
+            if timeout_ms >= 0 and time.ticks_diff(time.ticks_ms(), t0) >= timeout_ms:
+                return False
+            machine.idle()
+        return True
+
+    def _irq(self, t):
+        self.tick()
+
+    # เริ่มขั้นถัดไปของลำดับท่าถ้าขั้นก่อนถึงเป้าหมายแล้ว (ให้เวลาเซอร์โว 1 tick ตามพัลส์สุดท้ายทัน)
+    # แล้วเลื่อน duty_ns ของทุกตัวเข้าหาเป้าหมาย 1 ก้าว
+    @micropython.native
+    def tick(self):
+        cur = self._cur
+        tgt = self._tgt
+        step = self._step
+        if self._seq is not None and self.done():
+            self._next()
+        for i in range(self._n):
+            d = tgt[i] - cur[i]
+            if d == 0:
+                continue
+            s = step[i]
+            if d > s:
+                d = s
+            elif d < -s:
+                d = -s
+            cur[i] += d
+            self._pwm[i].duty_ns(cur[i])
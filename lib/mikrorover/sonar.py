@@ -0,0 +1,92 @@
+# ตัวอ่านเซนเซอร์วัดระยะ ZX-SONAR1M (ADC แชนเนล 1 / ขา 27) แบบกรองสัญญาณรบกวน
+# Timer อ่าน ADC เป็นชุด (burst) ด้วยอัตราคงที่ เฉลี่ยแต่ละชุด (oversampling) แล้วเก็บลงบัฟเฟอร์วงแหวน (ring buffer)
+# จากนั้นกรองด้วยค่ามัธยฐาน (median) หรือค่าเฉลี่ยเคลื่อนที่แบบเอ็กซ์โปเนนเชียล (EMA)
+# โค้ดหลักอ่านผลล่าสุดจากแอตทริบิวต์ได้ทันที ไม่ต้องรอการแปลง ADC
+#
+#   sonar = Sonar()              # เริ่มอ่านอัตโนมัติ 200 ครั้ง/วินาที
+#   sonar.cm                     # ระยะทางที่กรองแล้ว (ซม.)
+#   sonar.noise_cm               # ความแกว่งของค่าในบัฟเฟอร์ (ซม.) บอกความน่าเชื่อถือของค่า
+#   sonar.t_ms                   # เวลา (ticks_ms) ที่อัปเดตค่าล่าสุด
+#   sonar.t_us                   # เวลาเดียวกันแบบ ticks_us (ใช้วัดเวลาตอบสนอง)
+import micropython
+import time
+from array import array
+from machine import ADC, Pin, Timer
+from mikrorover.board import SONAR
+
+CM_DIV = 640       # ระยะทาง (ซม.) = ค่า ADC 16 บิต // 640 (เท่ากับค่า 10 บิต / 10)
+
+
+class Sonar:
+    # size = จำนวนชุดในบัฟเฟอร์ที่ใช้กรอง, ema_shift > 0 = ใช้ EMA แทน median (น้ำหนัก 1/2^ema_shift)
+    def __init__(self, pin=SONAR, rate_hz=200, burst=4, size=7, ema_shift=0):
+        self._adc = ADC(Pin(pin))
+        self._burst = burst
+        self._n = size
+        self._ring = array("H", bytes(2 * size))
+        self._sorted = array("H", bytes(2 * size))   # พื้นที่สำหรับเรียงค่า (จองไว้ล่วงหน้า ไม่สร้างใหม่ใน IRQ)
+        self._i = 0
+        self._count = 0
+        self._ema_shift = ema_shift
+        self._ema = 0
+        self.raw = 0          # ค่า ADC ที่กรองแล้ว (0-65535)
+        self.cm = 0           # ระยะทางที่กรองแล้ว (ซม.)
+        self.noise_cm = 0     # ค่าสูงสุด - ต่ำสุดในบัฟเฟอร์ (ซม.)
+        self.t_ms = time.ticks_ms()
+        self.t_us = time.ticks_us()
+        self.samples = 0      # จำนวนชุดที่อ่านไปแล้ว
+        self._rate = rate_hz
+        self._timer = Timer(-1)
+        self.start()
+
+    def start(self):
+        self._timer.init(mode=Timer.PERIODIC, freq=self._rate, callback=self._tick)
+
+    def stop(self):
+        self._timer.deinit()
+
+    # มีข้อมูลครบบัฟเฟอร์แล้วหรือยัง (ก่อนครบ ค่าที่กรองได้มาจากข้อมูลน้อยกว่า size ชุด)
+    def ready(self):
+        return self._count >= self._n
+
+    # อายุของค่าล่าสุด (ms) ใช้ตรวจว่าเซนเซอร์ยังอัปเดตอยู่
+    def age_ms(self):
+        return time.ticks_diff(time.ticks_ms(), self.t_ms)
+
+    @micropython.native
+    def _tick(self, t):
+        adc = self._adc
+        s = 0
+        for _ in range(self._burst):
+            s += adc.read_u16()
+        x = s // self._burst
+        ring = self._ring
+        n = self._n
+        ring[self._i] = x
+        self._i = (self._i + 1) % n
+        if self._count < n:
+            self._count += 1
+        count = self._count
+        # เรียงค่าในบัฟเฟอร์ (insertion sort ขนาดเล็ก) ได้ทั้ง median และค่าต่ำสุด/สูงสุด
+        srt = self._sorted
+        for k in range(count):
+            v = ring[k]
+            j = k
+            while j > 0 and srt[j - 1] > v:
+                srt[j] = srt[j - 1]
+                j -= 1
+            srt[j] = v
+        if self._ema_shift:
+            if self.samples == 0:
+                self._ema = x
+            else:
+                self._ema += (x - self._ema) >> self._ema_shift
+            value = self._ema
+        else:
+            value = srt[count // 2]
+        self.raw = value
+        self.cm = value // CM_DIV
+        self.noise_cm = (srt[count - 1] - srt[0]) // CM_DIV
+        self.t_ms = time.ticks_ms()
+        self.t_us = time.ticks_us()
+        self.samples += 1
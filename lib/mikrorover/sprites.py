@@ -0,0 +1,155 @@
+# ข้อความคงที่และตัวเลขบนจอ OLED ที่เรนเดอร์เป็นภาพเล็ก ๆ (sprite) ไว้ล่วงหน้าครั้งเดียว
+# display.text() วาดตัวอักษรจากฟอนต์ทีละจุดทุกครั้งที่เรียก ป้ายที่ไม่เคยเปลี่ยน ("Dist (cm):", "SV2 (GP19):") จึงถูกวาดซ้ำทุกเฟรม
+# Sprite เก็บภาพแบบ MONO_VLSB (1 ไบต์ = 1 คอลัมน์สูง 8 จุด) รูปแบบเดียวกับหน่วยความจำของจอ SSD1306
+# draw() จึงคัดลอกไบต์ลงบัฟเฟอร์ของจอตรง ๆ (y ที่ไม่ลงตัวกับ 8 เลื่อนบิตแล้วแบ่งลง 2 page) แทนการวาดทีละจุด
+# จอที่ไม่มี buffer แบบ SSD1306 หรือตำแหน่งที่ล้นขอบจอใช้ FrameBuffer.blit() แทน
+# sprite ทึบทั้งแถบสูง 8 จุด (พื้นหลังถูกวาดด้วย) จึงวาดทับของเดิมได้เลยไม่ต้องล้างพื้นที่ก่อน
+#
+#   label("Dist (cm):").draw(display, 0, 10)  # ป้ายคงที่: วาดครั้งเดียวตอนเริ่ม
+#   dist = NumericField(display, 0, 25, 4)    # ตัวเลข 4 หลักชิดขวา (left=True ชิดซ้าย)
+#   while True:
+#       dist.set(sonar.cm)                    # วาดใหม่เฉพาะหลักที่เปลี่ยน
+#       display.show()                        # OLED ส่งเฉพาะคอลัมน์ที่เปลี่ยน
+import framebuf
+import micropython
+
+from mikrorover.textbuf import CHARS, TextBuf
+
+_SPACE = 32
+_HASH = 35
+_NONE = 255
+
+
+# วางคอลัมน์ src[off:off + w] ลงบัฟเฟอร์จอ MONO_VLSB (กว้าง stride สูง height) ที่ (x, y) ทึบทั้งแถบสูง 8 จุด
+@micropython.native
+def _put(dst, stride, height, src, off, w, x, y):
+    lo = (y >> 3) * stride + x
+    s = y & 7
+    if s == 0:
+        for i in range(w):
+            dst[lo + i] = src[off + i]
+        return
+    m = (1 << s) - 1
+    for i in range(w):
+        dst[lo + i] = (dst[lo + i] & m) | ((src[off + i] << s) & 0xFF)
+    if y + 8 > height:
+        return
+    hi = lo + stride
+    r = 8 - s
+    for i in range(w):
+        dst[hi + i] = ((dst[hi + i] >> s) << s) | (src[off + i] >> r)
+
+
+def _draw(d, src, off, w, x, y, fb):
+    buf = getattr(d, "buffer", None)
+    if buf is None or x < 0 or y < 0 or x + w > d.width or y >= d.height:
+        d.blit(fb, x, y)
+    else:
+        _put(buf, d.width, d.height, src, off, w, x, y)
+
+
+class Sprite:
+    # ภาพกว้าง w จุด สูง 8 จุด วาดลงได้เองผ่าน fb (FrameBuffer)
+    def __init__(self, w):
+        self.w = w
+        self.buf = bytearray(w)
+        self.fb = framebuf.FrameBuffer(self.buf, w, 8, framebuf.MONO_VLSB)
+
+    def draw(self, d, x, y):
+        _draw(d, self.buf, 0, self.w, x, y, self.fb)
+        return self.w
+
+
+# ข้อความคงที่เป็น sprite (c=0 ตัวอักษรดำบนพื้นขาว)
+def label(text, c=1):
+    sp = Sprite(8 * len(text))
+    if not c:
+        sp.fb.fill(1)
+    sp.fb.text(text, 0, 0, c)
+    return sp
+
+
+# sprite ของตัวอักษรแต่ละตัวในบัฟเฟอร์เดียว (ตัวละ 8 ไบต์) ค้นจากรหัส ASCII ด้วยตาราง
+class Glyphs:
+    def __init__(self, chars="0123456789- ", c=1):
+        self.buf = bytearray(8 * len(chars))
+        self._index = bytearray([_NONE]) * 95      # รหัส 32-126 -> ลำดับใน buf
+        self._fbs = []
+        mv = memoryview(self.buf)
+        for k in range(len(chars)):
+            fb = framebuf.FrameBuffer(mv[8 * k:8 * k + 8], 8, 8, framebuf.MONO_VLSB)
+            if not c:
+                fb.fill(1)
+            fb.text(chars[k], 0, 0, c)
+            self._fbs.append(fb)
+            self._index[ord(chars[k]) - 32] = k
+
+    # วาดตัวอักษรรหัส b ที่ (x, y) คืนค่า False ถ้าไม่มีตัวนี้ในแคช
+    def draw(self, d, b, x, y):
+        k = self._index[b - 32] if 32 <= b < 127 else _NONE
+        if k == _NONE:
+            return False
+        _draw(d, self.buf, 8 * k, 8, x, y, self._fbs[k])
+        return True
+
+
+_digits = None
+
+
+# แคชตัวเลขที่ใช้ร่วมกัน (สร้างครั้งแรกที่เรียก)
+def digits():
+    global _digits
+    if _digits is None:
+        _digits = Glyphs()
+    return _digits
+
+
+# ช่องตัวเลขกว้าง width ตัวอักษรที่ (x, y) ชิดขวา (left=True ชิดซ้าย) จำหลักที่วาดอยู่บนจอไว้ set() จึงวาดใหม่เฉพาะหลักที่เปลี่ยน
+# ค่าที่ยาวเกินช่องแสดงเป็น "#" เต็มช่อง ตัวอักษรที่ไม่มีในแคช (glyphs) วาดด้วย text() ตามปกติ
+class NumericField:
+    def __init__(self, display, x, y, width, glyphs=None, left=False):
+        self.display = display
+        self.x = x
+        self.y = y
+        self.width = width
+        self.left = left
+        self.glyphs = glyphs or digits()
+        self.value = None
+        self.redrawn = 0                      # จำนวนหลักที่วาดใหม่ทั้งหมด
+        self._text = TextBuf(width + 12)
+        self._shown = bytearray(width)        # รหัสตัวอักษรที่อยู่บนจอ (0 = ยังไม่ได้วาด)
+
+    # แสดงค่า v คืนค่าจำนวนหลักที่วาดใหม่
+    def set(self, v):
+        if v == self.value:
+            return 0
+        self.value = v
+        t = self._text
+        t.clear()
+        if self.left:
+            t.num(v)
+            t.pad(self.width)
+        else:
+            t.num(v, self.width)
+        over = t.n > self.width
+        n = 0
+        for i in range(self.width):
+            b = _HASH if over else t.buf[i]
+            if b != self._shown[i]:
+                self._glyph(b, self.x + 8 * i)
+                self._shown[i] = b
+                n += 1
+        self.redrawn += n
+        return n
+
+    # ให้ set() ครั้งถัดไปวาดทุกหลัก (เช่นหลังล้างจอด้วย fill)
+    def invalidate(self):
+        self.value = None
+        for i in range(self.width):
+            self._shown[i] = 0
+
+    def _glyph(self, b, x):
+        if not self.glyphs.draw(self.display, b, x, self.y):
+            d = self.display
+            d.fill_rect(x, self.y, 8, 8, 0)
+            d.text(CHARS[b - 32], x, self.y, 1)
@@ -0,0 +1,124 @@
+# ข้อความที่ประกอบในบัฟเฟอร์ไบต์ที่จองไว้ครั้งเดียว ใช้แทน "Dist: " + str(d) + " cm" / f-string ในลูปที่วิ่งทุกรอบ
+# การต่อ str หรือ str(ตัวเลข) สร้างออบเจกต์ใหม่ทุกรอบ ฮีปจึงเต็มเร็วและ GC หยุดลูปควบคุมเป็นช่วง ๆ (jitter)
+# num() / hex() เขียนตัวเลขลง bytearray ตรง ๆ ด้วยการหารจำนวนเต็ม (int เล็กไม่จองหน่วยความจำ) put() คัดลอกจาก bytes คงที่
+# FrameBuffer.text() รับเฉพาะ str/bytes (ไม่รับ bytearray) draw() จึงวาดทีละตัวอักษรด้วยตาราง str 1 ตัวอักษรที่สร้างไว้ตอน import
+# write() ส่งออก REPL ด้วย memoryview ที่ตัดความยาวไว้ล่วงหน้าทุกขนาด (การตัด memoryview ทุกรอบก็จองหน่วยความจำ)
+#
+#   t = TextBuf(16)
+#   t.clear()
+#   t.put(b"Dist: ")
+#   t.num(distance)
+#   t.put(b" cm")
+#   t.draw(display, 0, 25)          # หรือ t.write() พิมพ์ออก REPL พร้อมขึ้นบรรทัดใหม่
+#   draw_int(display, angle, 0, 25) # ตัวเลขตัวเดียว (ใช้บัฟเฟอร์กลางของโมดูล)
+import sys
+
+CHARS = tuple(chr(c) for c in range(32, 127))   # " " ถึง "~" ตัวอื่นวาดเป็น "?"
+_HEX = b"0123456789ABCDEF"
+_SPACE = 32
+_MINUS = 45
+_NL = 10
+
+
+class TextBuf:
+    # size = จำนวนตัวอักษรสูงสุด (เกินนี้ตัดทิ้ง)
+    def __init__(self, size=21):
+        self.buf = bytearray(size + 1)        # เผื่อ 1 ไบต์สำหรับขึ้นบรรทัดใหม่ตอน write()
+        self.size = size
+        self.n = 0
+        mv = memoryview(self.buf)
+        self._views = [mv[:k] for k in range(size + 2)]
+
+    def clear(self):
+        self.n = 0
+
+    # ต่อท้ายด้วย bytes (เช่น b"Dist: ")
+    def put(self, s):
+        buf = self.buf
+        n = self.n
+        for i in range(len(s)):
+            if n >= self.size:
+                break
+            buf[n] = s[i]
+            n += 1
+        self.n = n
+
+    # เติมช่องว่างจนถึงคอลัมน์ col (จัดชิดซ้ายแบบ "%-15s")
+    def pad(self, col):
+        if col > self.size:
+            col = self.size
+        while self.n < col:
+            self.buf[self.n] = _SPACE
+            self.n += 1
+
+    # ต่อท้ายด้วยเลขฐานสิบ width > 0 จัดชิดขวาด้วยช่องว่างแบบ "%3d"
+    def num(self, v, width=0):
+        neg = v < 0
+        if neg:
+            v = -v
+        digits = 1
+        t = v
+        while t >= 10:
+            t //= 10
+            digits += 1
+        k = digits + neg
+        while k < width and self.n < self.size:
+            self.buf[self.n] = _SPACE
+            self.n += 1
+            width -= 1
+        if neg and self.n < self.size:
+            self.buf[self.n] = _MINUS
+            self.n += 1
+        self._digits(v, digits, 10)
+
+    # ต่อท้ายด้วยเลขฐานสิบหก digits หลัก (ตัวพิมพ์ใหญ่ เติม 0 ข้างหน้าแบบ "%04X")
+    def hex(self, v, digits=4):
+        self._digits(v, digits, 16)
+
+    # เขียนตัวเลข digits หลักจากหลักท้ายย้อนกลับ หลักที่เกิน size ถูกตัดทิ้ง
+    def _digits(self, v, digits, base):
+        buf = self.buf
+        end = self.n + digits
+        i = end - 1
+        while i >= self.n:
+            if i < self.size:
+                buf[i] = _HEX[v % base]
+            v //= base
+            i -= 1
+        self.n = end if end < self.size else self.size
+
+    # วาดลง FrameBuffer ที่ (x, y) ตัวอักษรละ 8 พิกเซล คืนค่าความกว้างที่วาด (พิกเซล)
+    def draw(self, fb, x, y, c=1):
+        buf = self.buf
+        for i in range(self.n):
+            b = buf[i]
+            fb.text(CHARS[b - 32] if 32 <= b < 127 else "?", x + 8 * i, y, c)
+        return 8 * self.n
+
+    # พิมพ์ออก REPL (nl=True ขึ้นบรรทัดใหม่ด้วย)
+    def write(self, nl=True):
+        n = self.n
+        if nl:
+            self.buf[n] = _NL
+            n += 1
+        view = self._views[n]
+        try:
+            sys.stdout.write(view)
+        except TypeError:
+            # stdout ของ CPython (ตัวจำลองบนคอมพิวเตอร์) รับเฉพาะ str
+            sys.stdout.write(str(view, "ascii"))
+
+    # สำเนาเป็น str (จองหน่วยความจำ ใช้ตรวจค่า/ดีบักเท่านั้น)
+    def text(self):
+        return str(self._views[self.n], "ascii")
+
+
+_scratch = TextBuf(12)
+
+
+# วาดเลขฐานสิบตัวเดียวที่ (x, y) โดยไม่สร้าง str คืนค่าความกว้างที่วาด (พิกเซล)
+# ใช้บัฟเฟอร์กลางของโมดูล จึงเรียกจากงานเดียว (ห้ามเรียกพร้อมกันจากสองคอร์หรือจาก IRQ)
+def draw_int(fb, v, x, y, c=1, width=0):
+    _scratch.clear()
+    _scratch.num(v, width)
+    return _scratch.draw(fb, x, y, c)
@@ -0,0 +1,214 @@
+# ตัวรับสัญญาณจอย Wireless-X14 (UART 9600 ผ่าน PIO ที่ขา D3 / GPIO 12)
+# จอยส่งรหัสปุ่มเป็นเฟรมละ 2 ไบต์ (ไบต์สูงก่อน) ทุก ๆ ประมาณ 50 ms ขณะกดค้าง
+# ตัวถอดรหัส (X14Decoder) จับคู่ไบต์ด้วยกติกาของรหัสจริง: ไบต์ต่ำเป็นเลขคี่เสมอ ส่วนไบต์สูงเป็นเลขคู่เสมอ
+# ถ้าไบต์หายหรือมีไบต์แปลกปลอม จะรู้ทันทีและกลับเข้าจังหวะเองในเฟรมถัดไป (resync)
+# ค่าเริ่มต้นใช้โปรแกรม PIO uart_rx16 ที่ตรวจ start/stop bit และประกอบเฟรม 2 ไบต์เองใน PIO
+# แล้วส่งรหัส 16 บิตเข้า FIFO ครั้งเดียวต่อเฟรม CPU จึงอ่าน FIFO แค่ครั้งเดียวต่อการกดปุ่ม 1 ครั้ง
+#
+#   remote = X14()
+#   code = remote.read()      # รหัสปุ่ม 16 บิต หรือ -1 ถ้ายังไม่มีเฟรมใหม่
+#   remote = X14(on_code=f)   # ให้ PIO แจ้ง IRQ เมื่อได้เฟรม แล้วเรียก f(code) (ไม่ต้องวนอ่านเอง)
+#   remote = X14(wide=False)  # โปรแกรม uart_rx เดิม (ทีละไบต์ จับคู่ไบต์ด้วย X14Decoder)
+#   remote = X14(codes=None)  # รับทุกรหัส ไม่ตรวจกับตาราง BUTTONS (หารหัสของจอยตัวใหม่ ดู Listing 8-1)
+#
+#   keys = Bindings()
+#   keys.bind(LU, fd, 50)     # ผูกรหัสปุ่มกับฟังก์ชัน (และอาร์กิวเมนต์) ล่วงหน้า
+#   keys.dispatch(code)       # เรียกฟังก์ชันของปุ่มด้วยการค้นหาครั้งเดียว
+import rp2
+from machine import Pin
+from micropython import const
+from mikrorover.board import X14_RX, X14_BAUD
+
+# รหัสปุ่ม (ค่าหลังจาก PIO เลื่อนบิตเข้าทางซ้ายแล้ว) รหัสของจอยแต่ละตัวอาจต่างกันได้
+LU = const(0x0011)
+LL = const(0x0021)
+LD = const(0x0081)
+LR = const(0x0041)
+RU = const(0x1001)
+RL = const(0x4001)
+RD = const(0x8001)
+RR = const(0x2001)
+L1 = const(0x0009)
+L2 = const(0x0005)
+LT = const(0x0003)
+R1 = const(0x0801)
+R2 = const(0x0401)
+RT = const(0x0201)
+IDLE = const(0x0001)   # เฟรมที่ไม่มีปุ่มใดถูกกด
+
+# ตารางรหัสปุ่ม -> ชื่อปุ่ม
+BUTTONS = {
+    LU: "LU", LL: "LL", LD: "LD", LR: "LR",
+    RU: "RU", RL: "RL", RD: "RD", RR: "RR",
+    L1: "L1", L2: "L2", LT: "LT",
+    R1: "R1", R2: "R2", RT: "RT",
+}
+
+
+# โปรแกรม PIO รับ UART: รอ start bit แล้วอ่าน 8 บิตกลางบิต (8 รอบสัญญาณนาฬิกาต่อบิต)
+@rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT, autopush=True, push_thresh=8)
+def uart_rx():
+    wait(0, pin, 0)         # รอสัญญาณเริ่ม (Start Bit เป็น 0)
+    set(x, 7)       [10]    # เตรียมวนลูปรับข้อมูล 8 บิต และรอให้ถึงกลางบิตแรก
+    label("bit_loop")
+    in_(pins, 1)            # อ่านข้อมูลเข้ามา 1 บิต
+    nop()           [5]     # รอจังหวะเวลา (ให้ตรงกับความเร็ว)
+    jmp(x_dec, "bit_loop")
+
+
+# โปรแกรม PIO รับเฟรม X14 ทั้งเฟรม: 2 ไบต์ติดกัน ตรวจ stop bit ของทั้งสองไบต์ (jmp_pin = ขาเดียวกับ in_base)
+# ไบต์ที่สองต้องเริ่มภายใน 8 บิตหลังไบต์แรก ไม่เช่นนั้นถือว่าไบต์หาย ทิ้งทั้งเฟรม แล้วรอ start bit ใหม่
+# เฟรมที่ครบส่ง 16 บิตเข้า FIFO ครั้งเดียว (FIFO เต็มก็ทิ้งเฟรมแทนการหยุดรอจนพลาดบิต) แล้วตั้ง IRQ ของ state machine นี้
+@rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT, autopush=False, push_thresh=16)
+def uart_rx16():
+    label("start")
+    wait(0, pin, 0)         # start bit ของไบต์สูง
+    set(x, 7)       [10]    # ไปกลางบิตแรก
+    label("hi_bit")
+    in_(pins, 1)
+    jmp(x_dec, "hi_bit") [6]    # 8 รอบสัญญาณนาฬิกาต่อบิต
+    jmp(pin, "hi_stop")     # stop bit ต้องเป็น 1
+    jmp("bad")
+    label("hi_stop")
+    set(y, 31)              # รอ start bit ของไบต์ต่ำไม่เกิน 32 x 2 รอบ (8 บิต)
+    label("gap")
+    jmp(pin, "idle")
+    set(x, 7)       [10]    # เจอ start bit ของไบต์ต่ำ
+    label("lo_bit")
+    in_(pins, 1)
+    jmp(x_dec, "lo_bit") [6]
+    jmp(pin, "good")
+    label("bad")
+    mov(isr, null)          # ทิ้งบิตที่รับมาแล้ว
+    wait(1, pin, 0)         # รอสายว่างก่อนหา start bit ใหม่
+    jmp("start")
+    label("idle")
+    jmp(y_dec, "gap")
+    jmp("bad")              # ไบต์ต่ำไม่มา
+    label("good")
+    push(noblock)
+    irq(rel(0))
+
+
+class X14Decoder:
+    # codes=None ไม่ตรวจกับตาราง รับทุกรหัสที่ประกอบเฟรมได้ (ใช้หารหัสของจอยที่ไม่ตรงกับ BUTTONS)
+    def __init__(self, codes=BUTTONS):
+        self._codes = codes     # รหัสที่ถูกต้องมีจำนวนน้อยและรู้ล่วงหน้า (รวม IDLE)
+        self._hi = -1           # ไบต์สูงที่รอคู่ (-1 = กำลังรอไบต์สูง)
+        self._resync = False    # เพิ่งทิ้งไบต์เพื่อกลับเข้าจังหวะ
+        self.frames = 0         # เฟรมที่ถูกต้อง
+        self.dropped = 0        # ไบต์ที่ทิ้งไปเพราะหลุดจังหวะ (ไบต์หาย/ไบต์แปลกปลอม)
+        self.invalid = 0        # เฟรมครบ 2 ไบต์ แต่รหัสไม่อยู่ในตาราง
+        self.recovered = 0      # เฟรมถูกต้องเฟรมแรกหลังการ resync
+
+    # ป้อนทีละไบต์ คืนค่ารหัส 16 บิตเมื่อครบเฟรมที่ถูกต้อง ไม่เช่นนั้นคืน -1
+    def feed(self, b):
+        hi = self._hi
+        if hi < 0:
+            if b & 1:                   # ไบต์ต่ำมาโดยไม่มีไบต์สูง: ทิ้ง แล้วรอไบต์สูงใหม่
+                self.dropped += 1
+                self._resync = True
+            else:
+                self._hi = b
+            return -1
+        if not b & 1:                   # ไบต์สูงซ้ำ: ไบต์ต่ำของเฟรมก่อนหาย ใช้ไบต์นี้เป็นไบต์สูงแทน
+            self.dropped += 1
+            self._resync = True
+            self._hi = b
+            return -1
+        self._hi = -1
+        code = (hi << 8) | b
+        if self._codes is not None and code != IDLE and code not in self._codes:
+            self.invalid += 1
+            self._resync = True
+            return -1
+        self.frames += 1
+        if self._resync:
+            self.recovered += 1
+            self._resync = False
+        return code
+
+    # ตรวจรหัสที่ PIO ประกอบครบเฟรมแล้ว (uart_rx16) คืนค่ารหัส หรือ -1 ถ้าไม่อยู่ในตาราง
+    def word(self, code):
+        if self._codes is not None and code != IDLE and code not in self._codes:
+            self.invalid += 1
+            self._resync = True
+            return -1
+        self.frames += 1
+        if self._resync:
+            self.recovered += 1
+            self._resync = False
+        return code
+
+    def reset(self):
+        self._hi = -1
+        self._resync = False
+
+    def stats(self):
+        return self.frames, self.dropped, self.invalid, self.recovered
+
+
+class X14:
+    # wide=True ใช้ uart_rx16 (1 คำใน FIFO ต่อเฟรม) wide=False ใช้ uart_rx เดิม (1 คำต่อไบต์)
+    # on_code = ฟังก์ชันที่ถูกเรียกจาก IRQ ของ PIO ทุกเฟรมที่ถูกต้อง (ใช้ได้เฉพาะ wide=True)
+    def __init__(self, pin=X14_RX, baud=X14_BAUD, sm_id=0, codes=BUTTONS, wide=True, on_code=None):
+        rx = Pin(pin, Pin.IN, Pin.PULL_UP)
+        if wide:
+            self.sm = rp2.StateMachine(sm_id, uart_rx16, freq=8 * baud, in_base=rx, jmp_pin=rx)
+        else:
+            self.sm = rp2.StateMachine(sm_id, uart_rx, freq=8 * baud, in_base=rx)
+        self.wide = wide
+        self.decoder = X14Decoder(codes)
+        self.on_code = on_code
+        if wide and on_code is not None:
+            self.sm.irq(self._irq)
+        self.sm.active(1)
+
+    # อ่านเฟรมที่ค้างใน FIFO จนได้เฟรมที่ถูกต้อง 1 เฟรม คืนค่ารหัส หรือ -1 ถ้ายังไม่ครบเฟรม
+    def read(self):
+        sm = self.sm
+        if self.wide:
+            word = self.decoder.word
+            while sm.rx_fifo():
+                code = word(sm.get() & 0xFFFF)
+                if code >= 0:
+                    return code
+            return -1
+        feed = self.decoder.feed
+        while sm.rx_fifo():
+            code = feed(sm.get() & 0xFF)
+            if code >= 0:
+                return code
+        return -1
+
+    def _irq(self, sm):
+        code = self.read()
+        while code >= 0:
+            self.on_code(code)
+            code = self.read()
+
+
+# ตารางผูกรหัสปุ่มกับคำสั่ง: รหัส 16 บิต -> (ฟังก์ชัน, อาร์กิวเมนต์) ที่สร้างไว้ตอน bind()
+# dispatch() ค้นหาครั้งเดียวแล้วเรียกฟังก์ชันทันที ไม่ว่าจะผูกไว้กี่ปุ่ม และไม่จองหน่วยความจำใหม่
+class Bindings:
+    def __init__(self):
+        self._map = {}
+
+    # ผูกปุ่ม code กับ fn(arg) (หรือ fn() ถ้าไม่ระบุ arg)
+    def bind(self, code, fn, arg=None):
+        self._map[code] = (fn, arg)
+
+    def unbind(self, code):
+        self._map.pop(code, None)
+
+    # เรียกคำสั่งของปุ่ม คืนค่า True ถ้ามีคำสั่งผูกไว้
+    def dispatch(self, code):
+        action = self._map.get(code)
+        if action is None:
+            return False
+        fn, arg = action
+        if arg is None:
+            fn()
+        else:
+            fn(arg)
+        return True
@@ -0,0 +1,79 @@
+# บันทึกไบต์ดิบจากจอย Wireless-X14 พร้อมเวลา (us) ลงไฟล์ เพื่อนำไปเล่นซ้ำบนตัวจำลองด้วย host/replay.py
+# ไม่ต้องมีคนถือจอยทุกครั้งที่ทดสอบตัวถอดรหัสหรือวัดเวลาตอบสนอง: บันทึกครั้งเดียวแล้วเล่นซ้ำได้เสมอ
+# รูปแบบไฟล์ (little-endian): หัวไฟล์ HEADER 1 ครั้ง แล้วตามด้วยระเบียน RECORD ไบต์ละ 1 ระเบียน
+#   HEADER "<4sBBHI"  b"X14C", เวอร์ชัน, ขารับ, 0 (สำรอง), baud
+#   RECORD "<IB"      เวลาที่อ่านไบต์ออกจาก FIFO (us นับจากเริ่มบันทึก), ไบต์ตามที่ uart_rx ให้มา (ลำดับบิตเดียวกับ BUTTONS)
+#                     เวลาเก็บแค่ 32 บิต วนกลับเป็น 0 ทุก ~71.6 นาที host/replay.py คลายกลับเป็นเวลาต่อเนื่องตอนอ่านไฟล์
+# เวลาในไฟล์ช้ากว่าจบ stop bit ไม่เกินหนึ่งรอบของ poll() จึงควรเรียก poll() ถี่ ๆ (run() วนเรียกตลอด)
+# เขียนลงแฟลชเมื่อบัฟเฟอร์เกินครึ่งและสายว่างอยู่ (ช่วงห่างระหว่างเฟรม) เพื่อไม่ให้ FIFO ล้นระหว่างเขียนไฟล์
+#
+#   cap = Capture("x14.cap")
+#   cap.run(60000)            # บันทึก 60 วินาทีแล้วปิดไฟล์ (หรือเรียก cap.poll() ในลูปของตัวเองแล้ว cap.close())
+import struct
+import time
+
+from mikrorover.board import X14_RX, X14_BAUD
+from mikrorover.x14 import X14
+
+MAGIC = b"X14C"
+VERSION = 1
+HEADER = "<4sBBHI"
+RECORD = "<IB"
+RECORD_SIZE = 5
+GAP_US = 5000      # สายว่างนานเท่านี้ถือว่าอยู่ระหว่างเฟรม (จอยส่งเฟรมทุก ~50 ms) เขียนไฟล์ได้
+
+
+class Capture:
+    # records = จำนวนระเบียนในบัฟเฟอร์ (จองไว้ครั้งเดียว)
+    def __init__(self, path, pin=X14_RX, baud=X14_BAUD, sm_id=0, records=256):
+        self.x14 = X14(pin, baud, sm_id, wide=False)
+        self._buf = bytearray(records * RECORD_SIZE)
+        self._mv = memoryview(self._buf)
+        self._n = 0
+        self._half = records // 2
+        self._f = open(path, "wb")
+        self._f.write(struct.pack(HEADER, MAGIC, VERSION, pin, 0, baud))
+        self.count = 0          # จำนวนไบต์ที่บันทึก
+        self.flushes = 0
+        self._last = time.ticks_us()
+        self._t = 0             # เวลาสะสมตั้งแต่เริ่ม (us) ตัดเหลือ 32 บิตตามช่องในระเบียน
+
+    # ย้ายไบต์ที่ค้างใน FIFO ลงบัฟเฟอร์ คืนค่าจำนวนไบต์ที่ได้ในรอบนี้
+    def poll(self):
+        sm = self.x14.sm
+        feed = self.x14.decoder.feed
+        got = 0
+        while sm.rx_fifo():
+            b = sm.get() & 0xFF
+            now = time.ticks_us()
+            self._t = (self._t + time.ticks_diff(now, self._last)) & 0xFFFFFFFF
+            self._last = now
+            struct.pack_into(RECORD, self._buf, self._n * RECORD_SIZE, self._t, b)
+            self._n += 1
+            feed(b)
+            got += 1
+            if self._n * RECORD_SIZE >= len(self._buf):
+                self.flush()
+        if not got and self._n >= self._half and time.ticks_diff(time.ticks_us(), self._last) > GAP_US:
+            self.flush()
+        return got
+
+    def flush(self):
+        if self._n:
+            self._f.write(self._mv[:self._n * RECORD_SIZE])
+            self.count += self._n
+            self.flushes += 1
+            self._n = 0
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+    def run(self, ms):
+        t0 = time.ticks_ms()
+        while time.ticks_diff(time.ticks_ms(), t0) < ms:
+            self.poll()
+        self.close()
+        print("x14 capture: bytes=%d frames=%d dropped=%d invalid=%d recovered=%d" % (
+            (self.count,) + self.x14.decoder.stats()))
+        return self.count
@@ -0,0 +1,9 @@
+# manifest สำหรับสร้างเฟิร์มแวร์ MicroPython (RP2040) ที่มีไลบรารี mikrorover อยู่ในเฟิร์มแวร์ (frozen)
+# bytecode ของโมดูล frozen อ่านตรงจากแฟลช ไม่ต้องคอมไพล์ตอนบูตและไม่ใช้ RAM เก็บ bytecode
+# (ไม่ต้องคัดลอก lib/mikrorover ขึ้นบอร์ดอีก แต่ต้องสร้างเฟิร์มแวร์ใหม่ทุกครั้งที่แก้ไลบรารี)
+#
+#   cd micropython/ports/rp2
+#   make BOARD=RPI_PICO FROZEN_MANIFEST=/path/to/mikroRover-X14/manifest.py
+#   (แล้วลากไฟล์ build-RPI_PICO/firmware.uf2 ไปวางที่ไดรฟ์ RPI-RP2)
+include("$(PORT_DIR)/boards/manifest.py")
+package("mikrorover", base_path="lib")